@@ -2,10 +2,24 @@
 
 from __future__ import annotations
 
+import contextlib
+import decimal
+import functools
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import queue
+import random
 import re
+import struct
+import threading
 import time
+import uuid
+import weakref
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Callable, Generator, Iterator, Optional
 
 # MARK: - Private Helpers
 
@@ -15,6 +29,1210 @@ def _dump_sql(obj: str, filepath: str) -> None:
         f.write(obj)
 
 
+def _sql_hash(sql: str) -> str:
+    return hashlib.sha1(sql.encode("utf-8")).hexdigest()
+
+
+# MARK: - Type Inference Helpers
+
+
+def _infer_dtype(s: Any, confidence: float = 1.0) -> str:
+    """Infers the target pandas dtype of a column (Int64, float, datetime64[ns], boolean or object)."""
+    import numpy as np
+    import pandas as pd
+
+    if pd.api.types.is_bool_dtype(s.dtype):
+        return "boolean"
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return "datetime64[ns]"
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        vals = s.dropna().to_numpy(dtype="float64")
+        return "Int64" if np.isfinite(vals).all() and (vals % 1 == 0).all() else "float"
+
+    s = s[s.notna()]
+    text = s.astype(str)
+    blank = (text.str.strip() == "").to_numpy(dtype=bool)
+    s, text = s[~blank], text[~blank]
+    if not len(s):
+        return "Int64"
+
+    inferred = pd.api.types.infer_dtype(s, skipna=True)
+    if inferred == "boolean":
+        return "boolean"
+    if inferred in ("datetime", "datetime64", "date"):
+        return "datetime64[ns]"
+
+    # a C-level cast settles all-numeric columns without the slower element-wise parse below
+    try:
+        vals = s.to_numpy().astype("float64")
+    except (ValueError, TypeError):
+        vals = None
+    if vals is None:
+        if text.str[:10].str.count("-").max() == 2:
+            return "datetime64[ns]"
+        nums = pd.to_numeric(s, errors="coerce")
+        parsed = nums.notna().to_numpy()
+        if parsed.mean() < confidence:
+            return "object"
+        vals = nums[parsed].to_numpy(dtype="float64")
+    return "Int64" if np.isfinite(vals).all() and (vals % 1 == 0).all() else "float"
+
+
+# make_db_schema dtype_final -> db_apply_schema type
+_SCHEMA_DTYPE_TYPES = {
+    "Int64": "INTEGER",
+    "float": "FLOAT",
+    "float64": "FLOAT",
+    "datetime64[ns]": "TIMESTAMP",
+    "object": "VARCHAR",
+    "str": "VARCHAR",
+}
+
+
+def _to_numeric_block(block: Any) -> Any:
+    """Parses a block of columns as numbers with one pd.to_numeric call over its non-numeric columns (failures become NaN)."""
+    import pandas as pd
+
+    text_cols = [c for c in block.columns if not pd.api.types.is_numeric_dtype(block[c].dtype)]
+    if not text_cols:
+        return block
+    vals = block[text_cols].to_numpy(dtype=object)
+    # a C-level cast handles all-numeric blocks; only blocks with unparseable values take the element-wise path
+    try:
+        nums = vals.astype("float64")
+    except (ValueError, TypeError):
+        nums = pd.to_numeric(vals.ravel(), errors="coerce").reshape(vals.shape)
+    block = block.copy(deep=False)
+    block[text_cols] = pd.DataFrame(nums, index=block.index, columns=text_cols)
+    return block
+
+
+# MARK: - Profiling Helpers
+
+_KMV_K = 1024  # sketch size for distinct-count estimates (~3% standard error)
+
+
+def _profile_kind(valid: Any) -> str:
+    """Classifies non-null values as boolean/integer/floating/decimal/date/datetime/datetimetz/string/empty."""
+    import pandas as pd
+
+    if pd.api.types.is_bool_dtype(valid.dtype):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(valid.dtype):
+        return "integer"
+    if pd.api.types.is_float_dtype(valid.dtype):
+        return "floating"
+    if pd.api.types.is_datetime64_any_dtype(valid.dtype):
+        return "datetimetz" if getattr(valid.dt, "tz", None) is not None else "datetime"
+    inferred = pd.api.types.infer_dtype(valid, skipna=True)
+    kinds = {
+        "boolean": "boolean",
+        "integer": "integer",
+        "floating": "floating",
+        "mixed-integer-float": "floating",
+        "decimal": "decimal",
+        "date": "date",
+        "datetime": "datetime",
+        "datetime64": "datetime",
+        "empty": "empty",
+    }
+    return kinds.get(inferred, "string")
+
+
+def _kmv_sketch(hashes: Any) -> Any:
+    """Keeps the _KMV_K smallest distinct 64-bit hashes (k-minimum-values distinct-count sketch)."""
+    import numpy as np
+
+    if len(hashes) > 8 * _KMV_K:
+        # partition first so only a small candidate set is sorted; fall back if duplicates leave too few
+        candidates = np.unique(hashes[hashes <= np.partition(hashes, 8 * _KMV_K)[8 * _KMV_K]])
+        if len(candidates) >= _KMV_K:
+            return candidates[:_KMV_K]
+    return np.unique(hashes)[:_KMV_K]
+
+
+def _profile_chunk(df: Any, sample_size: Optional[int] = None) -> dict[str, dict[str, Any]]:
+    """
+    Profiles every column of a DataFrame: kind, row/null counts, min/max, max length and a distinct sketch.
+
+    Counts and min/max always use every row; kind, max length and the distinct sketch use a seeded
+    sample of ``sample_size`` rows when given.
+    """
+    import pandas as pd
+
+    sampled = bool(sample_size) and len(df) > sample_size
+    sample = df.sample(n=sample_size, random_state=0) if sampled else df
+    nulls = df.isna().sum()
+    prof = {}
+    for col in df.columns:
+        valid = sample[col].dropna()
+        kind = _profile_kind(valid)
+        p = {
+            "kind": kind,
+            "row_count": len(df),
+            "null_count": int(nulls[col]),
+            "min": None,
+            "max": None,
+            "max_len": 0,
+            "sampled": sampled,
+            "kmv": _kmv_sketch(pd.util.hash_pandas_object(valid, index=False).to_numpy()),
+        }
+        if len(valid):
+            if kind in ("integer", "floating", "decimal", "date", "datetime", "datetimetz"):
+                full = df[col].dropna() if sampled else valid
+                p["min"], p["max"] = full.min(), full.max()
+            if kind == "integer":
+                p["max_len"] = max(len(str(p["min"])), len(str(p["max"])))
+            elif kind in ("floating", "datetime", "datetimetz"):
+                p["max_len"] = 32
+            elif kind == "boolean":
+                p["max_len"] = 5
+            else:
+                p["max_len"] = int(valid.astype(str).str.len().max())
+        prof[col] = p
+    return prof
+
+
+def _merge_kind(a: str, b: str) -> str:
+    """Widens two column kinds to one that holds both."""
+    if a == b or b == "empty":
+        return a
+    if a == "empty":
+        return b
+    for group, widened in (
+        ({"integer", "floating"}, "floating"),
+        ({"integer", "floating", "decimal"}, "decimal"),
+        ({"date", "datetime"}, "datetime"),
+    ):
+        if {a, b} <= group:
+            return widened
+    return "string"
+
+
+def _merge_profiles(a: dict[str, dict[str, Any]], b: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Combines the profiles of two chunks with the same columns."""
+    import numpy as np
+
+    merged = {}
+    for col, pa in a.items():
+        pb = b.get(col)
+        if pb is None:
+            merged[col] = pa
+            continue
+        kind = _merge_kind(pa["kind"], pb["kind"])
+        p = {
+            "kind": kind,
+            "row_count": pa["row_count"] + pb["row_count"],
+            "null_count": pa["null_count"] + pb["null_count"],
+            "min": None,
+            "max": None,
+            "max_len": max(pa["max_len"], pb["max_len"]),
+            "sampled": pa["sampled"] or pb["sampled"],
+            "kmv": np.unique(np.concatenate([pa["kmv"], pb["kmv"]]))[:_KMV_K],
+        }
+        if kind != "string":
+            lows = [v for v in (pa["min"], pb["min"]) if v is not None]
+            highs = [v for v in (pa["max"], pb["max"]) if v is not None]
+            try:
+                p["min"], p["max"] = (min(lows) if lows else None), (max(highs) if highs else None)
+            except TypeError:  # e.g. date vs Timestamp
+                pass
+        merged[col] = p
+    return merged
+
+
+def _profile_frame(prof: dict[str, dict[str, Any]]) -> Any:
+    """Turns a profile dict into a DataFrame with one row per column."""
+    import pandas as pd
+
+    rows = []
+    for col, p in prof.items():
+        kmv = p["kmv"]
+        distinct = len(kmv) if len(kmv) < _KMV_K else int((_KMV_K - 1) * 2.0**64 / float(kmv[-1]))
+        rows.append(
+            {
+                "column": col,
+                "kind": p["kind"],
+                "row_count": p["row_count"],
+                "null_count": p["null_count"],
+                "distinct_est": distinct,
+                "min": p["min"],
+                "max": p["max"],
+                "max_len": p["max_len"],
+                "sampled": p["sampled"],
+            }
+        )
+    return pd.DataFrame(rows, columns=["column", "kind", "row_count", "null_count", "distinct_est", "min", "max", "max_len", "sampled"])
+
+
+def _compact_dtype(s: Any, p: Any, category_ratio: float) -> Any:
+    """Picks a smaller dtype for a column from its profile row, or None to leave it as is."""
+    import numpy as np
+    import pandas as pd
+
+    kind, non_null = p["kind"], p["row_count"] - p["null_count"]
+    if kind == "integer" and pd.api.types.is_integer_dtype(s.dtype) and p["min"] is not None:
+        nullable = isinstance(s.dtype, pd.api.extensions.ExtensionDtype)
+        for bits in (8, 16, 32):
+            info = np.iinfo(f"int{bits}")
+            if info.min <= p["min"] and p["max"] <= info.max:
+                return f"Int{bits}" if nullable else f"int{bits}"
+        return None
+    if kind == "floating" and s.dtype == np.float64:
+        # only when float32 holds every value exactly, so compaction never changes data
+        vals = s.to_numpy()
+        return "float32" if np.array_equal(vals.astype(np.float32).astype(np.float64), vals, equal_nan=True) else None
+    if kind == "string" and (s.dtype == object or pd.api.types.is_string_dtype(s.dtype)) and non_null:
+        return "category" if p["distinct_est"] <= category_ratio * non_null else None
+    return None
+
+
+def _pg_type_from_profile(row: Any, varchar_max: int = 65535) -> str:
+    """Picks the narrowest Postgres column type that holds a profiled column."""
+    kind = row["kind"]
+    if kind == "boolean":
+        return "BOOLEAN"
+    if kind == "integer":
+        lo, hi = row["min"], row["max"]
+        if lo is None or hi is None:
+            return "INTEGER"
+        for bound, pg_type in ((2**15, "SMALLINT"), (2**31, "INTEGER"), (2**63, "BIGINT")):
+            if -bound <= lo and hi < bound:
+                return pg_type
+        return "NUMERIC"
+    if kind == "floating":
+        return "FLOAT"
+    if kind == "decimal":
+        return "NUMERIC"
+    if kind == "date":
+        return "DATE"
+    if kind == "datetime":
+        return "TIMESTAMP"
+    if kind == "datetimetz":
+        return "TIMESTAMPTZ"
+    # lengths seen in a sample are not an upper bound, and TEXT costs the same as VARCHAR in Postgres
+    if row["sampled"] or not 0 < row["max_len"] <= varchar_max:
+        return "TEXT"
+    return f"VARCHAR({row['max_len']})"
+
+
+# MARK: - COPY Helpers
+
+_PG_COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_PG_COPY_BINARY_TRAILER = struct.pack(">h", -1)
+_PG_COPY_NULL_FIELD = struct.pack(">i", -1)
+_PG_EPOCH = "2000-01-01"
+
+# type oid -> numpy wire dtype for fixed-width binary COPY fields
+_PG_BINARY_FIXED = {
+    16: ">?",  # boolean
+    21: ">i2",  # smallint
+    23: ">i4",  # integer
+    20: ">i8",  # bigint
+    700: ">f4",  # real
+    701: ">f8",  # double precision
+    1082: ">i4",  # date (days since 2000-01-01)
+    1114: ">i8",  # timestamp (microseconds since 2000-01-01)
+    1184: ">i8",  # timestamptz (microseconds since 2000-01-01 UTC)
+}
+_PG_BINARY_TEXT = {18, 19, 25, 1042, 1043}  # char, name, text, bpchar, varchar
+
+
+class _ChunkReader:
+    """File-like reader over an iterator of str/bytes chunks, consumed by ``cursor.copy_expert``."""
+
+    def __init__(self, chunks: Iterator[Any], empty: Any) -> None:
+        self._chunks = chunks
+        self._empty = empty
+        self._buf = empty
+        self._pos = 0
+        self.size_read = 0  # bytes (binary) or characters (text) handed out so far
+
+    def read(self, size: int = -1) -> Any:
+        parts = []
+        remaining = size
+        while remaining != 0:
+            if self._pos >= len(self._buf):
+                try:
+                    self._buf = next(self._chunks)
+                    self._pos = 0
+                except StopIteration:
+                    break
+                continue
+            end = len(self._buf) if remaining < 0 else self._pos + remaining
+            piece = self._buf[self._pos : end]
+            self._pos += len(piece)
+            parts.append(piece)
+            if remaining > 0:
+                remaining -= len(piece)
+        data = self._empty.join(parts)
+        self.size_read += len(data)
+        return data
+
+    def readline(self, size: int = -1) -> Any:
+        return self.read(size)
+
+
+def _copy_text_chunk(df: Any) -> str:
+    """Encodes a DataFrame slice as Postgres COPY text format, nulls as ``\\N``."""
+    import numpy as np
+    import pandas as pd
+
+    fields = []
+    for col in df.columns:
+        s = df[col]
+        null = s.isna()
+        if pd.api.types.is_datetime64_any_dtype(s.dtype):
+            fmt = "%Y-%m-%d %H:%M:%S.%f%z" if getattr(s.dt, "tz", None) is not None else "%Y-%m-%d %H:%M:%S.%f"
+            out = s.dt.strftime(fmt)
+        elif pd.api.types.is_bool_dtype(s.dtype) or pd.api.types.is_integer_dtype(s.dtype):
+            out = s.astype(str)
+        elif pd.api.types.is_float_dtype(s.dtype):
+            valid = s[~null].to_numpy(dtype="float64")
+            # NaN-padded integer columns must not be sent as "3.0" to integer targets
+            if len(valid) and np.isfinite(valid).all() and (np.abs(valid) < 2**53).all() and (valid % 1 == 0).all():
+                out = s.astype("Int64").astype(str)
+            else:
+                out = s.astype(str)
+        else:
+            out = (
+                s.astype(str)
+                .str.replace("\\", "\\\\", regex=False)
+                .str.replace("\t", "\\t", regex=False)
+                .str.replace("\n", "\\n", regex=False)
+                .str.replace("\r", "\\r", regex=False)
+            )
+        fields.append(out.astype(object).where(~null, "\\N"))
+
+    if not fields or not len(df):
+        return ""
+    lines = fields[0].str.cat(fields[1:], sep="\t") if len(fields) > 1 else fields[0]
+    return "\n".join(lines.tolist()) + "\n"
+
+
+def _check_binary_range(vals: Any, wire: Any, name: Any) -> None:
+    """Raises instead of letting numpy silently wrap integers that overflow the target column."""
+    import numpy as np
+
+    if wire.kind == "i" and len(vals):
+        info = np.iinfo(wire)
+        if vals.min() < info.min or vals.max() > info.max:
+            raise ValueError(f"column '{name}' has values outside the range of the target {wire.itemsize * 8}-bit integer column")
+
+
+def _copy_binary_fields(s: Any, oid: int) -> Any:
+    """Encodes one column as a list of length-prefixed binary COPY fields for the target type oid."""
+    import numpy as np
+    import pandas as pd
+
+    if oid in _PG_BINARY_TEXT:
+        null = s.isna().to_numpy()
+        vals = s.astype(str).to_numpy(dtype=object)
+        out = []
+        for is_null, val in zip(null, vals):
+            if is_null:
+                out.append(_PG_COPY_NULL_FIELD)
+            else:
+                b = val.encode("utf-8")
+                out.append(struct.pack(">i", len(b)) + b)
+        return out
+
+    if oid not in _PG_BINARY_FIXED:
+        raise ValueError(f"binary COPY does not support column '{s.name}' (type oid {oid}); use copy_format='text'")
+
+    if oid in (1082, 1114, 1184):
+        if not pd.api.types.is_datetime64_any_dtype(s.dtype):
+            s = pd.to_datetime(s)
+        if getattr(s.dt, "tz", None) is not None:
+            s = s.dt.tz_convert("UTC").dt.tz_localize(None)
+    null = s.isna().to_numpy()
+
+    if oid == 1082:
+        vals = (s.to_numpy(dtype="datetime64[D]") - np.datetime64(_PG_EPOCH, "D")).astype("int64")
+    elif oid in (1114, 1184):
+        vals = (s.to_numpy(dtype="datetime64[us]") - np.datetime64(_PG_EPOCH, "us")).astype("int64")
+    elif oid == 16:
+        vals = s.astype("boolean").fillna(False).to_numpy(dtype=bool)
+    elif oid in (700, 701):
+        vals = pd.to_numeric(s).to_numpy(dtype="float64", na_value=0.0)
+    else:
+        vals = pd.to_numeric(s).astype("Int64").fillna(0).to_numpy(dtype="int64")
+
+    wire = np.dtype(_PG_BINARY_FIXED[oid])
+    vals = np.where(null, 0, vals)
+    _check_binary_range(vals, wire, s.name)
+    arr = np.empty(len(s), dtype=[("len", ">i4"), ("val", wire)])
+    arr["len"] = wire.itemsize
+    arr["val"] = vals
+    raw = arr.tobytes()
+    width = arr.dtype.itemsize
+    return [_PG_COPY_NULL_FIELD if null[i] else raw[i * width : (i + 1) * width] for i in range(len(s))]
+
+
+def _copy_binary_chunk(df: Any, oids: list[int]) -> bytes:
+    """Encodes a DataFrame slice as Postgres COPY binary tuples (no file header/trailer)."""
+    import numpy as np
+
+    if not len(df):
+        return b""
+
+    # fast path: every column numeric/bool of a matching kind and non-null -> one structured array per chunk
+    kinds = {16: "b", 21: "iu", 23: "iu", 20: "iu", 700: "fiu", 701: "fiu"}
+    if all(df[col].dtype.kind in kinds.get(oid, "") for col, oid in zip(df.columns, oids)) and not df.isna().to_numpy().any():
+        layout = [("n", ">i2")]
+        for idx, oid in enumerate(oids):
+            layout += [(f"l{idx}", ">i4"), (f"v{idx}", _PG_BINARY_FIXED[oid])]
+        arr = np.empty(len(df), dtype=layout)
+        arr["n"] = len(oids)
+        for idx, (col, oid) in enumerate(zip(df.columns, oids)):
+            wire = np.dtype(_PG_BINARY_FIXED[oid])
+            vals = df[col].to_numpy()
+            _check_binary_range(vals, wire, col)
+            arr[f"l{idx}"] = wire.itemsize
+            arr[f"v{idx}"] = vals
+        return arr.tobytes()
+
+    header = struct.pack(">h", len(oids))
+    cols = [_copy_binary_fields(df[col], oid) for col, oid in zip(df.columns, oids)]
+    return b"".join(itertools.chain.from_iterable((header, *fields) for fields in zip(*cols)))
+
+
+_COPY_PIPE_CHUNK = 1 << 20  # bytes handed between the COPY TO and COPY FROM sides at a time
+_COPY_PROGRESS_BYTES = 64 << 20  # copy_table_pg reports progress every this many bytes
+
+
+class _CopyPipeWriter:
+    """File-like target for ``COPY ... TO STDOUT`` that passes data to a bounded queue in _COPY_PIPE_CHUNK pieces."""
+
+    def __init__(self, q: queue.Queue[Any], stop: threading.Event) -> None:
+        self._q = q
+        self._stop = stop
+        self._buf = bytearray()
+
+    def put(self, item: Any) -> None:
+        # wait for room, but give up once the reading side has failed so the source COPY aborts
+        while True:
+            try:
+                self._q.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    raise RuntimeError("copy aborted by the target side")
+
+    def write(self, data: Any) -> int:
+        self._buf += data.encode() if isinstance(data, str) else data
+        if len(self._buf) >= _COPY_PIPE_CHUNK:
+            self.put(bytes(self._buf))
+            self._buf.clear()
+        return len(data)
+
+    def close(self) -> None:
+        if self._buf:
+            self.put(bytes(self._buf))
+            self._buf.clear()
+        self.put(None)
+
+
+# MARK: - Result Set Helpers
+
+# type oid -> pandas dtype, so streamed batches keep the same dtypes regardless of their values
+_PG_OID_DTYPES = {
+    16: "boolean",
+    20: "Int64",
+    21: "Int64",
+    23: "Int64",
+    700: "float64",
+    701: "float64",
+    1114: "datetime64[ns]",
+    1184: "datetime64[ns, UTC]",
+}
+
+
+# placeholder each fixed-width type is coalesced to in the columnar read, so every binary field has a constant size
+_PG_COLUMNAR_FILL = {
+    16: "'f'",
+    21: "'0'",
+    23: "'0'",
+    20: "'0'",
+    700: "'0'",
+    701: "'0'",
+    1082: "'2000-01-01'",
+    1114: "'2000-01-01'",
+    1184: "'2000-01-01'",
+}
+_PG_NUMERIC = 1700
+
+
+def _columnar_frame(data: bytes, description: Any, fixed: list[tuple[int, int]], var: list[int]) -> Any:
+    """
+    Decodes the binary COPY output of read_pg's columnar query into a DataFrame.
+
+    ``fixed`` lists (result position, type oid) of columns sent as a non-null ``IS NULL`` flag
+    plus a coalesced value, so that part of every row has the same size and is viewed as one
+    NumPy structured array; ``var`` lists the result positions of the text columns after them,
+    which are the only fields read row by row (NUMERIC ones are parsed into Decimal).
+    """
+    import numpy as np
+    import pandas as pd
+
+    body = memoryview(data)[19 + struct.unpack_from(">i", data, 15)[0] : len(data) - 2]  # skip header/extension, trailer
+    layout = [("n", ">i2")]
+    for j, (_, oid) in enumerate(fixed):
+        layout += [(f"nl{j}", ">i4"), (f"null{j}", "?"), (f"vl{j}", ">i4"), (f"v{j}", _PG_BINARY_FIXED[oid])]
+    rec = np.dtype(layout)
+
+    texts: list[list[Any]] = [[] for _ in var]
+    if not var:
+        arr = np.frombuffer(body, dtype=rec)
+    else:
+        # every row carries at least a length word per text column, which bounds the row count;
+        # the fixed-size prefixes are copied out row by row into one contiguous block
+        row_size = rec.itemsize
+        fixed_buf = bytearray(len(body) // (row_size + 4 * len(var)) * row_size)
+        filled = 0
+        pos, end = 0, len(body)
+        while pos < end:
+            fixed_buf[filled : filled + row_size] = body[pos : pos + row_size]
+            filled += row_size
+            pos += row_size
+            for values in texts:
+                (size,) = struct.unpack_from(">i", body, pos)
+                pos += 4
+                if size < 0:
+                    values.append(None)
+                else:
+                    values.append(str(body[pos : pos + size], "utf-8"))
+                    pos += size
+        arr = np.frombuffer(fixed_buf, dtype=rec, count=filled // row_size)
+
+    cols: dict[int, Any] = {}
+    for j, (i, oid) in enumerate(fixed):
+        mask = arr[f"null{j}"].copy()
+        vals = arr[f"v{j}"]
+        if oid in (20, 21, 23):
+            cols[i] = pd.arrays.IntegerArray(vals.astype("int64"), mask)
+        elif oid == 16:
+            cols[i] = pd.arrays.BooleanArray(vals.astype(bool), mask)
+        elif oid in (700, 701):
+            cols[i] = np.where(mask, np.nan, vals.astype("float64"))
+        else:
+            # days (date) or microseconds since 2000-01-01; values outside datetime64[ns], including
+            # Postgres' +/-infinity, become NaT instead of wrapping around
+            unit_ns = 86_400 * 10**9 if oid == 1082 else 1_000
+            shift = int(np.datetime64(_PG_EPOCH, "ns").astype("int64")) // unit_ns
+            lo, hi = -(-pd.Timestamp.min.value // unit_ns) - shift, pd.Timestamp.max.value // unit_ns - shift
+            raw = vals.astype("int64")
+            mask = mask | (raw < lo) | (raw > hi)
+            out = ((np.where(mask, 0, raw) + shift) * unit_ns).view("datetime64[ns]")
+            out[mask] = np.datetime64("NaT")
+            cols[i] = pd.Series(out).dt.tz_localize("UTC") if oid == 1184 else out
+    for i, values in zip(var, texts):
+        if description[i][1] == _PG_NUMERIC:
+            values = [None if v is None else decimal.Decimal(v) for v in values]
+            cols[i] = pd.Series(values, dtype=object)
+        else:
+            cols[i] = pd.Series(values, dtype=None if any(v is not None for v in values) else object)
+
+    df = pd.DataFrame({i: cols[i] for i in range(len(description))})
+    df.columns = [d[0] for d in description]
+    return df
+
+
+def _in_transaction(conn: Any) -> bool:
+    """Whether conn already has a transaction open that belongs to the caller (psycopg2 status other than idle)."""
+    status = getattr(conn, "get_transaction_status", None)
+    return status is not None and status() != 0  # psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+def _records_to_df(rows: list[Any], description: Any, type_dtypes: Optional[dict[int, str]] = None) -> Any:
+    """Builds a DataFrame from cursor rows, typing columns from the cursor description (Postgres type oids by default)."""
+    import pandas as pd
+
+    type_dtypes = _PG_OID_DTYPES if type_dtypes is None else type_dtypes
+    df = pd.DataFrame.from_records(rows, columns=[d[0] for d in description])
+    for d in description:
+        dtype = type_dtypes.get(d[1])
+        if dtype is None:
+            continue
+        if dtype.startswith("datetime64"):
+            # pandas 3 infers [s]/[us] units (and [s] for all-NULL columns); pin the unit so every batch matches
+            df[d[0]] = pd.to_datetime(df[d[0]], utc=dtype.endswith("UTC]")).astype(dtype)
+        else:
+            df[d[0]] = df[d[0]].astype(dtype)
+    return df
+
+
+def _pg_arrow_schema(description: Any, batch: Any) -> Any:
+    """
+    Arrow schema for spilling a Postgres result, fixed up front from the cursor's type oids.
+
+    Types come from the column definitions rather than the first batch's values, so a column that
+    is all NULL there (or a NUMERIC whose values grow in scale) still takes later batches. NUMERIC
+    with a declared scale becomes decimal128(38, scale); unconstrained NUMERIC becomes float64.
+    Other types are inferred from the batch, with all-NULL columns stored as strings.
+    """
+    import pyarrow as pa
+
+    by_oid = {
+        16: pa.bool_(),
+        20: pa.int64(),
+        21: pa.int64(),
+        23: pa.int64(),
+        25: pa.string(),
+        700: pa.float64(),
+        701: pa.float64(),
+        1042: pa.string(),
+        1043: pa.string(),
+        1082: pa.date32(),
+        1114: pa.timestamp("us"),
+        1184: pa.timestamp("us", tz="UTC"),
+    }
+    inferred = pa.Schema.from_pandas(batch, preserve_index=False)
+    fields = []
+    for d, field in zip(description, inferred):
+        if d[1] == _PG_NUMERIC:
+            precision, scale = d[4:6] if len(d) >= 6 else (None, None)
+            typ = pa.decimal128(38, scale) if scale is not None and precision is not None and precision <= 38 else pa.float64()
+        else:
+            typ = by_oid.get(d[1], field.type)
+        fields.append(field.with_type(pa.string() if pa.types.is_null(typ) else typ))
+    return pa.schema(fields, metadata=inferred.metadata)
+
+
+# MARK: - Change Detection Helpers
+
+
+def _changed_rows(df: Any, full_tbl: str, cursor: Any, key_col: str, hash_col: str, batch_size: int = 10000) -> Any:
+    """Drops rows whose stored hash in full_tbl already matches df[hash_col]; new keys and NULL hashes are kept."""
+    import pandas as pd
+
+    keys = df[key_col].drop_duplicates().tolist()
+    stored: dict[Any, Any] = {}
+    for i in range(0, len(keys), batch_size):
+        cursor.execute(f"SELECT {key_col}, {hash_col} FROM {full_tbl} WHERE {key_col} = ANY(%s)", (keys[i : i + batch_size],))
+        stored.update(cursor.fetchall())
+    if not stored:
+        return df
+    current = df[key_col].map(pd.Series(stored, dtype=object))
+    return df[current.isna() | (current != df[hash_col])]
+
+
+# MARK: - Loop Template Helpers
+
+
+class _LoopTemplate:
+    """
+    Window SQL template for the sequential loaders, parsed once and reused for every window.
+
+    ``fragments`` maps each placeholder to a (literal, parameterized) pair of format strings: the
+    literal one is filled with quoted window values by ``render`` (for logs, manifest hashes and
+    the CREATE TABLE window), the parameterized one uses $1.. in ``params`` order and becomes part
+    of a statement that is prepared once per connection and run with ``EXECUTE``. Parameters are
+    prepared as ``unknown``, so like the quoted literals they take the type of the column they are
+    inserted into (or of an explicit cast).
+    """
+
+    def __init__(self, sql: str, fragments: dict[str, tuple[str, str]], params: list[str]) -> None:
+        placeholders = sorted((p for p in fragments if p), key=len, reverse=True)
+        parts = re.split("(" + "|".join(map(re.escape, placeholders)) + ")", sql) if placeholders else [sql]
+        # odd positions are placeholders; only they are formatted, so braces in the SQL itself are left alone
+        self._parts = [part if i % 2 == 0 else fragments[part][0] for i, part in enumerate(parts)]
+        self.sql = "".join(part if i % 2 == 0 else fragments[part][1] for i, part in enumerate(parts))
+        self.params = params
+        self._prepared: weakref.WeakSet[Any] = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def render(self, **values: Any) -> str:
+        """Returns the template with the window values quoted in as literals."""
+        return "".join(part if i % 2 == 0 else part.format(**values) for i, part in enumerate(self._parts))
+
+    def execute(self, cur: Any, conn: Any, prefix: str, explain: str = "", **values: Any) -> None:
+        """Runs prefix + template with the window values (behind an EXPLAIN clause if given), preparing it on conn first if needed."""
+        name = "fusetools_loop_" + _sql_hash(prefix + self.sql)[:16]
+        with self._lock:
+            known = conn in self._prepared
+        try:
+            if not known:
+                # pooled connections may already hold the statement from an earlier load
+                cur.execute("SELECT 1 FROM pg_prepared_statements WHERE name = %s", (name,))
+                if not cur.fetchall():
+                    cur.execute(f"PREPARE {name} ({', '.join(['unknown'] * len(self.params))}) AS {prefix}{self.sql}")
+                with self._lock:
+                    self._prepared.add(conn)
+            cur.execute(f"{explain}EXECUTE {name} ({', '.join(['%s'] * len(self.params))})", tuple(values[p] for p in self.params))
+        except Exception:
+            # check pg_prepared_statements again after a failure rather than trusting the cache
+            with self._lock:
+                self._prepared.discard(conn)
+            raise
+
+
+# MARK: - MySQL Helpers
+
+# MySQL field type code -> pandas dtype for streamed batches
+_MYSQL_TYPE_DTYPES = {
+    1: "Int64",  # TINYINT / BOOL
+    2: "Int64",  # SMALLINT
+    3: "Int64",  # INT
+    8: "Int64",  # BIGINT
+    9: "Int64",  # MEDIUMINT
+    13: "Int64",  # YEAR
+    4: "float64",  # FLOAT
+    5: "float64",  # DOUBLE
+    7: "datetime64[ns]",  # TIMESTAMP
+    12: "datetime64[ns]",  # DATETIME
+}
+
+
+def _mysql_infile_chunk(df: Any) -> bytes:
+    """Encodes a DataFrame slice for LOAD DATA's default tab-separated format (booleans as 1/0, timestamps in UTC)."""
+    import pandas as pd
+
+    df = df.copy(deep=False)
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_bool_dtype(s.dtype):
+            df[col] = s.astype("Int8")
+        elif pd.api.types.is_datetime64_any_dtype(s.dtype) and getattr(s.dt, "tz", None) is not None:
+            df[col] = s.dt.tz_convert("UTC").dt.tz_localize(None)
+    # LOAD DATA's defaults (tab fields, backslash escapes, \N nulls) match Postgres COPY text format
+    return _copy_text_chunk(df).encode("utf-8")
+
+
+@contextlib.contextmanager
+def _local_infile(chunks: Iterator[bytes]) -> Iterator[str]:
+    """
+    Yields a path that ``LOAD DATA LOCAL INFILE`` can read the chunks from.
+
+    Where /dev/fd exists this is the read end of a pipe fed by a background thread, so nothing
+    touches disk and only the pipe buffer plus one chunk is held in memory; otherwise the chunks
+    are written to a temporary file. If producing the chunks fails, the server has already seen
+    end of file and loaded a truncated input, so the error is re-raised on leaving the block for
+    the caller to roll back.
+    """
+    import tempfile
+
+    if not os.path.isdir("/dev/fd"):
+        with tempfile.NamedTemporaryFile(suffix=".tsv", delete=False) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        try:
+            yield f.name
+        finally:
+            os.remove(f.name)
+        return
+
+    read_fd, write_fd = os.pipe()
+    errors: list[BaseException] = []
+
+    def feed() -> None:
+        try:
+            with os.fdopen(write_fd, "wb") as w:
+                for chunk in chunks:
+                    w.write(chunk)
+        except BaseException as e:  # includes the reader closing early, e.g. the server refused the LOAD
+            errors.append(e)
+
+    writer = threading.Thread(target=feed, name="fusetools-local-infile", daemon=True)
+    writer.start()
+    try:
+        yield f"/dev/fd/{read_fd}"
+    finally:
+        os.close(read_fd)
+        writer.join()
+    # only reached when the LOAD itself succeeded, so a feeder error means the input was cut short
+    if errors:
+        raise errors[0]
+
+
+# ═══════════════════════════════════════════════════════════
+# MARK: - Instrumentation
+# ═══════════════════════════════════════════════════════════
+
+
+class DbMetrics:
+    """
+    Registry of metrics sinks for db_tools.
+
+    Instrumented operations emit one event dict per statement, batch or phase with ``op``,
+    ``seconds`` (monotonic clock), ``status`` ('ok' or 'error'), ``ts`` and, where known,
+    ``rows``, ``bytes``, ``retries``, ``wait_seconds``, ``table`` and ``sql_hash``. A sink is any
+    callable taking the event: a MetricsHistogram, a JsonLinesSink or a plain function. Nothing is
+    collected while no sink is registered.
+    """
+
+    _sinks: list[Callable[[dict[str, Any]], Any]] = []
+
+    @classmethod
+    def add_sink(cls, sink: Callable[[dict[str, Any]], Any]) -> Callable[[dict[str, Any]], Any]:
+        """
+        Registers a sink for every subsequent event.
+
+        :param sink: Callable taking an event dict.
+        :return: The sink, for chaining.
+        """
+        cls._sinks.append(sink)
+        return sink
+
+    @classmethod
+    def remove_sink(cls, sink: Callable[[dict[str, Any]], Any]) -> None:
+        """
+        Unregisters a sink (no-op if it is not registered).
+
+        :param sink: Previously registered sink.
+        """
+        with contextlib.suppress(ValueError):
+            cls._sinks.remove(sink)
+
+    @classmethod
+    def emit(cls, op: str, seconds: float, **fields: Any) -> None:
+        """
+        Sends an event to every registered sink; a failing sink is reported and skipped.
+
+        :param op: Operation name, e.g. 'run_query_pg' or 'copy'.
+        :param seconds: Duration of the operation.
+        :param fields: Additional event fields (rows, bytes, retries, wait_seconds, ...).
+        """
+        if not cls._sinks:
+            return
+        event = {"ts": time.time(), "op": op, "seconds": seconds, "status": "ok", **fields}
+        for sink in list(cls._sinks):
+            try:
+                sink(event)
+            except Exception as e:
+                print(f"Metrics sink failed: {e}")
+
+
+@contextlib.contextmanager
+def _timed(op: str, **fields: Any) -> Iterator[dict[str, Any]]:
+    """Times the block with the monotonic clock and emits one event; the yielded dict collects extra fields."""
+    event = dict(fields)
+    tstart = time.monotonic()
+    try:
+        yield event
+    except BaseException as e:
+        event.update(status="error", error=str(e))
+        raise
+    finally:
+        event["seconds"] = time.monotonic() - tstart
+        DbMetrics.emit(op, **event)
+
+
+class MetricsHistogram:
+    """
+    In-memory sink keeping event durations per operation, with percentile summaries.
+
+    :param max_samples: Most recent durations kept per operation (None = all).
+    """
+
+    def __init__(self, max_samples: Optional[int] = 100000) -> None:
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._seconds: dict[str, Any] = {}
+        self._totals: dict[str, dict[str, Any]] = {}
+
+    def __call__(self, event: dict[str, Any]) -> None:
+        from collections import deque
+
+        op = event["op"]
+        with self._lock:
+            if op not in self._seconds:
+                self._seconds[op] = deque(maxlen=self.max_samples)
+                self._totals[op] = {"count": 0, "errors": 0, "total_seconds": 0.0, "rows": 0, "bytes": 0, "retries": 0, "wait_seconds": 0.0}
+            self._seconds[op].append(event["seconds"])
+            totals = self._totals[op]
+            totals["count"] += 1
+            totals["errors"] += event.get("status") == "error"
+            totals["total_seconds"] += event["seconds"]
+            for field in ("rows", "bytes", "retries", "wait_seconds"):
+                if event.get(field):
+                    totals[field] += event[field]
+
+    def percentiles(self, op: str, qs: tuple[float, ...] = (50, 95, 99)) -> dict[str, float]:
+        """
+        Duration percentiles of one operation.
+
+        :param op: Operation name.
+        :param qs: Percentiles to compute.
+        :return: Dict like {'p50': ..., 'p95': ..., 'p99': ...} (empty if the operation was never seen).
+        """
+        import numpy as np
+
+        with self._lock:
+            seconds = list(self._seconds.get(op, ()))
+        if not seconds:
+            return {}
+        return {f"p{q:g}": float(v) for q, v in zip(qs, np.percentile(seconds, qs))}
+
+    def summary(self) -> Any:
+        """
+        Summarizes every operation seen so far.
+
+        :return: Pandas DataFrame with one row per op: count, errors, total/mean/p50/p95/p99/max seconds, rows, bytes, retries, wait_seconds.
+        """
+        import pandas as pd
+
+        with self._lock:
+            ops = {op: (dict(self._totals[op]), list(self._seconds[op])) for op in self._seconds}
+        rows = []
+        for op, (totals, seconds) in sorted(ops.items()):
+            rows.append(
+                {
+                    "op": op,
+                    **totals,
+                    "mean_seconds": totals["total_seconds"] / totals["count"],
+                    **self.percentiles(op),
+                    "max_seconds": max(seconds),
+                }
+            )
+        columns = [
+            "op",
+            "count",
+            "errors",
+            "total_seconds",
+            "mean_seconds",
+            "p50",
+            "p95",
+            "p99",
+            "max_seconds",
+            "rows",
+            "bytes",
+            "retries",
+            "wait_seconds",
+        ]
+        return pd.DataFrame(rows, columns=columns)
+
+    def reset(self) -> None:
+        """Drops all collected samples."""
+        with self._lock:
+            self._seconds.clear()
+            self._totals.clear()
+
+
+class JsonLinesSink:
+    """
+    Sink appending each event as one JSON object per line.
+
+    :param path: File to append to.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+
+    def __call__(self, event: dict[str, Any]) -> None:
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Closes the file."""
+        with self._lock:
+            self._file.close()
+
+
+# MARK: - Plan Profiling
+
+_EXPLAIN_ANALYZE = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+_EXPLAINABLE_RE = re.compile(r"\s*(select|insert|update|delete|with|values|execute)\b", re.IGNORECASE)
+_CREATE_TABLE_AS_RE = re.compile(
+    r"\s*create\s+(?:(?:global\s+|local\s+)?(?:temp|temporary)\s+|unlogged\s+)?table\s+\S+\s+as\s+(.*)", re.IGNORECASE | re.DOTALL
+)
+_AUTO_EXPLAIN_RE = re.compile(r"duration: ([\d.]+) ms\s+plan:\s*(\{.*\})", re.DOTALL)
+
+
+def _plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Walks an EXPLAIN JSON plan tree depth first."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _plan_rows(plan: dict[str, Any]) -> int:
+    """Rows produced (or written, for INSERT/UPDATE/DELETE) by an EXPLAIN ANALYZE plan."""
+    node = plan["Plan"]
+    if node.get("Node Type") == "ModifyTable" and node.get("Plans"):
+        node = node["Plans"][0]
+    return int(node.get("Actual Rows", 0) * node.get("Actual Loops", 1))
+
+
+class PlanProfiler:
+    """
+    Captures ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` plans for sampled or slow statements.
+
+    A sampled statement runs under EXPLAIN ANALYZE in place of its plain execution, so it still
+    takes effect once and the plan costs nothing extra. Only SELECT/INSERT/UPDATE/DELETE/WITH/
+    VALUES/EXECUTE and CREATE TABLE AS statements are sampled; others run normally.
+
+    Slow statements are never run twice: with ``slow_seconds`` the other statements run with
+    auto_explain enabled for the transaction (``SET LOCAL auto_explain.log_min_duration``), which
+    sends the plan of any statement at or over the threshold to the client as a notice. Loading
+    auto_explain needs a superuser, ``session_preload_libraries`` or a copy in ``$libdir/plugins``;
+    where it is unavailable slow plans are not captured.
+
+    Plans are kept in ``records`` and written as ``<key>.plan.json`` to ``plan_dir``, or next to
+    the SQL a loader dumps to its ``log_dir``. Pass the profiler to run_query_pg,
+    sequential_load_pg or sequential_load_pg_wk, then use top_nodes and regressions.
+
+    :param plan_dir: Directory for plan files (defaults to the loader's log_dir; None and no log_dir = memory only).
+    :param sample_rate: Share of statements run under EXPLAIN ANALYZE (0.0-1.0).
+    :param slow_seconds: Duration from which auto_explain captures a statement's plan (None = never).
+    :param seed: Seed for the sampling decisions.
+    """
+
+    def __init__(self, plan_dir: Optional[str] = None, sample_rate: float = 0.0, slow_seconds: Optional[float] = None, seed: Any = None) -> None:
+        self.plan_dir = plan_dir
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.records: list[dict[str, Any]] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def run(self, cur: Any, sql: str, execute: Callable[[str], Any], key: str, group: str, log_dir: Any = False) -> int:
+        """
+        Executes one statement through ``execute(prefix)`` with profiling; the caller commits.
+
+        :param cur: Cursor execute runs on.
+        :param sql: Statement text (as logged), used for sampling and the plan file.
+        :param execute: Callable running the statement with the given prefix ("" or the EXPLAIN clause) on cur.
+        :param key: Name of the plan file and record, e.g. the loader's window.
+        :param group: Records compared with each other by regressions, e.g. the target table.
+        :param log_dir: Loader log_dir to write the plan next to (when plan_dir is not set).
+        :return: Rows affected (-1 if unknown).
+        """
+        with self._lock:
+            sampled = bool(self.sample_rate) and bool(_EXPLAINABLE_RE.match(sql) or _CREATE_TABLE_AS_RE.match(sql))
+            sampled = sampled and self._random.random() < self.sample_rate
+        slow = self.slow_seconds is not None and not sampled and self._auto_explain(cur, key)
+        tstart = time.monotonic()
+        execute(_EXPLAIN_ANALYZE if sampled else "")
+        seconds = time.monotonic() - tstart
+        if sampled:
+            plan = cur.fetchone()[0]
+            plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]
+            return _plan_rows(self._record(plan, sql, seconds, key, group, "sampled", log_dir))
+
+        rows = getattr(cur, "rowcount", -1)
+        plan = self._logged_plan(cur) if slow else None
+        if plan is not None:
+            self._record(plan, sql, seconds, key, group, "slow", log_dir)
+        return rows
+
+    def _auto_explain(self, cur: Any, key: str) -> bool:
+        """Enables auto_explain for the rest of cur's transaction; False (and no change) if it cannot be loaded."""
+        settings = {
+            "log_min_duration": int(self.slow_seconds * 1000),
+            "log_analyze": "on",
+            "log_buffers": "on",
+            "log_format": "json",
+            "log_level": "notice",
+        }  # type: ignore[operator]
+        set_local = "; ".join(f"SET LOCAL auto_explain.{name} = '{value}'" for name, value in settings.items())
+        try:
+            cur.execute(f"SAVEPOINT fusetools_explain; LOAD 'auto_explain'; {set_local}; RELEASE SAVEPOINT fusetools_explain")
+        except Exception as e:
+            cur.execute("ROLLBACK TO SAVEPOINT fusetools_explain")
+            print(f"auto_explain unavailable, slow plan not captured for {key}: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def _logged_plan(cur: Any) -> Optional[dict[str, Any]]:
+        """Takes the latest auto_explain plan off the connection's notices, or None if the statement was fast."""
+        notices = getattr(cur.connection, "notices", [])
+        for notice in reversed(notices):
+            match = _AUTO_EXPLAIN_RE.search(notice)
+            if match:
+                notices.remove(notice)
+                plan = json.loads(match.group(2))
+                plan.setdefault("Execution Time", float(match.group(1)))
+                return plan
+        return None
+
+    def _record(self, plan: dict[str, Any], sql: str, seconds: float, key: str, group: str, reason: str, log_dir: Any) -> dict[str, Any]:
+        """Stores a captured plan (and writes its plan file) and returns it."""
+        plan_dir = self.plan_dir or log_dir
+        path = os.path.join(plan_dir, f"{key}.plan.json") if plan_dir else None
+        if path:
+            with open(path, "w") as f:
+                json.dump({"sql": sql, "reason": reason, "seconds": seconds, "plan": plan}, f, indent=2)
+        record = {"key": key, "group": group, "reason": reason, "seconds": seconds, "sql_hash": _sql_hash(sql), "path": path, "plan": plan}
+        with self._lock:
+            self.records.append(record)
+        return plan
+
+    def top_nodes(self, n: int = 20) -> Any:
+        """
+        Lists the plan nodes that took the most time across all captured plans.
+
+        :param n: Number of nodes to return.
+        :return: Pandas DataFrame with key, node type, relation, exclusive ms, rows, loops and shared buffer hits/reads.
+        """
+        import pandas as pd
+
+        rows = []
+        for rec in self.records:
+            for node in _plan_nodes(rec["plan"]["Plan"]):
+                loops = node.get("Actual Loops", 1)
+                children = sum(c.get("Actual Total Time", 0.0) * c.get("Actual Loops", 1) for c in node.get("Plans", []))
+                rows.append(
+                    {
+                        "key": rec["key"],
+                        "node_type": node.get("Node Type"),
+                        "relation": node.get("Relation Name") or node.get("Index Name"),
+                        "exclusive_ms": max(node.get("Actual Total Time", 0.0) * loops - children, 0.0),
+                        "rows": node.get("Actual Rows", 0) * loops,
+                        "loops": loops,
+                        "shared_hit_blocks": node.get("Shared Hit Blocks", 0),
+                        "shared_read_blocks": node.get("Shared Read Blocks", 0),
+                    }
+                )
+        columns = ["key", "node_type", "relation", "exclusive_ms", "rows", "loops", "shared_hit_blocks", "shared_read_blocks"]
+        df = pd.DataFrame(rows, columns=columns)
+        return df.sort_values("exclusive_ms", ascending=False).head(n).reset_index(drop=True)
+
+    def regressions(self, threshold: float = 2.0) -> Any:
+        """
+        Flags captured plans that differ from the rest of their group.
+
+        A plan regressed when its shape (node types, depth first) differs from the group's most
+        common shape, or when its execution time per row is over ``threshold`` times the group median.
+
+        :param threshold: Slowdown factor against the group median that counts as a regression.
+        :return: Pandas DataFrame of regressed plans with key, group, execution ms, rows, ms per row, median ms per row, plan_changed and slower.
+        """
+        import pandas as pd
+
+        rows = []
+        for rec in self.records:
+            plan = rec["plan"]
+            n_rows = _plan_rows(plan)
+            execution_ms = plan.get("Execution Time", rec["seconds"] * 1000)
+            shape = tuple(node.get("Node Type") for node in _plan_nodes(plan["Plan"]))
+            rows.append(
+                {
+                    "key": rec["key"],
+                    "group": rec["group"],
+                    "execution_ms": execution_ms,
+                    "rows": n_rows,
+                    "ms_per_row": execution_ms / max(n_rows, 1),
+                    "shape": shape,
+                }
+            )
+        columns = ["key", "group", "execution_ms", "rows", "ms_per_row", "median_ms_per_row", "plan_changed", "slower"]
+        if not rows:
+            return pd.DataFrame(columns=columns)
+
+        df = pd.DataFrame(rows)
+        df["median_ms_per_row"] = df.groupby("group")["ms_per_row"].transform("median")
+        common = df.groupby("group")["shape"].agg(lambda shapes: shapes.value_counts().index[0])
+        df["plan_changed"] = df["shape"] != df["group"].map(common)
+        df["slower"] = df["ms_per_row"] > threshold * df["median_ms_per_row"]
+        return df.loc[df["plan_changed"] | df["slower"], columns].reset_index(drop=True)
+
+
 # ═══════════════════════════════════════════════════════════
 # MARK: - Connections
 # ═══════════════════════════════════════════════════════════
@@ -77,6 +1295,7 @@ class Postgres:
         import psycopg2
 
         last_exc: Optional[Exception] = None
+        tstart = time.monotonic()
         for attempt in range(retries + 1):
             try:
                 conn = psycopg2.connect(
@@ -92,6 +1311,7 @@ class Postgres:
                     keepalives_count=5,
                 )
                 cursor = conn.cursor()
+                DbMetrics.emit("connect", time.monotonic() - tstart, retries=attempt)
                 return cursor, conn
             except psycopg2.OperationalError as e:
                 last_exc = e
@@ -99,15 +1319,309 @@ class Postgres:
                     wait = retry_delay * (2**attempt)
                     print(f"Postgres connection attempt {attempt + 1} failed: {e}. Retrying in {wait}s...")
                     time.sleep(wait)
+        DbMetrics.emit("connect", time.monotonic() - tstart, retries=retries, status="error", error=str(last_exc))
         raise last_exc
 
+    @classmethod
+    def pool_postgres(
+        cls,
+        host: str,
+        db: str,
+        usr: str,
+        pwd: str,
+        port: Optional[int] = None,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        pre_ping: bool = True,
+        checkout_timeout: float = 30.0,
+        retries: int = 3,
+        retry_delay: int = 5,
+    ) -> PostgresPool:
+        """
+        Creates a thread-safe pool of psycopg2 connections to a Postgres database.
+
+        The pool can be passed as ``conn`` (and ``cursor``) to any PostgresETL method.
+
+        :param host: Postgres database host.
+        :param db: Postgres database name.
+        :param usr: Postgres database username.
+        :param pwd: Postgres database password.
+        :param port: Postgres database port.
+        :param min_size: Connections opened up front and kept open when idle.
+        :param max_size: Maximum number of open connections.
+        :param idle_timeout: Seconds after which idle connections above min_size are closed.
+        :param pre_ping: Validate connections with SELECT 1 on checkout.
+        :param checkout_timeout: Seconds to wait for a free connection before raising TimeoutError.
+        :param retries: Number of connection retries per new connection.
+        :param retry_delay: Base delay in seconds between retries (exponential backoff).
+        :return: PostgresPool object.
+        """
+        return PostgresPool(
+            host=host,
+            db=db,
+            usr=usr,
+            pwd=pwd,
+            port=port,
+            min_size=min_size,
+            max_size=max_size,
+            idle_timeout=idle_timeout,
+            pre_ping=pre_ping,
+            checkout_timeout=checkout_timeout,
+            retries=retries,
+            retry_delay=retry_delay,
+        )
+
+
+# MARK: - Postgres Connection Pool
+class PostgresPool:
+    """Thread-safe pool of psycopg2 connections created with Postgres.con_postgres."""
+
+    def __init__(
+        self,
+        host: str,
+        db: str,
+        usr: str,
+        pwd: str,
+        port: Optional[int] = None,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        pre_ping: bool = True,
+        checkout_timeout: float = 30.0,
+        retries: int = 3,
+        retry_delay: int = 5,
+    ) -> None:
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"invalid pool size: min_size={min_size}, max_size={max_size}")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.pre_ping = pre_ping
+        self.checkout_timeout = checkout_timeout
+        self._connect_kwargs = dict(host=host, db=db, usr=usr, pwd=pwd, port=port, retries=retries, retry_delay=retry_delay)
+        self._lock = threading.Condition()
+        self._idle: list[tuple[Any, float]] = []  # (conn, last_used); most recently used last
+        self._held: dict[int, int] = {}  # thread ident -> connections checked out through connection()
+        self._size = 0
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "created": 0,
+            "creation_seconds": 0.0,
+            "ping_failures": 0,
+            "discarded": 0,
+        }
+        for _ in range(min_size):
+            self._size += 1
+            self._idle.append((self._create(), time.monotonic()))
+
+    def _create(self) -> Any:
+        """Opens a new connection for a slot already reserved in ``_size``."""
+        tstart = time.monotonic()
+        try:
+            cursor, conn = Postgres.con_postgres(**self._connect_kwargs)
+        except BaseException:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+        cursor.close()
+        with self._lock:
+            self._stats["created"] += 1
+            self._stats["creation_seconds"] += time.monotonic() - tstart
+        return conn
+
+    def _ping(self, conn: Any) -> bool:
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchone()
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _reap(self) -> None:
+        """Closes connections idle past idle_timeout, keeping min_size open. Caller holds the lock."""
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.pop(0)
+            self._size -= 1
+            self._stats["discarded"] += 1
+            with contextlib.suppress(Exception):
+                conn.close()
+
+    def getconn(self) -> Any:
+        """
+        Checks a connection out of the pool, opening one if below max_size.
+
+        :return: psycopg2 connection object.
+        """
+        tstart = time.monotonic()
+        waited = False
+        conn = None
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise RuntimeError("connection pool is closed")
+                self._reap()
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                waited = True
+                remaining = tstart + self.checkout_timeout - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"no Postgres connection available after {self.checkout_timeout}s (max_size={self.max_size})")
+                self._lock.wait(remaining)
+            self._stats["checkouts"] += 1
+            wait_seconds = time.monotonic() - tstart
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["wait_seconds"] += wait_seconds
+
+        if conn is not None and self.pre_ping and not self._ping(conn):
+            with self._lock:
+                self._stats["ping_failures"] += 1
+                self._stats["discarded"] += 1
+            with contextlib.suppress(Exception):
+                conn.close()
+            conn = None
+        if conn is None:
+            conn = self._create()
+        DbMetrics.emit("pool_checkout", time.monotonic() - tstart, wait_seconds=wait_seconds if waited else 0.0)
+        return conn
+
+    def putconn(self, conn: Any, discard: bool = False) -> None:
+        """
+        Returns a connection to the pool, rolling back any open transaction.
+
+        :param conn: psycopg2 connection object from getconn.
+        :param discard: Close the connection instead of keeping it.
+        """
+        if not discard and not conn.closed:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+        with self._lock:
+            if discard or conn.closed or self._closed:
+                self._size -= 1
+                self._stats["discarded"] += 1
+                with contextlib.suppress(Exception):
+                    conn.close()
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._lock.notify()
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[tuple[Any, Any]]:
+        """
+        Context manager that checks out a connection and returns it on exit.
+
+        :return: Tuple of (cursor, connection), like Postgres.con_postgres.
+        """
+        ident = threading.get_ident()
+        conn = self.getconn()
+        with self._lock:
+            self._held[ident] = self._held.get(ident, 0) + 1
+        cursor = conn.cursor()
+        try:
+            yield cursor, conn
+        finally:
+            with contextlib.suppress(Exception):
+                cursor.close()
+            with self._lock:
+                self._held[ident] -= 1
+                if not self._held[ident]:
+                    del self._held[ident]
+            self.putconn(conn)
+
+    def _check_workers(self, workers: int) -> None:
+        """Raises if ``workers`` concurrent checkouts could starve behind connections the calling thread already holds."""
+        with self._lock:
+            held = self._held.get(threading.get_ident(), 0)
+        if workers + held > self.max_size:
+            raise ValueError(
+                f"parallel_workers={workers} needs a pool with max_size >= {workers + held} "
+                f"(the caller already holds {held} of its {self.max_size} connections)"
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns pool counters: checkouts, waits, wait and creation latency, and current sizes.
+
+        :return: Dict of pool statistics.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = self._size
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._size - len(self._idle)
+        stats["avg_creation_seconds"] = stats["creation_seconds"] / stats["created"] if stats["created"] else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Closes idle connections; checked-out connections are closed when returned."""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                with contextlib.suppress(Exception):
+                    conn.close()
+            self._lock.notify_all()
+
+    def __enter__(self) -> PostgresPool:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _hold_checkout(gen: Iterator[Any], stack: contextlib.ExitStack) -> Iterator[Any]:
+    with stack:
+        yield from gen
+
+
+def _pg_pooled(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Lets a PostgresETL method take a PostgresPool as ``conn``; a connection is checked out for the call."""
+    sig = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        bound = sig.bind(*args, **kwargs)
+        pool = bound.arguments.get("conn")
+        if not isinstance(pool, PostgresPool):
+            return fn(*args, **kwargs)
+        with contextlib.ExitStack() as stack:
+            cursor, conn = stack.enter_context(pool.connection())
+            bound.arguments["conn"] = conn
+            if "cursor" in sig.parameters and (bound.arguments.get("cursor") is None or isinstance(bound.arguments["cursor"], PostgresPool)):
+                bound.arguments["cursor"] = cursor
+            if "pool" in sig.parameters and bound.arguments.get("pool") is None:
+                bound.arguments["pool"] = pool
+            result = fn(*bound.args, **bound.kwargs)
+            # generators keep the connection until they are exhausted or closed
+            if inspect.isgenerator(result):
+                return _hold_checkout(result, stack.pop_all())
+            return result
+
+    return wrapper
+
 
 # MARK: - MySQL Connections
 class MySQL:
     """MySQL database connection helpers."""
 
     @classmethod
-    def eng_mysql(cls, usr: str, pwd: str, host: Optional[str] = None, db: Optional[str] = None) -> Any:
+    def eng_mysql(cls, usr: str, pwd: str, host: Optional[str] = None, db: Optional[str] = None, local_infile: bool = False) -> Any:
         """
         Creates a SQLAlchemy engine for a MySQL database.
 
@@ -115,12 +1629,13 @@ class MySQL:
         :param pwd: MySQL database password.
         :param host: MySQL database host.
         :param db: MySQL database name.
+        :param local_infile: Allow LOAD DATA LOCAL INFILE (needed for MySQLETL.insert_df_mysql(insert_type='infile')).
         :return: SQLAlchemy engine object.
         """
         from sqlalchemy import create_engine
 
         conn_str = f"mysql+pymysql://{usr}:{pwd}@{host if host else 'localhost'}{'/' + db if db else ''}"
-        engine = create_engine(conn_str, echo=False)
+        engine = create_engine(conn_str, echo=False, connect_args={"local_infile": True} if local_infile else {})
         return engine
 
 
@@ -151,51 +1666,26 @@ class Generic:
         return sql + group_by
 
     @classmethod
-    def make_db_schema(cls, df: Any) -> Any:
+    def make_db_schema(cls, df: Any, sample_size: Optional[int] = None, confidence: float = 1.0) -> Any:
         """
         Creates a mapping of Pandas data types to SQL data types.
 
+        Types are inferred with vectorized checks per column. With ``sample_size`` only a fixed
+        (seeded) random sample of rows is inspected; ``confidence`` is the share of a text column's
+        non-blank values that must parse as numbers for it to be typed numeric (1.0 = all of them),
+        otherwise it falls back to object.
+
         :param df: A Pandas DataFrame with column types to be converted.
+        :param sample_size: Number of rows to sample for inference (all rows if None).
+        :param confidence: Minimum share of parseable values for a text column to be typed numeric.
         :return: A Pandas DataFrame of columns with corresponding SQL data types.
         """
         import numpy as np
         import pandas as pd
 
-        cols = []
-        dtypes = []
-
-        for col in df.columns:
-            cols.append(col)
-            col_series = df[col].replace(r"^\s*$", np.nan, regex=True)
-            col_series = col_series.dropna()
-
-            try:
-                date_len = max(col_series.astype("str").str[:10].str.split("-").apply(lambda x: len(x)))
-                if date_len == 3:
-                    dtypes.append("datetime64[ns]")
-                    continue
-            except:
-                date_len = 0
-
-            try:
-                if col_series.astype("float").apply(float.is_integer).all():
-                    is_int = True
-                else:
-                    is_int = False
-            except:
-                dtypes.append("object")
-                continue
-
-            if is_int and date_len != 3:
-                dtype = "Int64"
-            elif not is_int and date_len != 3:
-                dtype = "float"
-            elif date_len == 3:
-                dtype = "datetime64[ns]"
-            else:
-                dtype = "object"
-
-            dtypes.append(dtype)
+        sample = df.sample(n=sample_size, random_state=0) if sample_size and len(df) > sample_size else df
+        cols = list(df.columns)
+        dtypes = [_infer_dtype(sample[col], confidence) for col in cols]
 
         schema_df = pd.DataFrame({"col": cols, "dtype_new": dtypes})
         old_schema_df = pd.DataFrame(df.dtypes, columns=["dtype_old"]).reset_index()
@@ -209,27 +1699,134 @@ class Generic:
         return schema_df2
 
     @classmethod
-    def db_apply_schema(cls, df: Any, schema_df: Any) -> Any:
+    def profile_df(cls, df: Any, sample_size: Optional[int] = None) -> Any:
+        """
+        Profiles DataFrame columns in one vectorized pass per chunk.
+
+        Reports the value kind, row and null counts, min/max, maximum string length and an
+        estimated distinct count. ``df`` may also be an iterable of DataFrames, which are
+        profiled one at a time and merged, widening kinds where chunks disagree.
+
+        :param df: Pandas DataFrame, or an iterable of DataFrames with the same columns.
+        :param sample_size: Rows sampled per chunk for kind, length and distinct estimates (counts and min/max use all rows).
+        :return: Pandas DataFrame with one row per column.
+        """
+        import pandas as pd
+
+        chunks = [df] if isinstance(df, pd.DataFrame) else df
+        prof: Optional[dict[str, dict[str, Any]]] = None
+        for chunk in chunks:
+            chunk_prof = _profile_chunk(chunk, sample_size=sample_size)
+            prof = chunk_prof if prof is None else _merge_profiles(prof, chunk_prof)
+        return _profile_frame(prof or {})
+
+    @classmethod
+    def compact_df(
+        cls,
+        df: Any,
+        profile: Any = None,
+        category_ratio: float = 0.5,
+        inplace: bool = False,
+        return_report: bool = False,
+    ) -> Any:
+        """
+        Shrinks a DataFrame's memory footprint without changing its values.
+
+        Integer columns are downcast to the narrowest of int8/int16/int32 that holds their
+        profiled min/max (nullable Int stays nullable), float64 columns become float32 when every
+        value is exactly representable, and text columns whose estimated distinct count is at
+        most ``category_ratio`` of their non-null values become categoricals. A conversion is kept
+        only if it makes the column smaller. Prints the bytes saved.
+
+        :param df: Pandas DataFrame.
+        :param profile: Output of profile_df for df (computed if None).
+        :param category_ratio: Highest distinct/non-null ratio for a text column to become a category.
+        :param inplace: Assign compacted columns into df itself rather than a shallow copy.
+        :param return_report: Also return a per-column report of dtypes and bytes before/after.
+        :return: Compacted DataFrame, or a tuple of (DataFrame, report DataFrame) if return_report is True.
+        """
+        import pandas as pd
+
+        if profile is None:
+            profile = cls.profile_df(df)
+        if not inplace:
+            df = df.copy(deep=False)
+
+        rows = []
+        for _, p in profile.iterrows():
+            col = p["column"]
+            s = df[col]
+            before = int(s.memory_usage(index=False, deep=True))
+            dtype = _compact_dtype(s, p, category_ratio)
+            after = before
+            if dtype is not None:
+                compacted = s.astype(dtype)
+                size = int(compacted.memory_usage(index=False, deep=True))
+                if size < before:
+                    df[col], after = compacted, size
+            rows.append(
+                {"column": col, "dtype_before": str(s.dtype), "dtype_after": str(df[col].dtype), "bytes_before": before, "bytes_after": after}
+            )
+
+        report = pd.DataFrame(rows, columns=["column", "dtype_before", "dtype_after", "bytes_before", "bytes_after"])
+        before_total, after_total = int(report["bytes_before"].sum()), int(report["bytes_after"].sum())
+        print(f"Compacted: {before_total / 1e6:.1f} MB -> {after_total / 1e6:.1f} MB ({(before_total - after_total) / 1e6:.1f} MB saved)")
+        return (df, report) if return_report else df
+
+    @classmethod
+    def row_hash(cls, df: Any, cols: Optional[list[str]] = None) -> Any:
+        """
+        Computes a vectorized 64-bit content hash per row.
+
+        The hash depends on values and dtypes (1 and 1.0 hash differently), so frames compared
+        across runs should be built the same way. The index is not part of the hash.
+
+        :param df: Pandas DataFrame.
+        :param cols: Columns to hash (all columns if None).
+        :return: Pandas Series of signed 64-bit hashes aligned to df's index (fits a BIGINT column).
+        """
+        import pandas as pd
+
+        hashed = pd.util.hash_pandas_object(df[cols or list(df.columns)], index=False)
+        return pd.Series(hashed.to_numpy().view("int64"), index=df.index)
+
+    @classmethod
+    def db_apply_schema(cls, df: Any, schema_df: Any, inplace: bool = False) -> Any:
         """
         Applies a schema DataFrame to a Pandas DataFrame.
 
+        Columns are grouped by target type and each group is converted in one vectorized call
+        (integers are parsed per column into Int64 without a float64 round trip, and timestamps
+        per column since date format inference is per call). Nulls stay nulls; VARCHAR no longer
+        turns NaN into the string "nan".
+
         :param df: Pandas DataFrame.
-        :param schema_df: Schema DataFrame from make_db_schema.
+        :param schema_df: Schema DataFrame with column/type rows (VARCHAR, INTEGER, FLOAT, TIMESTAMP), or the output of make_db_schema.
+        :param inplace: Assign converted columns into df itself rather than a shallow copy.
         :return: DataFrame with applied schema.
         """
         import pandas as pd
 
-        for idx, row in schema_df.iterrows():
-            col = row["column"]
-            col_type = row["type"]
-            if col_type == "VARCHAR":
-                df[col] = df[col].astype(str)
-            elif col_type == "INTEGER":
-                df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
-            elif col_type == "FLOAT":
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-            elif col_type == "TIMESTAMP":
-                df[col] = pd.to_datetime(df[col], errors="coerce")
+        if "type" in schema_df.columns:
+            targets = zip(schema_df["column"], schema_df["type"])
+        else:
+            targets = ((col, _SCHEMA_DTYPE_TYPES.get(str(dtype))) for col, dtype in zip(schema_df["col"], schema_df["dtype_final"]))
+        groups: dict[Any, list[str]] = {}
+        for col, col_type in targets:
+            groups.setdefault(col_type, []).append(col)
+        if not inplace:
+            df = df.copy(deep=False)
+
+        if groups.get("VARCHAR"):
+            block = df[groups["VARCHAR"]]
+            df[groups["VARCHAR"]] = block.astype(str).mask(block.isna())
+        for col in groups.get("INTEGER", []):
+            # nullable parsing keeps integers above 2**53 exact; a float64 pass would round them
+            df[col] = pd.to_numeric(df[col], errors="coerce", dtype_backend="numpy_nullable").astype("Int64")
+        if groups.get("FLOAT"):
+            df[groups["FLOAT"]] = _to_numeric_block(df[groups["FLOAT"]])
+        for col in groups.get("TIMESTAMP", []):
+            df[col] = pd.to_datetime(df[col], errors="coerce")
         return df
 
     @classmethod
@@ -259,12 +1856,426 @@ class Generic:
         :param sql: SQL statement to execute.
         :return: Elapsed time to execute query.
         """
-        rptg_tstart = datetime.now()
-        engine.execute(sql)
-        rptg_tend = datetime.now()
-        tdelta = rptg_tend - rptg_tstart
-        tdelta = tdelta.total_seconds() / 60
-        print(f"Runtime: {tdelta}")
+        with _timed("run_query", sql_hash=_sql_hash(sql)) as event:
+            engine.execute(sql)
+        print(f"Runtime: {event['seconds'] / 60}")
+
+
+# MARK: - Result Cache
+
+_SQL_TABLE_RE = re.compile(r"\b(?:from|join)\s+((?:\"[^\"]+\"|\w+)(?:\.(?:\"[^\"]+\"|\w+))?)", re.IGNORECASE)
+
+
+def _sql_tables(sql: str) -> list[str]:
+    """Unqualified, lower-cased names of the tables a query reads FROM or JOINs."""
+    return sorted({m.split(".")[-1].strip('"').lower() for m in _SQL_TABLE_RE.findall(sql)})
+
+
+def _conn_identity(conn: Any) -> str:
+    """Identifies the database a connection or pool points at (user@host:port/db), without the password."""
+    if isinstance(conn, PostgresPool):
+        kw = conn._connect_kwargs
+        return f"{kw['usr']}@{kw['host']}:{kw['port']}/{kw['db']}"
+    params = conn.get_dsn_parameters() if hasattr(conn, "get_dsn_parameters") else {}
+    if params:
+        return f"{params.get('user')}@{params.get('host')}:{params.get('port')}/{params.get('dbname')}"
+    return str(getattr(conn, "dsn", type(conn).__name__))
+
+
+class ResultCache:
+    """
+    On-disk cache of query results keyed by normalized SQL and connection target.
+
+    Each entry is a Parquet (or Feather) file with a JSON sidecar holding the SQL, the tables it
+    reads and its creation time. Entries expire after ``ttl`` seconds, and once the data files
+    exceed ``max_bytes`` the least recently read entries are evicted. A hit touches the data
+    file's mtime, so several processes can share one cache directory. Requires pyarrow (part of
+    the db extra); without it every result is read from the database and nothing is cached.
+
+    :param cache_dir: Directory for cache files (created if missing).
+    :param ttl: Seconds an entry stays valid (None = until invalidated or evicted).
+    :param max_bytes: Size bound for all cached data files.
+    :param file_format: 'parquet' or 'feather'.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl: Optional[float] = 3600.0,
+        max_bytes: int = 1 << 30,
+        file_format: str = "parquet",
+    ) -> None:
+        if file_format not in ("parquet", "feather"):
+            raise ValueError(f"file_format must be 'parquet' or 'feather', got '{file_format}'")
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.file_format = file_format
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, sql: str, conn: Any, variant: str = "") -> str:
+        """
+        Cache key for a query: whitespace and a trailing semicolon are ignored, literals are not.
+
+        :param sql: SQL query string.
+        :param conn: Postgres connection or PostgresPool the query would run on.
+        :param variant: Reader the result came from, for results whose dtypes differ (e.g. 'columnar').
+        :return: Hex digest.
+        """
+        normalized = " ".join(sql.split()).rstrip(";").strip()
+        if variant:
+            normalized = f"{variant}\n{normalized}"
+        return _sql_hash(f"{_conn_identity(conn)}\n{normalized}")
+
+    def get(self, sql: str, conn: Any, variant: str = "") -> Any:
+        """
+        Returns the cached result of a query, or None when missing or expired.
+
+        :param sql: SQL query string.
+        :param conn: Postgres connection or PostgresPool (only used for the key; nothing is executed).
+        :param variant: Reader variant the result must come from (see key).
+        :return: Pandas DataFrame or None.
+        """
+        import pandas as pd
+
+        key = self.key(sql, conn, variant)
+        meta_path, data_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if self.ttl is not None and time.time() - meta["created"] > self.ttl:
+                self._remove(key)
+                raise FileNotFoundError(data_path)
+            df = pd.read_parquet(data_path) if self.file_format == "parquet" else pd.read_feather(data_path)
+            os.utime(data_path)
+        except (OSError, ValueError, KeyError):
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return df
+
+    def put(self, sql: str, conn: Any, df: Any, tables: Optional[list[str]] = None, variant: str = "") -> None:
+        """
+        Stores a query result, then evicts least recently read entries beyond max_bytes.
+
+        Frames the file format cannot hold (e.g. mixed-type object columns) are skipped, as is
+        every frame when pyarrow is not installed.
+
+        :param sql: SQL query string.
+        :param conn: Postgres connection or PostgresPool the query ran on.
+        :param df: Pandas DataFrame result.
+        :param tables: Tables the result depends on for invalidate (parsed from FROM/JOIN if None).
+        :param variant: Reader variant the result came from (see key).
+        """
+        key = self.key(sql, conn, variant)
+        meta_path, data_path = self._paths(key)
+        tmp_path = f"{data_path}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            if self.file_format == "parquet":
+                df.to_parquet(tmp_path)
+            else:
+                df.reset_index(drop=True).to_feather(tmp_path)
+        except (ValueError, TypeError, ImportError) as e:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            print(f"Not caching result: {e}")
+            return
+        os.replace(tmp_path, data_path)
+        meta = {
+            "sql": sql,
+            "tables": sorted({t.split(".")[-1].strip('"').lower() for t in tables}) if tables else _sql_tables(sql),
+            "created": time.time(),
+        }
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+        self._evict()
+
+    def invalidate(self, tables: Any = None) -> int:
+        """
+        Removes entries that read any of the given tables (all entries if None).
+
+        Tables are matched on their unqualified name, so 'sales.orders' also drops results
+        that read 'orders' from another schema.
+
+        :param tables: Table name or list of table names.
+        :return: Number of entries removed.
+        """
+        if isinstance(tables, str):
+            tables = [tables]
+        names = {t.split(".")[-1].strip('"').lower() for t in tables} if tables is not None else None
+        removed = 0
+        for key in self._keys():
+            if names is not None:
+                try:
+                    with open(self._paths(key)[0]) as f:
+                        if not names.intersection(json.load(f)["tables"]):
+                            continue
+                except (OSError, ValueError, KeyError):
+                    pass
+            self._remove(key)
+            removed += 1
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Reports hit/miss/eviction counts and the current number and size of entries.
+
+        :return: Dict of cache statistics.
+        """
+        sizes = [os.path.getsize(p) for p in (self._paths(k)[1] for k in self._keys()) if os.path.exists(p)]
+        return {**self._stats, "entries": len(sizes), "bytes": sum(sizes)}
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.json", f"{base}.{self.file_format}"
+
+    def _keys(self) -> list[str]:
+        return [name[: -len(".json")] for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+
+    def _remove(self, key: str) -> None:
+        for path in self._paths(key):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+    def _evict(self) -> None:
+        entries = []
+        for key in self._keys():
+            data_path = self._paths(key)[1]
+            with contextlib.suppress(FileNotFoundError):
+                entries.append((os.path.getmtime(data_path), os.path.getsize(data_path), key))
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            self._stats["evictions"] += 1
+
+
+# MARK: - Spilled Results
+class SpilledResult:
+    """
+    Lazy handle to a query result spilled to a local Parquet file, one row group per fetched batch.
+
+    Nothing is read until asked for: batches can be re-read one row group at a time (optionally
+    from a given row group, to restart a pipeline part way), a subset of columns can be loaded,
+    and ``to_pandas`` refuses to materialize more than ``memory_limit`` bytes. A handle can be
+    reopened from the path alone. Requires pyarrow.
+
+    :param path: Path of the spilled Parquet file.
+    :param memory_limit: Default limit in bytes for to_pandas (None = no limit).
+    """
+
+    def __init__(self, path: str, memory_limit: Optional[int] = None) -> None:
+        self.path = path
+        self.memory_limit = memory_limit
+
+    def __repr__(self) -> str:
+        return f"SpilledResult(path={self.path!r}, rows={self.num_rows}, row_groups={self.num_row_groups})"
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def _file(self) -> Any:
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(self.path)
+
+    @property
+    def num_rows(self) -> int:
+        return int(self._file().metadata.num_rows)
+
+    @property
+    def num_row_groups(self) -> int:
+        return int(self._file().metadata.num_row_groups)
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._file().schema_arrow.names)
+
+    def nbytes(self, columns: Optional[list[str]] = None) -> int:
+        """
+        Estimates the in-memory size of the result from the Parquet metadata (uncompressed column sizes).
+
+        :param columns: Columns to count (all columns if None).
+        :return: Estimated size in bytes.
+        """
+        meta = self._file().metadata
+        total = 0
+        for rg in range(meta.num_row_groups):
+            group = meta.row_group(rg)
+            for idx in range(group.num_columns):
+                chunk = group.column(idx)
+                if columns is None or chunk.path_in_schema in columns:
+                    total += chunk.total_uncompressed_size
+        return total
+
+    def iter_batches(self, columns: Optional[list[str]] = None, start: int = 0) -> Iterator[Any]:
+        """
+        Re-reads the result one fetched batch (row group) at a time.
+
+        :param columns: Columns to read (all columns if None).
+        :param start: Row group to start from, e.g. to resume after the last one processed.
+        :return: Generator of Pandas DataFrames.
+        """
+        pf = self._file()
+        for rg in range(start, pf.metadata.num_row_groups):
+            yield pf.read_row_group(rg, columns=columns).to_pandas()
+
+    def to_pandas(self, columns: Optional[list[str]] = None, filters: Any = None, memory_limit: Optional[int] = None) -> Any:
+        """
+        Loads the result (or part of it) into one DataFrame if it fits the memory limit.
+
+        :param columns: Columns to read (all columns if None).
+        :param filters: Row filters passed to pandas.read_parquet, e.g. [("state", "=", "NY")].
+        :param memory_limit: Limit in bytes (defaults to the handle's memory_limit).
+        :return: Pandas DataFrame.
+        """
+        import pandas as pd
+
+        limit = self.memory_limit if memory_limit is None else memory_limit
+        if limit is not None:
+            size = self.nbytes(columns)
+            if size > limit:
+                raise MemoryError(
+                    f"spilled result needs ~{size / 1e6:.0f} MB, over the {limit / 1e6:.0f} MB limit; use iter_batches or fewer columns"
+                )
+        return pd.read_parquet(self.path, columns=columns, filters=filters)
+
+    def delete(self) -> None:
+        """Removes the spilled file."""
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path)
+
+
+# MARK: - Catalog Cache
+class PgCatalog:
+    """
+    Snapshot cache of table and column metadata, loaded one schema at a time.
+
+    A snapshot is read with a single pg_catalog query (tables, views and foreign tables with their
+    columns and types) and answers lookups from dicts until ``ttl`` seconds pass. Snapshots are
+    keyed by connection target and schema. DDL issued through PostgresETL (create_tbl_pg,
+    drop_tbl_pg, alter_column_pg, make_tbl_complete_pg) invalidates the affected schema in every
+    live PgCatalog; call invalidate after DDL run any other way.
+
+    :param ttl: Seconds a snapshot stays valid (None = until invalidated).
+    """
+
+    _instances: weakref.WeakSet[PgCatalog] = weakref.WeakSet()
+
+    def __init__(self, ttl: Optional[float] = 300.0) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshots: dict[tuple[str, str], tuple[float, dict[str, dict[str, str]]]] = {}
+        self._stats = {"loads": 0, "hits": 0, "load_seconds": 0.0}
+        PgCatalog._instances.add(self)
+
+    def snapshot(self, conn: Any, schema_name: str = "public") -> dict[str, dict[str, str]]:
+        """
+        Returns the cached metadata of a schema, loading it if missing or expired.
+
+        :param conn: Postgres database connection object (or PostgresPool).
+        :param schema_name: Schema name.
+        :return: Dict of table name -> {column name: data type}, columns in ordinal order.
+        """
+        key = (_conn_identity(conn), schema_name)
+        with self._lock:
+            cached = self._snapshots.get(key)
+            if cached is not None and (self.ttl is None or time.monotonic() - cached[0] <= self.ttl):
+                self._stats["hits"] += 1
+                return cached[1]
+
+        tstart = time.monotonic()
+        sql = f"""
+        SELECT c.relname AS table_name, a.attname AS column_name, format_type(a.atttypid, NULL) AS data_type
+        FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+        WHERE n.nspname = '{schema_name}'
+        AND c.relkind IN ('r', 'p', 'v', 'f')
+        ORDER BY c.relname, a.attnum
+        """
+        df = PostgresETL.read_pg(sql=sql, conn=conn)
+        tables: dict[str, dict[str, str]] = {}
+        for tbl, col, data_type in df[["table_name", "column_name", "data_type"]].itertuples(index=False):
+            cols = tables.setdefault(tbl, {})
+            if isinstance(col, str):
+                cols[col] = data_type
+        with self._lock:
+            self._snapshots[key] = (time.monotonic(), tables)
+            self._stats["loads"] += 1
+            self._stats["load_seconds"] += time.monotonic() - tstart
+        return tables
+
+    def tables(self, conn: Any, schema_name: str = "public") -> list[str]:
+        """
+        Lists the tables in a schema.
+
+        :param conn: Postgres database connection object (or PostgresPool).
+        :param schema_name: Schema name.
+        :return: Sorted table names.
+        """
+        return sorted(self.snapshot(conn, schema_name))
+
+    def columns(self, tbl_name: str, conn: Any, schema_name: str = "public") -> dict[str, str]:
+        """
+        Looks up a table's columns.
+
+        :param tbl_name: Postgres table name.
+        :param conn: Postgres database connection object (or PostgresPool).
+        :param schema_name: Schema name.
+        :return: Dict of column name -> data type in ordinal order (empty if the table does not exist).
+        """
+        return dict(self.snapshot(conn, schema_name).get(tbl_name, {}))
+
+    def column_type(self, tbl_name: str, col_name: str, conn: Any, schema_name: str = "public") -> Optional[str]:
+        """
+        Looks up one column's data type.
+
+        :param tbl_name: Postgres table name.
+        :param col_name: Column name.
+        :param conn: Postgres database connection object (or PostgresPool).
+        :param schema_name: Schema name.
+        :return: Data type, or None if the table or column does not exist.
+        """
+        return self.snapshot(conn, schema_name).get(tbl_name, {}).get(col_name)
+
+    def invalidate(self, schema_name: Optional[str] = None) -> None:
+        """
+        Drops cached snapshots of a schema (all schemas if None).
+
+        :param schema_name: Schema name.
+        """
+        with self._lock:
+            for key in [k for k in self._snapshots if schema_name is None or k[1] == schema_name]:
+                del self._snapshots[key]
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Reports snapshot loads, lookup hits and time spent loading.
+
+        :return: Dict of catalog statistics.
+        """
+        with self._lock:
+            return {**self._stats, "snapshots": len(self._snapshots)}
+
+    @classmethod
+    def invalidate_table(cls, tbl_name: str, schema_name: Any = None) -> None:
+        """
+        Invalidates every live PgCatalog after DDL on a table.
+
+        An unqualified name without ``schema_name`` may resolve to any schema on the search_path,
+        so all snapshots are dropped in that case.
+
+        :param tbl_name: Postgres table name, optionally schema-qualified.
+        :param schema_name: Schema name.
+        """
+        if not schema_name and "." in tbl_name:
+            schema_name = tbl_name.split(".")[0].strip('"')
+        for catalog in list(cls._instances):
+            catalog.invalidate(schema_name or None)
 
 
 # MARK: - Postgres ETL
@@ -272,22 +2283,79 @@ class PostgresETL:
     """Postgres-specific ETL operations."""
 
     @classmethod
-    def run_query_pg(cls, conn: Any, sql: str) -> None:
+    @_pg_pooled
+    def run_query_pg(cls, conn: Any, sql: str, profiler: Optional[PlanProfiler] = None) -> None:
         """
         Executes a SQL statement with a Postgres database connection.
 
         :param conn: Postgres database connection object.
         :param sql: SQL Statement to execute.
+        :param profiler: Optional PlanProfiler capturing EXPLAIN ANALYZE plans of sampled or slow runs.
         :return: Elapsed time to execute query.
         """
-        rptg_tstart = datetime.now()
+        with _timed("run_query_pg", sql_hash=_sql_hash(sql)) as event:
+            cur = conn.cursor()
+            if profiler is not None:
+                rows = profiler.run(cur, sql, lambda explain: cur.execute(explain + sql), key=_sql_hash(sql)[:16], group=_sql_hash(sql))
+            else:
+                cur.execute(sql)
+                rows = getattr(cur, "rowcount", -1)
+            if rows >= 0:
+                event["rows"] = rows
+            conn.commit()
+        print(f"Runtime: {event['seconds'] / 60}")
+
+    @classmethod
+    @_pg_pooled
+    def run_queries_pg(cls, conn: Any, statements: list[str], savepoints: bool = False, raise_errors: bool = False) -> Any:
+        """
+        Executes several SQL statements on one cursor with a single commit.
+
+        Without ``savepoints`` the statements form one transaction: the first failure rolls all of
+        them back and the remaining statements are skipped. With ``savepoints`` each statement runs
+        behind a savepoint that is set (and the previous one released) in the same round trip as the
+        statement, so a failure only undoes that statement and the rest are committed together.
+
+        :param conn: Postgres database connection object.
+        :param statements: SQL statements, executed in order.
+        :param savepoints: Isolate each statement with a savepoint instead of failing the whole batch.
+        :param raise_errors: Re-raise the first error once the batch has been rolled back or committed.
+        :return: Pandas DataFrame with one row per statement: sql, status, error, rows, seconds.
+        """
+        import pandas as pd
+
+        results = [{"sql": sql, "status": "skipped", "error": None, "rows": None, "seconds": 0.0} for sql in statements]
+        first_error: Optional[Exception] = None
+        prefix = "SAVEPOINT fusetools_sp; " if savepoints else ""
         cur = conn.cursor()
-        cur.execute(sql)
-        conn.commit()
-        rptg_tend = datetime.now()
-        tdelta = rptg_tend - rptg_tstart
-        tdelta = tdelta.total_seconds() / 60
-        print(f"Runtime: {tdelta}")
+        rptg_tstart = time.monotonic()
+        for res in results:
+            try:
+                with _timed("run_queries_pg", sql_hash=_sql_hash(res["sql"])) as event:
+                    cur.execute(prefix + res["sql"])
+                    if getattr(cur, "rowcount", -1) >= 0:
+                        event["rows"] = cur.rowcount
+                res.update(status="success", rows=event.get("rows"), seconds=event["seconds"])
+            except Exception as e:
+                res.update(status="failed", error=str(e), seconds=event["seconds"])
+                first_error = first_error or e
+                if not savepoints:
+                    conn.rollback()
+                    break
+                cur.execute("ROLLBACK TO SAVEPOINT fusetools_sp")
+            if savepoints:
+                prefix = "RELEASE SAVEPOINT fusetools_sp; SAVEPOINT fusetools_sp; "
+
+        if savepoints or first_error is None:
+            conn.commit()
+        else:
+            for res in results:
+                if res["status"] == "success":
+                    res["status"] = "rolled_back"
+        print(f"Runtime: {(time.monotonic() - rptg_tstart) / 60}")
+        if raise_errors and first_error is not None:
+            raise first_error
+        return pd.DataFrame(results, columns=["sql", "status", "error", "rows", "seconds"])
 
     @classmethod
     def insert_val_pg(cls, col_list: list[str], val_list: list[Any], tbl_name: str) -> str:
@@ -357,6 +2425,7 @@ class PostgresETL:
         src_insert_cols: list[str],
         src_update_cols: Any = False,
         update_compare_cols: Any = False,
+        md5_col: Any = False,
     ) -> tuple[str, str]:
         """
         Creates SQL to run an UPSERT (INSERT new records or UPDATE existing records) operation of a given Postgres table.
@@ -366,7 +2435,10 @@ class PostgresETL:
         :param src_join_cols: Columns to use to join source and target tables.
         :param src_insert_cols: Columns to be inserted from source table.
         :param src_update_cols: Columns to be updated from source table.
-        :param update_compare_cols: Columns to use to compare values across source and target tables.
+        :param update_compare_cols: Columns to use to compare values across source and target tables (NULL-safe).
+        :param md5_col: Target TEXT column holding md5(ROW(compare cols)::text), computed in SQL; written on
+            insert/update and compared instead of the individual columns, so unchanged rows are not rewritten.
+            Not interchangeable with the BIGINT Generic.row_hash column of upsert_df_pg(hash_col=...).
         :return: A SQL Insert statement and a SQL Update statement.
         """
         src_join_cols_ = str([f"t.{c} = s.{c} AND " for c in src_join_cols]).replace("[", "").replace("]", "").replace("'", "").replace(",", "")
@@ -378,6 +2450,13 @@ class PostgresETL:
         src_join_cols_f = src_join_cols_f[: src_join_cols_f.rfind("AND")]
 
         src_insert_cols_ = str([f"s.{c}" for c in src_insert_cols]).replace("[", "").replace("]", "").replace("'", "")
+        tgt_insert_cols_ = ""
+
+        compare_cols = update_compare_cols or src_update_cols or src_insert_cols
+        hash_expr = f"md5(ROW({', '.join([f's.{c}' for c in compare_cols])})::text)"
+        if md5_col:
+            tgt_insert_cols_ = f"({', '.join(src_insert_cols)}, {md5_col})"
+            src_insert_cols_ = f"{src_insert_cols_}, {hash_expr}"
 
         if src_update_cols:
             src_update_cols_ = str([f"{c} = s.{c}," for c in src_update_cols]).replace("[", "").replace("]", "").replace("', '", "").replace("'", "")
@@ -386,17 +2465,14 @@ class PostgresETL:
 
             # update join statement
             src_join_cols2_ = src_join_cols_.replace("t.", f"{tgt_tbl}.")
-            if update_compare_cols:
-                update_compare_cols_ = (
-                    str([f"s.{c} != {tgt_tbl}.{c}," for c in update_compare_cols])
-                    .replace("[", "")
-                    .replace("]", "")
-                    .replace("', '", "")
-                    .replace("'", "")
-                )
-
-                update_compare_cols_ = update_compare_cols_[: update_compare_cols_.rfind(",")]
-                src_join_cols2_ = src_join_cols2_ + " AND " + update_compare_cols_
+            if md5_col:
+                src_update_cols_ = f"{src_update_cols_},{md5_col} = {hash_expr}"
+                src_join_cols2_ = f"{src_join_cols2_} AND {tgt_tbl}.{md5_col} IS DISTINCT FROM {hash_expr}"
+            elif update_compare_cols:
+                # row comparison so NULL -> value (and value -> NULL) counts as a change
+                src_row = ", ".join([f"s.{c}" for c in update_compare_cols])
+                tgt_row = ", ".join([f"{tgt_tbl}.{c}" for c in update_compare_cols])
+                src_join_cols2_ = f"{src_join_cols2_} AND ({src_row}) IS DISTINCT FROM ({tgt_row})"
 
             sql_update = f"""
                 /* Update records*/
@@ -410,7 +2486,7 @@ class PostgresETL:
 
         sql_insert = f"""
             /* Insert records*/
-            INSERT INTO {tgt_tbl}
+            INSERT INTO {tgt_tbl} {tgt_insert_cols_}
             SELECT {src_insert_cols_}
             FROM {src_tbl} s
             LEFT JOIN {tgt_tbl} t
@@ -421,6 +2497,7 @@ class PostgresETL:
         return sql_update, sql_insert
 
     @classmethod
+    @_pg_pooled
     def upsert_df_pg(
         cls,
         df: Any,
@@ -429,39 +2506,163 @@ class PostgresETL:
         cursor: Any,
         constraint_col: str,
         schema_name: Optional[str] = None,
-    ) -> None:
+        upsert_type: str = "batch",
+        chunk_size: Optional[int] = None,
+        copy_format: str = "text",
+        hash_col: Optional[str] = None,
+    ) -> Any:
         """
         Upserts a DataFrame into a Postgres table.
 
+        With ``upsert_type='staging'`` the frame is COPYed into a temporary staging table and merged
+        with a single INSERT ... SELECT ... ON CONFLICT DO UPDATE per chunk (see upsert_df_staged_pg).
+
+        With ``hash_col`` each row's Generic.row_hash is written to that BIGINT column and existing
+        rows are only updated when the stored hash differs. In batch mode with a single-column
+        constraint, rows whose stored hash already matches are not sent at all.
+
         :param df: Pandas DataFrame.
         :param tbl_name: Postgres table name.
         :param conn: Postgres database connection object.
         :param cursor: Postgres database cursor object.
         :param constraint_col: Column to use for conflict resolution.
         :param schema_name: Schema name.
+        :param upsert_type: 'batch' (execute_batch row by row) or 'staging' (COPY + set-based merge).
+        :param chunk_size: Rows per staged merge transaction when upsert_type is 'staging' (all rows if None).
+        :param copy_format: COPY format when upsert_type is 'staging' ('text' or 'binary').
+        :param hash_col: Target BIGINT column storing a per-row Generic.row_hash (computed in pandas, not md5); unchanged rows are skipped.
+        :return: Per-phase timings when upsert_type is 'staging', otherwise None.
         """
+        if upsert_type == "staging":
+            return cls.upsert_df_staged_pg(
+                df=df,
+                tbl_name=tbl_name,
+                conn=conn,
+                cursor=cursor,
+                constraint_col=constraint_col,
+                schema_name=schema_name,
+                chunk_size=chunk_size,
+                copy_format=copy_format,
+                hash_col=hash_col,
+            )
+
         import numpy as np
 
         full_tbl = f"{schema_name}.{tbl_name}" if schema_name else tbl_name
+        changed_only = ""
+        if hash_col:
+            df = df.assign(**{hash_col: Generic.row_hash(df.drop(columns=[hash_col], errors="ignore"))})
+            if "," not in constraint_col:
+                rows = len(df)
+                df = _changed_rows(df, full_tbl, cursor, constraint_col.strip(), hash_col)
+                print(f"Skipping {rows - len(df)} unchanged rows")
+            changed_only = f" WHERE tgt.{hash_col} IS DISTINCT FROM EXCLUDED.{hash_col}"
         df_load = df.replace({np.nan: None})
         df_columns = list(df_load)
         columns = ",".join(df_columns)
         values = ",".join(["%s" for _ in df_columns])
         update_cols = ",".join([f"{c}=EXCLUDED.{c}" for c in df_columns if c != constraint_col])
 
-        insert_stmt = f"INSERT INTO {full_tbl} ({columns}) VALUES ({values}) ON CONFLICT ({constraint_col}) DO UPDATE SET {update_cols}"
+        insert_stmt = (
+            f"INSERT INTO {full_tbl} AS tgt ({columns}) VALUES ({values}) ON CONFLICT ({constraint_col}) DO UPDATE SET {update_cols}{changed_only}"
+        )
 
-        rptg_tstart = datetime.now()
         import psycopg2.extras
 
-        psycopg2.extras.execute_batch(cursor, insert_stmt, df_load.values)
+        with _timed("upsert_batch", table=full_tbl, rows=len(df_load)) as event:
+            psycopg2.extras.execute_batch(cursor, insert_stmt, df_load.values)
+            conn.commit()
+        print(f"Runtime: {event['seconds'] / 60}")
+
+    @classmethod
+    @_pg_pooled
+    def upsert_df_staged_pg(
+        cls,
+        df: Any,
+        tbl_name: str,
+        conn: Any,
+        cursor: Any,
+        constraint_col: str,
+        schema_name: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        copy_format: str = "text",
+        hash_col: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Upserts a DataFrame through a temporary staging table and one set-based merge per chunk.
+
+        Each chunk is COPYed into a TEMP table shaped like the target's columns, then merged with a
+        single INSERT ... SELECT ... ON CONFLICT DO UPDATE and committed, so row locks are only held
+        for that statement. When a key repeats within a chunk the last row wins, as with execute_batch.
+        With ``hash_col`` the merge only updates rows whose stored hash differs from Generic.row_hash.
+
+        :param df: Pandas DataFrame.
+        :param tbl_name: Postgres table name.
+        :param conn: Postgres database connection object.
+        :param cursor: Postgres database cursor object.
+        :param constraint_col: Column (or comma-separated columns) of the target's unique constraint.
+        :param schema_name: Schema name.
+        :param chunk_size: Rows per staged merge transaction (all rows if None).
+        :param copy_format: COPY format ('text' or 'binary').
+        :param hash_col: Target BIGINT column storing a per-row Generic.row_hash (computed in pandas, not md5); unchanged rows are not updated.
+        :return: Dict with rows, rows merged and seconds spent in the stage, copy and merge phases.
+        """
+        full_tbl = f"{schema_name}.{tbl_name}" if schema_name else tbl_name
+        stage_tbl = f"fusetools_stage_{uuid.uuid4().hex[:12]}"
+        if hash_col:
+            df = df.assign(**{hash_col: Generic.row_hash(df.drop(columns=[hash_col], errors="ignore"))})
+        df_columns = list(df)
+        key_cols = [c.strip() for c in constraint_col.split(",")]
+        columns = ",".join(df_columns)
+        update_cols = ",".join([f"{c}=EXCLUDED.{c}" for c in df_columns if c not in key_cols])
+        conflict_action = f"DO UPDATE SET {update_cols}" if update_cols else "DO NOTHING"
+        if hash_col:
+            conflict_action += f" WHERE tgt.{hash_col} IS DISTINCT FROM EXCLUDED.{hash_col}"
+        merge_stmt = f"""
+            INSERT INTO {full_tbl} AS tgt ({columns})
+            SELECT DISTINCT ON ({constraint_col}) {columns} FROM {stage_tbl}
+            ORDER BY {constraint_col}, fusetools_seq DESC
+            ON CONFLICT ({constraint_col}) {conflict_action}
+            """
+        timings = {"rows": len(df), "rows_merged": 0, "stage_seconds": 0.0, "copy_seconds": 0.0, "merge_seconds": 0.0}
+
+        rptg_tstart = time.monotonic()
+        tstart = time.monotonic()
+        cursor.execute(f"CREATE TEMP TABLE {stage_tbl} ON COMMIT DELETE ROWS AS SELECT {columns} FROM {full_tbl} WITH NO DATA")
+        cursor.execute(f"ALTER TABLE {stage_tbl} ADD COLUMN fusetools_seq BIGSERIAL")
         conn.commit()
-        rptg_tend = datetime.now()
-        tdelta = rptg_tend - rptg_tstart
-        tdelta = tdelta.total_seconds() / 60
-        print(f"Runtime: {tdelta}")
+        timings["stage_seconds"] += time.monotonic() - tstart
+
+        try:
+            step = chunk_size or max(len(df), 1)
+            for i in range(0, len(df), step):
+                tstart = time.monotonic()
+                cls._copy_df(df.iloc[i : i + step], stage_tbl, cursor, copy_format=copy_format)
+                timings["copy_seconds"] += time.monotonic() - tstart
+
+                with _timed("upsert_merge", table=full_tbl) as event:
+                    cursor.execute(merge_stmt)
+                    event["rows"] = max(cursor.rowcount, 0)
+                    conn.commit()
+                timings["rows_merged"] += event["rows"]
+                timings["merge_seconds"] += event["seconds"]
+        except BaseException:
+            # the failed transaction has to be rolled back before the stage can be dropped; if the
+            # connection itself is gone, the cleanup failing must not hide the original error
+            with contextlib.suppress(Exception):
+                conn.rollback()
+                cursor.execute(f"DROP TABLE IF EXISTS {stage_tbl}")
+                conn.commit()
+            raise
+        cursor.execute(f"DROP TABLE IF EXISTS {stage_tbl}")
+        conn.commit()
+
+        print(f"Stage: {timings['stage_seconds']:.2f}s, Copy: {timings['copy_seconds']:.2f}s, Merge: {timings['merge_seconds']:.2f}s")
+        print(f"Runtime: {(time.monotonic() - rptg_tstart) / 60}")
+        return timings
 
     @classmethod
+    @_pg_pooled
     def insert_df_pg(
         cls,
         df: Any,
@@ -470,65 +2671,646 @@ class PostgresETL:
         cursor: Any,
         insert_type: str = "fast",
         schema_name: Optional[str] = None,
+        copy_format: str = "text",
+        chunk_size: int = 100000,
+        primary_key: Optional[list[str]] = None,
+        indexes: Optional[list[list[str]]] = None,
+        index_workers: int = 1,
+        pool: Optional[PostgresPool] = None,
+        maintenance_work_mem: Optional[str] = None,
+        compact: bool = False,
     ) -> None:
         """
         Inserts a DataFrame into a Postgres table.
 
+        For bulk builds into a bare table, pass ``primary_key`` / ``indexes`` to have them built
+        after the load (see build_indexes_pg) instead of maintaining them row by row.
+
+        With ``compact`` the frame is compacted first (see Generic.compact_df), which shrinks the
+        per-chunk copies the loaders make; df itself is not modified.
+
         :param df: Pandas DataFrame.
         :param tbl_name: Postgres table name.
         :param conn: Postgres database connection object.
         :param cursor: Postgres database cursor object.
-        :param insert_type: Insert method ('fast' uses execute_batch).
+        :param insert_type: Insert method ('fast' uses execute_batch, 'copy' streams through COPY FROM STDIN).
         :param schema_name: Schema name.
+        :param copy_format: COPY format when insert_type is 'copy' ('text' or 'binary').
+        :param chunk_size: Rows encoded per buffer when insert_type is 'copy'.
+        :param primary_key: Primary key columns, added after the load.
+        :param indexes: Column lists, one index each, built after the load.
+        :param index_workers: Number of indexes built at once (requires a pool when > 1).
+        :param pool: PostgresPool for parallel index builds (defaults to conn when conn is a pool).
+        :param maintenance_work_mem: Memory for each index build, e.g. '1GB'.
+        :param compact: Compact a shallow copy of df before loading it.
         """
+        cls._check_index_workers(index_workers, pool, primary_key, indexes)
+        if compact:
+            df = Generic.compact_df(df)
+
+        if insert_type == "copy":
+            cls.copy_df_pg(
+                df=df,
+                tbl_name=tbl_name,
+                conn=conn,
+                cursor=cursor,
+                schema_name=schema_name,
+                copy_format=copy_format,
+                chunk_size=chunk_size,
+            )
+        else:
+            full_tbl = f"{schema_name}.{tbl_name}" if schema_name else tbl_name
+            tstart = time.monotonic()
+            cls._batch_insert_df(df, full_tbl, cursor)
+            conn.commit()
+            print(f"Runtime: {(time.monotonic() - tstart) / 60}")
+
+        if primary_key or indexes:
+            cls.build_indexes_pg(
+                tbl_name=tbl_name,
+                conn=conn,
+                primary_key=primary_key,
+                indexes=indexes,
+                schema_name=schema_name,
+                parallel_workers=index_workers,
+                pool=pool,
+                maintenance_work_mem=maintenance_work_mem,
+            )
+
+    @classmethod
+    def _batch_insert_df(cls, df: Any, full_tbl: str, cursor: Any) -> None:
+        """Inserts a DataFrame into full_tbl with execute_batch without committing."""
         import numpy as np
         import psycopg2.extras
 
-        full_tbl = f"{schema_name}.{tbl_name}" if schema_name else tbl_name
         df_load = df.replace({np.nan: None})
         df_load = df_load.round(3)
         df_columns = list(df_load)
         columns = ",".join(df_columns)
         values = "VALUES({})".format(",".join(["%s" for _ in df_columns]))
         insert_stmt = "INSERT INTO {} ({}) {}".format(full_tbl, columns, values)
-        rptg_tstart = datetime.now()
-        psycopg2.extras.execute_batch(cursor, insert_stmt, df_load.values)
+        with _timed("execute_batch", table=full_tbl, rows=len(df_load)):
+            psycopg2.extras.execute_batch(cursor, insert_stmt, df_load.values)
+
+    @classmethod
+    def parallel_insert_df_pg(
+        cls,
+        df: Any,
+        tbl_name: str,
+        pool: PostgresPool,
+        parallel_workers: int = 4,
+        schema_name: Optional[str] = None,
+        insert_type: str = "copy",
+        copy_format: str = "text",
+        chunk_size: int = 100000,
+        atomic: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Inserts a DataFrame, or an iterable of DataFrames, over several pooled connections at once.
+
+        A DataFrame is split into ``parallel_workers`` contiguous shards; an iterable is loaded one
+        frame per shard with at most twice ``parallel_workers`` frames held in memory. Shards run on
+        threads (pooled connections cannot be shared across processes); psycopg2 releases the GIL
+        while the server works, so each shard gets its own backend.
+
+        With ``atomic=True`` each shard is loaded into its own UNLOGGED staging table and, once every
+        shard has succeeded, moved into the target with INSERT ... SELECT in a single transaction, so
+        readers see all rows or none. Otherwise each shard commits on its own and a failure leaves
+        the other shards loaded. Staging tables are always dropped.
+
+        :param df: Pandas DataFrame, or an iterable of DataFrames with the same columns.
+        :param tbl_name: Postgres table name.
+        :param pool: PostgresPool to check connections out of.
+        :param parallel_workers: Number of concurrent shards (and connections).
+        :param schema_name: Schema name.
+        :param insert_type: Per-shard insert method ('copy' or 'fast').
+        :param copy_format: COPY format when insert_type is 'copy' ('text' or 'binary').
+        :param chunk_size: Rows encoded per buffer when insert_type is 'copy'.
+        :param atomic: Stage shards and publish them in one transaction.
+        :return: Dict with rows, shards, seconds, rows_per_sec and swap_seconds.
+        """
+        from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        import pandas as pd
+
+        if insert_type not in ("copy", "fast"):
+            raise ValueError(f"insert_type must be 'copy' or 'fast', got '{insert_type}'")
+        if parallel_workers < 1:
+            raise ValueError(f"parallel_workers must be >= 1, got {parallel_workers}")
+        pool._check_workers(parallel_workers)
+
+        full_tbl = f"{schema_name}.{tbl_name}" if schema_name else tbl_name
+        if isinstance(df, pd.DataFrame):
+            step = max(-(-len(df) // parallel_workers), 1)
+            frames = (df.iloc[i : i + step] for i in range(0, len(df), step))
+        else:
+            frames = iter(df)
+
+        stages: list[str] = []
+        results: list[dict[str, Any]] = []
+        errors: list[str] = []
+
+        def load(shard: Any) -> dict[str, Any]:
+            tstart = time.monotonic()
+            with pool.connection() as (cur, wconn):
+                tgt = full_tbl
+                if atomic:
+                    tgt = f"fusetools_shard_{uuid.uuid4().hex[:12]}"
+                    cur.execute(f"CREATE UNLOGGED TABLE {tgt} (LIKE {full_tbl} INCLUDING DEFAULTS)")
+                    wconn.commit()
+                    stages.append(tgt)
+                if insert_type == "copy":
+                    cls._copy_df(shard, tgt, cur, copy_format, chunk_size)
+                else:
+                    cls._batch_insert_df(shard, tgt, cur)
+                wconn.commit()
+            return {"rows": len(shard), "seconds": time.monotonic() - tstart}
+
+        def drain(pending: dict[Any, int], return_when: str) -> None:
+            done, _ = wait(pending, return_when=return_when)
+            for future in done:
+                idx = pending.pop(future)
+                try:
+                    res = future.result()
+                except Exception as e:
+                    errors.append(f"shard {idx}: {e}")
+                    print(f"Shard {idx}: failed ({e})")
+                    continue
+                results.append(res)
+                print(f"Shard {idx}: {res['rows']} rows ({res['seconds']:.1f}s)")
+
+        rptg_tstart = time.monotonic()
+        swap_seconds = 0.0
+        try:
+            with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
+                pending: dict[Any, int] = {}
+                for idx, shard in enumerate(frames):
+                    if len(pending) >= 2 * parallel_workers:
+                        drain(pending, FIRST_COMPLETED)
+                    pending[executor.submit(load, shard)] = idx
+                if pending:
+                    drain(pending, ALL_COMPLETED)
+
+            if errors:
+                committed = "" if atomic else " (other shards were committed)"
+                raise RuntimeError(f"{len(errors)} shard(s) failed{committed}: " + "; ".join(errors))
+
+            if atomic and stages:
+                tstart = time.monotonic()
+                with pool.connection() as (cur, wconn):
+                    for stage in stages:
+                        cur.execute(f"INSERT INTO {full_tbl} SELECT * FROM {stage}")
+                    wconn.commit()
+                swap_seconds = time.monotonic() - tstart
+        finally:
+            if stages:
+                with pool.connection() as (cur, wconn):
+                    for stage in stages:
+                        cur.execute(f"DROP TABLE IF EXISTS {stage}")
+                    wconn.commit()
+
+        n_rows = sum(r["rows"] for r in results)
+        elapsed = time.monotonic() - rptg_tstart
+        print(f"Runtime: {elapsed / 60}")
+        print(f"Rows/sec: {n_rows / elapsed if elapsed > 0 else float(n_rows)}")
+        return {
+            "rows": n_rows,
+            "shards": len(results),
+            "seconds": elapsed,
+            "rows_per_sec": n_rows / elapsed if elapsed > 0 else float(n_rows),
+            "swap_seconds": swap_seconds,
+        }
+
+    @classmethod
+    def copy_table_pg(
+        cls,
+        src_conn: Any,
+        tgt_conn: Any,
+        source: str,
+        tgt_tbl: str,
+        columns: Optional[list[str]] = None,
+        copy_format: str = "text",
+        buffer_bytes: int = 64 << 20,
+        threaded: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Streams a table or query result from one Postgres database into a table in another.
+
+        ``COPY (...) TO STDOUT`` on the source is piped into ``COPY ... FROM STDIN`` on the target without
+        building a DataFrame. With ``threaded`` the source side runs in a background thread and hands
+        data over through a queue holding at most ``buffer_bytes``; otherwise the export is spooled to a
+        temporary file (in memory up to ``buffer_bytes``, then on disk) and loaded afterwards. The binary
+        format needs identical column types on both sides. Either connection may be a PostgresPool.
+
+        :param src_conn: Source Postgres connection object (or PostgresPool).
+        :param tgt_conn: Target Postgres connection object (or PostgresPool).
+        :param source: Source table name, or a SELECT/WITH query.
+        :param tgt_tbl: Target table name.
+        :param columns: Columns to copy, in the same order on both sides (all columns if None).
+        :param copy_format: COPY format ('text' or 'binary').
+        :param buffer_bytes: Most data held in memory between the two sides.
+        :param threaded: Pipe through a background thread instead of a spool file.
+        :return: Dict with rows, bytes, seconds, rows_per_sec and bytes_per_sec.
+        """
+        import tempfile
+
+        if copy_format not in ("text", "binary"):
+            raise ValueError(f"copy_format must be 'text' or 'binary', got '{copy_format}'")
+
+        cols = f" ({', '.join(columns)})" if columns else ""
+        if re.match(r"\s*(select|with)\b", source, re.IGNORECASE):
+            copy_out = f"COPY ({source}) TO STDOUT WITH (FORMAT {copy_format})"
+        else:
+            copy_out = f"COPY {source}{cols} TO STDOUT WITH (FORMAT {copy_format})"
+        copy_in = f"COPY {tgt_tbl}{cols} FROM STDIN WITH (FORMAT {copy_format})"
+
+        with contextlib.ExitStack() as stack, _timed("copy_table", table=tgt_tbl) as event:
+            if isinstance(src_conn, PostgresPool):
+                _, src_conn = stack.enter_context(src_conn.connection())
+            if isinstance(tgt_conn, PostgresPool):
+                _, tgt_conn = stack.enter_context(tgt_conn.connection())
+            src_cur, tgt_cur = src_conn.cursor(), tgt_conn.cursor()
+            rptg_tstart = time.monotonic()
+            progress = {"bytes": 0, "next": _COPY_PROGRESS_BYTES}
+
+            def report(n_bytes: int) -> None:
+                progress["bytes"] += n_bytes
+                if progress["bytes"] >= progress["next"]:
+                    progress["next"] += _COPY_PROGRESS_BYTES
+                    elapsed = time.monotonic() - rptg_tstart
+                    print(f"Copied {progress['bytes'] / 1e6:.0f} MB ({progress['bytes'] / 1e6 / elapsed:.1f} MB/s)")
+
+            try:
+                if threaded:
+                    pipe: queue.Queue[Any] = queue.Queue(maxsize=max(buffer_bytes // _COPY_PIPE_CHUNK, 1))
+                    stop = threading.Event()
+                    writer = _CopyPipeWriter(pipe, stop)
+
+                    def produce() -> None:
+                        try:
+                            src_cur.copy_expert(copy_out, writer)
+                            writer.close()
+                        except BaseException as e:
+                            with contextlib.suppress(RuntimeError):
+                                writer.put(e)
+
+                    def consume() -> Iterator[bytes]:
+                        while True:
+                            item = pipe.get()
+                            if item is None:
+                                return
+                            if isinstance(item, BaseException):
+                                raise item
+                            report(len(item))
+                            yield item
+
+                    producer = threading.Thread(target=produce, name="fusetools-copy-table", daemon=True)
+                    producer.start()
+                    try:
+                        tgt_cur.copy_expert(copy_in, _ChunkReader(consume(), empty=b""), size=_COPY_PIPE_CHUNK)
+                    finally:
+                        stop.set()
+                        producer.join()
+                else:
+                    spool = stack.enter_context(tempfile.SpooledTemporaryFile(max_size=buffer_bytes))
+                    src_cur.copy_expert(copy_out, spool)
+                    report(spool.tell())
+                    spool.seek(0)
+                    tgt_cur.copy_expert(copy_in, spool, size=_COPY_PIPE_CHUNK)
+                tgt_conn.commit()
+            except BaseException:
+                tgt_conn.rollback()
+                raise
+            event["rows"] = max(getattr(tgt_cur, "rowcount", -1), 0)
+            event["bytes"] = progress["bytes"]
+
+        elapsed = event["seconds"]
+        print(f"Runtime: {elapsed / 60}")
+        print(f"Rows/sec: {event['rows'] / elapsed if elapsed > 0 else float(event['rows'])}")
+        return {
+            "rows": event["rows"],
+            "bytes": event["bytes"],
+            "seconds": elapsed,
+            "rows_per_sec": event["rows"] / elapsed if elapsed > 0 else float(event["rows"]),
+            "bytes_per_sec": event["bytes"] / elapsed if elapsed > 0 else float(event["bytes"]),
+        }
+
+    @classmethod
+    @_pg_pooled
+    def copy_df_pg(
+        cls,
+        df: Any,
+        tbl_name: str,
+        conn: Any,
+        cursor: Any,
+        schema_name: Optional[str] = None,
+        copy_format: str = "text",
+        chunk_size: int = 100000,
+    ) -> int:
+        """
+        Bulk loads a DataFrame into a Postgres table with COPY ... FROM STDIN.
+
+        Rows are encoded ``chunk_size`` at a time and streamed to the server, so only one
+        encoded chunk is held in memory. NaN/None/NaT become NULL; values are not rounded.
+        The binary format reads the target column types from the table and supports
+        boolean, integer, float, date, timestamp and text-like columns.
+
+        :param df: Pandas DataFrame.
+        :param tbl_name: Postgres table name.
+        :param conn: Postgres database connection object.
+        :param cursor: Postgres database cursor object.
+        :param schema_name: Schema name.
+        :param copy_format: COPY format ('text' or 'binary').
+        :param chunk_size: Number of rows encoded per buffer.
+        :return: Number of rows loaded.
+        """
+        if copy_format not in ("text", "binary"):
+            raise ValueError(f"copy_format must be 'text' or 'binary', got '{copy_format}'")
+
+        full_tbl = f"{schema_name}.{tbl_name}" if schema_name else tbl_name
+        n_rows = len(df)
+
+        rptg_tstart = time.monotonic()
+        cls._copy_df(df, full_tbl, cursor, copy_format, chunk_size)
         conn.commit()
-        rptg_tend = datetime.now()
-        tdelta = rptg_tend - rptg_tstart
-        tdelta = tdelta.total_seconds() / 60
-        print(f"Runtime: {tdelta}")
+        elapsed = time.monotonic() - rptg_tstart
+        print(f"Runtime: {elapsed / 60}")
+        print(f"Rows/sec: {n_rows / elapsed if elapsed > 0 else float(n_rows)}")
+        return n_rows
+
+    @classmethod
+    def _copy_df(cls, df: Any, full_tbl: str, cursor: Any, copy_format: str = "text", chunk_size: int = 100000) -> None:
+        """Streams a DataFrame into full_tbl with COPY FROM STDIN without committing."""
+        columns = ",".join(list(df))
+        starts = range(0, len(df), chunk_size)
+
+        if copy_format == "binary":
+            cursor.execute(f"SELECT {columns} FROM {full_tbl} LIMIT 0")
+            oids = [d[1] for d in cursor.description]
+            chunks = itertools.chain(
+                [_PG_COPY_BINARY_HEADER],
+                (_copy_binary_chunk(df.iloc[i : i + chunk_size], oids) for i in starts),
+                [_PG_COPY_BINARY_TRAILER],
+            )
+            reader = _ChunkReader(chunks, empty=b"")
+        else:
+            reader = _ChunkReader((_copy_text_chunk(df.iloc[i : i + chunk_size]) for i in starts), empty="")
+
+        with _timed("copy", table=full_tbl, rows=len(df)) as event:
+            cursor.copy_expert(f"COPY {full_tbl} ({columns}) FROM STDIN WITH (FORMAT {copy_format})", reader, size=1 << 20)
+            event["bytes"] = reader.size_read
 
     @classmethod
-    def read_pg(cls, sql: str, conn: Any) -> Any:
+    def read_pg(
+        cls,
+        sql: str,
+        conn: Any,
+        cache: Optional[ResultCache] = None,
+        cache_tables: Optional[list[str]] = None,
+        columnar: bool = False,
+        compact: bool = False,
+    ) -> Any:
         """
         Reads a SQL query result into a Pandas DataFrame.
 
+        With ``cache`` the result is looked up in a ResultCache first; a hit is returned without
+        touching the database (no connection is checked out of a pool either). Columnar and
+        default reads are cached separately since their dtypes differ.
+
+        With ``columnar`` the result is fetched with ``COPY ... TO STDOUT (FORMAT binary)`` and
+        boolean, integer, float, date and timestamp columns are decoded straight into NumPy
+        buffers instead of per-row Python tuples: integers come back as Int64, booleans as
+        boolean, floats as float64, dates and timestamps as datetime64 (UTC for timestamptz).
+        NUMERIC is read as text and returned as exact Decimal objects, like the default path;
+        other columns are returned as text. Those are still decoded row by row, so the gain is
+        largest for results of fixed-width columns. The query must be a single SELECT.
+
         :param sql: SQL query string.
         :param conn: Postgres database connection object.
+        :param cache: Optional ResultCache to read from and store into.
+        :param cache_tables: Tables the result depends on for cache invalidation (parsed from the SQL if None).
+        :param columnar: Decode the result from binary COPY output into columnar buffers.
+        :param compact: Downcast numerics and categorize repetitive text (see Generic.compact_df).
         :return: Pandas DataFrame.
         """
+        variant = "columnar" if columnar else ""
+        df = cache.get(sql, conn, variant) if cache is not None else None
+        if df is None:
+            df = cls._read_pg_columnar(sql=sql, conn=conn) if columnar else cls._read_pg(sql=sql, conn=conn)
+            if cache is not None:
+                cache.put(sql, conn, df, tables=cache_tables, variant=variant)
+        return Generic.compact_df(df, inplace=True) if compact else df
+
+    @classmethod
+    @_pg_pooled
+    def _read_pg(cls, sql: str, conn: Any) -> Any:
+        """Runs a read_pg query on a connection."""
         import pandas as pd
 
-        df = pd.read_sql_query(sql=sql, con=conn)
+        with _timed("read_pg", sql_hash=_sql_hash(sql)) as event:
+            df = pd.read_sql_query(sql=sql, con=conn)
+            event["rows"] = len(df)
+        return df
+
+    @classmethod
+    @_pg_pooled
+    def _read_pg_columnar(cls, sql: str, conn: Any) -> Any:
+        """Runs a read_pg(columnar=True) query on a connection."""
+        import io
+
+        # only a transaction opened by this read is ended here; a caller's open transaction is left alone
+        owned = not _in_transaction(conn)
+        with _timed("read_pg", sql_hash=_sql_hash(sql)) as event:
+            cur = conn.cursor()
+            query = sql.strip().rstrip(";")
+            cur.execute(f"SELECT * FROM ({query}) AS q LIMIT 0")
+            description = cur.description
+
+            # positional aliases, so duplicate or odd column names cannot clash in the outer SELECT
+            aliases = ", ".join(f"c{i}" for i in range(len(description)))
+            fixed, var, select = [], [], []
+            for i, d in enumerate(description):
+                if d[1] in _PG_COLUMNAR_FILL:
+                    fixed.append((i, d[1]))
+                    select += [f"c{i} IS NULL", f"coalesce(c{i}, {_PG_COLUMNAR_FILL[d[1]]})"]
+            # NUMERIC goes through text too: float8 would round values beyond 15-17 significant digits
+            for i, d in enumerate(description):
+                if d[1] not in _PG_COLUMNAR_FILL:
+                    var.append(i)
+                    select.append(f"c{i}::text")
+
+            buf = io.BytesIO()
+            try:
+                cur.copy_expert(f"COPY (SELECT {', '.join(select)} FROM ({query}) AS q({aliases})) TO STDOUT WITH (FORMAT binary)", buf)
+            except Exception:
+                if owned:
+                    conn.rollback()
+                raise
+            if owned:
+                conn.commit()
+            df = _columnar_frame(buf.getvalue(), description, fixed, var)
+            event["rows"] = len(df)
+            event["bytes"] = buf.tell()
         return df
 
     @classmethod
-    def read_pg_batches(cls, sql: str, conn: Any, batch_size: int = 10000) -> Any:
+    @_pg_pooled
+    def read_pg_batches(
+        cls,
+        sql: str,
+        conn: Any,
+        batch_size: int = 10000,
+        stream: bool = False,
+        itersize: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        memory_limit: Optional[int] = None,
+        reuse_spill: bool = False,
+    ) -> Any:
         """
         Reads a SQL query result into a Pandas DataFrame in batches.
 
+        With ``spill_dir`` the batches are streamed from a server-side cursor straight into a
+        Parquet file (one row group per batch), so memory stays at one batch however large the
+        result, and a lazy SpilledResult handle is returned instead of a DataFrame. Column types
+        are fixed from the result's Postgres types. The file is named after the query and the
+        database it ran against, and only appears once the extract is complete; with
+        ``reuse_spill`` a completed file for the same query and database is returned without
+        querying again.
+
         :param sql: SQL query string.
         :param conn: Postgres database connection object.
         :param batch_size: Number of rows per batch.
-        :return: Pandas DataFrame.
+        :param stream: If True, return a generator of DataFrames from a server-side cursor (see iter_pg_batches).
+        :param itersize: Rows fetched from the server per round trip when streaming (defaults to batch_size).
+        :param spill_dir: Directory to spill the result to as Parquet (requires pyarrow).
+        :param memory_limit: Bytes the returned SpilledResult may load at once through to_pandas.
+        :param reuse_spill: Return an existing complete spill of the same query instead of re-running it.
+        :return: Pandas DataFrame, a generator of DataFrames if stream is True, or a SpilledResult if spill_dir is set.
         """
         import pandas as pd
 
+        if spill_dir:
+            return cls._spill_pg(sql, conn, spill_dir, batch_size, itersize, memory_limit, reuse_spill)
+
+        if stream:
+            return cls.iter_pg_batches(sql=sql, conn=conn, batch_size=batch_size, itersize=itersize)
+
         chunks = pd.read_sql_query(sql=sql, con=conn, chunksize=batch_size)
         df = pd.concat(chunks, ignore_index=True)
         return df
 
+    @classmethod
+    def _spill_pg(
+        cls,
+        sql: str,
+        conn: Any,
+        spill_dir: str,
+        batch_size: int,
+        itersize: Optional[int],
+        memory_limit: Optional[int],
+        reuse_spill: bool,
+    ) -> SpilledResult:
+        """Streams a query result into a Parquet file under spill_dir and returns a handle to it."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(spill_dir, exist_ok=True)
+        spill_key = _sql_hash(f"{_conn_identity(conn)}\n{sql}")
+        path = os.path.join(spill_dir, f"fusetools_{spill_key[:16]}.parquet")
+        if reuse_spill and os.path.exists(path):
+            print(f"Reusing spilled result: {path}")
+            return SpilledResult(path, memory_limit=memory_limit)
+
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        writer = None
+        rows = 0
+        with _timed("spill", sql_hash=_sql_hash(sql)) as event:
+            try:
+                for records, description in cls._iter_pg_rows(sql, conn, batch_size, itersize):
+                    batch = _records_to_df(records, description)
+                    if writer is None:
+                        schema = _pg_arrow_schema(description, batch)
+                        writer = pq.ParquetWriter(tmp_path, schema)
+                    for field in schema:
+                        # unconstrained NUMERIC arrives as Decimal objects but is stored as float64
+                        if pa.types.is_floating(field.type) and batch[field.name].dtype == object:
+                            batch[field.name] = batch[field.name].astype("float64")
+                    writer.write_table(pa.Table.from_pandas(batch, schema=schema, preserve_index=False))
+                    rows += len(batch)
+                if writer is None:
+                    # no batch means no column types either; leave an empty file so the handle still works
+                    pq.write_table(pa.table({}), tmp_path)
+                else:
+                    writer.close()
+                os.replace(tmp_path, path)
+            except BaseException:
+                if writer is not None:
+                    writer.close()
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(tmp_path)
+                raise
+            event["rows"] = rows
+            event["bytes"] = os.path.getsize(path)
+        print(f"Spilled {rows} rows to {path} ({event['bytes'] / 1e6:.1f} MB)")
+        return SpilledResult(path, memory_limit=memory_limit)
+
+    @classmethod
+    @_pg_pooled
+    def iter_pg_batches(
+        cls,
+        sql: str,
+        conn: Any,
+        batch_size: int = 10000,
+        itersize: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """
+        Streams a SQL query result as Pandas DataFrames using a named (server-side) cursor.
+
+        Only ``itersize`` rows are transferred per round trip and one batch is held in memory at a time.
+        Column dtypes come from the result's Postgres types, so they are identical across batches
+        (integers are nullable Int64). The cursor is closed when the generator is exhausted or closed early.
+
+        :param sql: SQL query string.
+        :param conn: Postgres database connection object.
+        :param batch_size: Number of rows per yielded DataFrame.
+        :param itersize: Rows fetched from the server per round trip (defaults to batch_size).
+        :return: Generator of Pandas DataFrames.
+        """
+        with contextlib.closing(cls._iter_pg_rows(sql, conn, batch_size, itersize)) as batches:
+            for rows, description in batches:
+                yield _records_to_df(rows, description)
+
+    @classmethod
+    def _iter_pg_rows(cls, sql: str, conn: Any, batch_size: int, itersize: Optional[int]) -> Generator[tuple[list[Any], Any], None, None]:
+        """
+        Yields (rows, cursor description) batches from a named cursor, closing it when done or closed early.
+
+        The transaction the named cursor opens is committed (rolled back on error) afterwards, unless
+        the caller already had one open on conn.
+        """
+        owned = not _in_transaction(conn)
+        cur = conn.cursor(name=f"fusetools_{uuid.uuid4().hex}")
+        cur.itersize = itersize or batch_size
+        failed = False
+        try:
+            cur.execute(sql)
+            while True:
+                with _timed("fetch_batch") as event:
+                    rows = list(itertools.islice(cur, batch_size))
+                    event["rows"] = len(rows)
+                if not rows:
+                    break
+                yield rows, cur.description
+        except Exception:
+            failed = True
+            raise
+        finally:
+            cur.close()
+            if owned and failed:
+                conn.rollback()
+            elif owned:
+                conn.commit()
+
     @classmethod
     def create_tbl_pg(
         cls,
@@ -558,8 +3340,10 @@ class PostgresETL:
             index=False,
             dtype=dtype,
         )
+        PgCatalog.invalidate_table(tbl_name, schema)
 
     @classmethod
+    @_pg_pooled
     def delete_from_pg(
         cls,
         tbl_name: str,
@@ -584,6 +3368,7 @@ class PostgresETL:
         cls.run_query_pg(conn=conn, sql=sql)
 
     @classmethod
+    @_pg_pooled
     def drop_tbl_pg(cls, tbl_name: str, conn: Any, cursor: Any) -> None:
         """
         Drops a Postgres table.
@@ -593,8 +3378,10 @@ class PostgresETL:
         :param cursor: Postgres database cursor object.
         """
         cls.run_query_pg(conn=conn, sql=f"DROP TABLE IF EXISTS {tbl_name}")
+        PgCatalog.invalidate_table(tbl_name)
 
     @classmethod
+    @_pg_pooled
     def refresh_materialized_view_pg(cls, view_name: str, conn: Any, cursor: Any) -> None:
         """
         Refreshes a materialized view in Postgres.
@@ -606,6 +3393,7 @@ class PostgresETL:
         cls.run_query_pg(conn=conn, sql=f"REFRESH MATERIALIZED VIEW {view_name}")
 
     @classmethod
+    @_pg_pooled
     def truncate_tbl_pg(cls, tbl_name: str, conn: Any, cursor: Any) -> None:
         """
         Truncates a Postgres table.
@@ -617,6 +3405,7 @@ class PostgresETL:
         cls.run_query_pg(conn=conn, sql=f"TRUNCATE TABLE {tbl_name}")
 
     @classmethod
+    @_pg_pooled
     def add_primary_key_pg(cls, tbl_name: str, key_cols: list[str], conn: Any, cursor: Any) -> None:
         """
         Adds a primary key to a Postgres table.
@@ -632,6 +3421,7 @@ class PostgresETL:
         cls.run_query_pg(conn=conn, sql=sql)
 
     @classmethod
+    @_pg_pooled
     def add_index_pg(
         cls,
         tbl_name: str,
@@ -656,86 +3446,142 @@ class PostgresETL:
         cls.run_query_pg(conn=conn, sql=sql)
 
     @classmethod
-    def make_df_tbl_pg(cls, tbl_name: str, df: Any) -> str:
+    @_pg_pooled
+    def build_indexes_pg(
+        cls,
+        tbl_name: str,
+        conn: Any,
+        primary_key: Optional[list[str]] = None,
+        indexes: Optional[list[list[str]]] = None,
+        schema_name: Optional[str] = None,
+        parallel_workers: int = 1,
+        pool: Optional[PostgresPool] = None,
+        maintenance_work_mem: Optional[str] = None,
+        analyze: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Builds a table's primary key and indexes after a bulk load, then runs ANALYZE.
+
+        The primary key is built as a unique index like the others and attached afterwards with
+        ADD CONSTRAINT ... PRIMARY KEY USING INDEX, so every build only needs a SHARE lock and
+        builds can overlap. With ``parallel_workers`` > 1 each index is built on its own connection
+        from ``pool``, which needs room for them next to any connection the caller already holds
+        from it (e.g. conn=<PostgresPool>). ``maintenance_work_mem`` (e.g. '1GB') is SET LOCAL for
+        each build.
+        Names follow add_primary_key_pg and add_index_pg.
+
+        :param tbl_name: Postgres table name.
+        :param conn: Postgres database connection object (or PostgresPool).
+        :param primary_key: Primary key columns.
+        :param indexes: Column lists, one per index.
+        :param schema_name: Schema name.
+        :param parallel_workers: Number of indexes built at once.
+        :param pool: PostgresPool for parallel builds (defaults to conn when conn is a pool).
+        :param maintenance_work_mem: Memory for each index build.
+        :param analyze: Run ANALYZE on the table afterwards.
+        :return: Dict with seconds per index, build_seconds and analyze_seconds.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if parallel_workers > 1 and pool is None:
+            raise ValueError("parallel_workers > 1 requires a PostgresPool (pass pool= or conn=<PostgresPool>)")
+
+        full_tbl = f"{schema_name}.{tbl_name}" if schema_name else tbl_name
+        pk_name = f"{tbl_name}_pkey"
+        builds = []
+        if primary_key:
+            builds.append((pk_name, f"CREATE UNIQUE INDEX {pk_name} ON {full_tbl} ({', '.join(primary_key)})"))
+        for key_cols in indexes or []:
+            idx_name = f"idx_{tbl_name}_{'_'.join(key_cols)}"
+            builds.append((idx_name, f"CREATE INDEX IF NOT EXISTS {idx_name} ON {full_tbl} ({', '.join(key_cols)})"))
+
+        def build(wconn: Any, name: str, sql: str) -> float:
+            with _timed("build_index", table=full_tbl, index=name) as event:
+                cur = wconn.cursor()
+                if maintenance_work_mem:
+                    cur.execute(f"SET LOCAL maintenance_work_mem = '{maintenance_work_mem}'")
+                cur.execute(sql)
+                wconn.commit()
+            return event["seconds"]
+
+        def build_pooled(name: str, sql: str) -> float:
+            with pool.connection() as (_, wconn):  # type: ignore[union-attr]
+                return build(wconn, name, sql)
+
+        timings: dict[str, Any] = {"index_seconds": {}, "build_seconds": 0.0, "analyze_seconds": 0.0}
+        tstart = time.monotonic()
+        if parallel_workers > 1 and len(builds) > 1:
+            pool._check_workers(min(parallel_workers, len(builds)))  # type: ignore[union-attr]
+            with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
+                futures = {name: executor.submit(build_pooled, name, sql) for name, sql in builds}
+                timings["index_seconds"] = {name: future.result() for name, future in futures.items()}
+        else:
+            timings["index_seconds"] = {name: build(conn, name, sql) for name, sql in builds}
+        if primary_key:
+            cur = conn.cursor()
+            cur.execute(f"ALTER TABLE {full_tbl} ADD CONSTRAINT {pk_name} PRIMARY KEY USING INDEX {pk_name}")
+            conn.commit()
+        timings["build_seconds"] = time.monotonic() - tstart
+
+        if analyze:
+            with _timed("analyze", table=full_tbl) as event:
+                cur = conn.cursor()
+                cur.execute(f"ANALYZE {full_tbl}")
+                conn.commit()
+            timings["analyze_seconds"] = event["seconds"]
+
+        print(f"Indexes: {timings['build_seconds']:.2f}s, Analyze: {timings['analyze_seconds']:.2f}s")
+        return timings
+
+    @classmethod
+    def _check_index_workers(
+        cls, index_workers: int, pool: Optional[PostgresPool], primary_key: Optional[list[str]], indexes: Optional[list[list[str]]]
+    ) -> None:
+        """Fails before a load when its deferred parallel index builds could not get their pooled connections."""
+        builds = len(indexes or []) + bool(primary_key)
+        if index_workers <= 1 or builds <= 1:
+            return
+        if pool is None:
+            raise ValueError("index_workers > 1 requires a PostgresPool (pass pool= or conn=<PostgresPool>)")
+        pool._check_workers(min(index_workers, builds))
+
+    @classmethod
+    def make_df_tbl_pg(
+        cls,
+        tbl_name: str,
+        df: Any,
+        sample_size: Optional[int] = None,
+        profile: Any = None,
+        varchar_max: int = 65535,
+    ) -> str:
         """
         Creates SQL to run a CREATE TABLE statement based on a Pandas DataFrame.
 
+        Column types come from Generic.profile_df: integers get the smallest of SMALLINT/INTEGER/BIGINT
+        (NUMERIC beyond that) that fits their range, strings get VARCHAR(max length) or TEXT when longer
+        than ``varchar_max``, all-null or only sampled, and booleans/dates/timestamps get native types.
+
         :param tbl_name: Postgres table name.
-        :param df: Pandas DataFrame.
+        :param df: Pandas DataFrame (column names are cleaned in place with Generic.make_db_cols).
+        :param sample_size: Rows sampled for kind and length inference.
+        :param profile: Precomputed profile from Generic.profile_df; df is not profiled when given.
+        :param varchar_max: Longest string length emitted as VARCHAR(n) rather than TEXT.
         :return: CREATE TABLE SQL statement.
         """
-        import numpy as np
         import pandas as pd
 
         # fix columns
-        df = Generic.make_db_cols(df)
-
-        # loop thru the columns
-        for idx, col in enumerate(df):
-            col_desc = col + "-" + str(df[col].map(lambda x: len(str(x))).max())
-            try:
-                col_max = col + "-" + str(max(df[col]))
-            except:
-                col_max = col + "-" + "NA"
-
-            if idx == 0:
-                col_desc_all = [col_desc]
-                col_max_all = [col_max]
-            else:
-                col_desc_all.append(col_desc)
-                col_max_all.append(col_max)
-
-        col_desc_all = pd.DataFrame(col_desc_all)
-        col_desc_all.columns = ["char"]
-        col_desc_all["column"], col_desc_all["length"] = col_desc_all["char"].str.split("-", 1).str
-
-        col_max_all = pd.DataFrame(col_max_all)
-        col_max_all.columns = ["char"]
-        col_max_all["column"], col_max_all["max"] = col_max_all["char"].str.split("-", 1).str
-
-        col_desc_types = pd.DataFrame(df.dtypes).reset_index()
-        col_desc_types.columns = ["column", "type"]
-
-        col_desc_all = pd.merge(col_desc_all, col_desc_types, how="inner", on="column")
-        col_desc_all = pd.merge(col_desc_all, col_max_all[["column", "max"]], how="inner", on="column")
-
-        d = {
-            "object": "VARCHAR",
-            "int64": "INTEGER",
-            "Int64": "INTEGER",
-            "int32": "INTEGER",
-            "bool": "VARCHAR",
-            "float64": "FLOAT",
-            "datetime64[ns]": "TIMESTAMP",
-            "datetime64[ns, UTC]": "TIMESTAMP",
-        }
-
-        col_desc_all = col_desc_all.astype(str).replace(d)
+        if df is not None:
+            df = Generic.make_db_cols(df)
+        if profile is None:
+            profile = Generic.profile_df(df, sample_size=sample_size)
 
-        col_desc_all["concat"] = np.where(
-            col_desc_all["type"] == "VARCHAR",
-            col_desc_all["column"] + " " + col_desc_all["type"].astype(str) + "(" + col_desc_all["length"] + ")",
-            col_desc_all["column"] + " " + col_desc_all["type"].astype(str),
-        )
-
-        for idx, row in col_desc_all.iterrows():
-            if str(row["type"]) == "INTEGER" and row["max"] != "nan" and int(row["max"]) > 2147483647:
-                val = row["concat"]
-                col_desc_all.loc[idx, "concat"] = val.replace(" INTEGER", f" VARCHAR({row['length']})")
-
-        col_desc_all = col_desc_all.apply(", ".join).reset_index()
-        col_desc_all.columns = ["index", "statement"]
-        statement = col_desc_all[col_desc_all["index"] == "concat"]
-        sql = statement["statement"].values
-        sql = str(sql)
-        sql = sql.replace("[", "")
-        sql = sql.replace("]", "")
-        sql = "CREATE TABLE " + tbl_name + " ( " + sql + " )"
-        sql = sql.replace("'", "")
-
-        return sql
+        columns = Generic.make_db_cols(pd.DataFrame(columns=list(profile["column"]))).columns
+        col_defs = [f"{col} {_pg_type_from_profile(row, varchar_max)}" for col, (_, row) in zip(columns, profile.iterrows())]
+        return "CREATE TABLE " + tbl_name + " ( " + ", ".join(col_defs) + " )"
 
     @classmethod
+    @_pg_pooled
     def insert_pg(
         cls,
         cursor: Any,
@@ -743,6 +3589,8 @@ class PostgresETL:
         df: Any,
         tbl_name: str,
         return_statement: Optional[str] = None,
+        insert_type: str = "fast",
+        copy_format: str = "text",
     ) -> Any:
         """
         Executes an INSERT INTO statement for a given Pandas DataFrame into a Postgres table.
@@ -752,8 +3600,16 @@ class PostgresETL:
         :param df: Pandas DataFrame to insert into a Postgres table.
         :param tbl_name: Postgres table name.
         :param return_statement: Optional RETURNING clause.
+        :param insert_type: Insert method ('fast' uses execute_batch, 'copy' streams through COPY FROM STDIN).
+        :param copy_format: COPY format when insert_type is 'copy' ('text' or 'binary').
         :return: Elapsed time to execute query, or returned result if return_statement is given.
         """
+        if insert_type == "copy":
+            if return_statement:
+                raise ValueError("return_statement is not supported with insert_type='copy'")
+            cls.copy_df_pg(df=df, tbl_name=tbl_name, conn=conn, cursor=cursor, copy_format=copy_format)
+            return
+
         import numpy as np
         import psycopg2.extras
 
@@ -765,32 +3621,87 @@ class PostgresETL:
         insert_stmt = "INSERT INTO {} ({}) {}".format(tbl_name, columns, values)
         if return_statement:
             insert_stmt = insert_stmt + return_statement
-        rptg_tstart = datetime.now()
-        psycopg2.extras.execute_batch(cursor, insert_stmt, df_load.values)
-
-        conn.commit()
-        rptg_tend = datetime.now()
-        tdelta = rptg_tend - rptg_tstart
-        tdelta = tdelta.total_seconds() / 60
+        with _timed("execute_batch", table=tbl_name, rows=len(df_load)) as event:
+            psycopg2.extras.execute_batch(cursor, insert_stmt, df_load.values)
+            conn.commit()
 
         if return_statement:
             res = cursor.fetchone()
             return res
 
-        print(f"Runtime: {tdelta}")
+        print(f"Runtime: {event['seconds'] / 60}")
 
     @classmethod
-    def make_tbl_complete_pg(cls, df: Any, tbl_name: str, conn: Any, cursor: Any, batch_size: Any = False) -> None:
+    @_pg_pooled
+    def make_tbl_complete_pg(
+        cls,
+        df: Any,
+        tbl_name: str,
+        conn: Any,
+        cursor: Any,
+        batch_size: Any = False,
+        infer_chunks: int = 1,
+        sample_size: Optional[int] = None,
+        insert_type: str = "fast",
+        copy_format: str = "text",
+        varchar_max: int = 65535,
+        primary_key: Optional[list[str]] = None,
+        indexes: Optional[list[list[str]]] = None,
+        index_workers: int = 1,
+        pool: Optional[PostgresPool] = None,
+        maintenance_work_mem: Optional[str] = None,
+    ) -> dict[str, Any]:
         """
         Executes a series of SQL statements to CREATE and INSERT into a table from a Pandas DataFrame.
 
-        :param df: Pandas DataFrame to create a table from.
+        The table is created without keys or indexes; ``primary_key`` and ``indexes`` are built after
+        the load with build_indexes_pg, followed by ANALYZE.
+
+        ``df`` may also be an iterator of DataFrames (e.g. from read_pg_batches or pd.read_csv with
+        chunksize). The DDL is then inferred from the first ``infer_chunks`` chunks and each chunk is
+        inserted and committed as it arrives, so at most ``infer_chunks`` chunks are held in memory.
+        When a later chunk does not fit the inferred types, the affected columns are widened with
+        ALTER COLUMN ... TYPE before it is inserted (this rewrites the table, so inferring from more
+        chunks up front is cheaper when early chunks are unrepresentative).
+
+        :param df: Pandas DataFrame, or an iterator of DataFrames with the same columns.
         :param tbl_name: Name of table to be created.
         :param conn: Postgres database connection object.
         :param cursor: Postgres database cursor object.
-        :param batch_size: Records to load per batch.
-        :return: Elapsed time to execute query.
+        :param batch_size: Records to load per batch when df is a DataFrame (all at once if False).
+        :param infer_chunks: Number of leading chunks profiled before the table is created.
+        :param sample_size: Rows sampled per chunk for kind and length inference.
+        :param insert_type: Insert method ('fast' uses execute_batch, 'copy' streams through COPY FROM STDIN).
+        :param copy_format: COPY format when insert_type is 'copy' ('text' or 'binary').
+        :param varchar_max: Longest string length emitted as VARCHAR(n) rather than TEXT.
+        :param primary_key: Primary key columns, added after the load.
+        :param indexes: Column lists, one index each, built after the load.
+        :param index_workers: Number of indexes built at once (requires a pool when > 1).
+        :param pool: PostgresPool for parallel index builds (defaults to conn when conn is a pool).
+        :param maintenance_work_mem: Memory for each index build, e.g. '1GB'.
+        :return: Dict with rows and seconds spent in the create, load, index and analyze phases.
         """
+        import pandas as pd
+
+        cls._check_index_workers(index_workers, pool, primary_key, indexes)
+        if isinstance(df, pd.DataFrame):
+            # the whole frame is already in memory, so profile it once and only batch the inserts
+            df = Generic.make_db_cols(df)
+            prof = _profile_chunk(df, sample_size=sample_size)
+            step = batch_size or max(len(df), 1)
+            chunks = (df.iloc[i : i + step] for i in range(0, len(df), step))
+            head: list[Any] = []
+            widen = False
+        else:
+            chunks = iter(df)
+            head = [Generic.make_db_cols(chunk) for chunk in itertools.islice(chunks, infer_chunks)]
+            if not head:
+                raise ValueError(f"no chunks to create table {tbl_name} from")
+            prof = _profile_chunk(head[0], sample_size=sample_size)
+            for chunk in head[1:]:
+                prof = _merge_profiles(prof, _profile_chunk(chunk, sample_size=sample_size))
+            widen = True
+
         # 1 drop the table
         print(f"dropping table: {tbl_name}")
         try:
@@ -800,19 +3711,408 @@ class PostgresETL:
             pass
         # create the table
         print(f"creating table: {tbl_name}")
-        sql = cls.make_df_tbl_pg(df=df, tbl_name=tbl_name)
+        tstart = time.monotonic()
+        profile = _profile_frame(prof)
+        sql = cls.make_df_tbl_pg(tbl_name=tbl_name, df=None, profile=profile, varchar_max=varchar_max)
         print(sql)
         cls.run_query_pg(sql=sql, conn=conn)
+        PgCatalog.invalidate_table(tbl_name)
+        timings = {"rows": 0, "create_seconds": time.monotonic() - tstart, "load_seconds": 0.0, "index_seconds": 0.0, "analyze_seconds": 0.0}
+        col_types = {row["column"]: _pg_type_from_profile(row, varchar_max) for _, row in profile.iterrows()}
+
+        def stream() -> Iterator[tuple[Any, bool]]:
+            # hand over the inference chunks one at a time so each can be freed once loaded
+            while head:
+                yield head.pop(0), False
+            for chunk in chunks:
+                yield chunk, widen
 
         print(f"inserting DF values into table: {tbl_name}")
-        rptg_tstart = datetime.now()
-        cls.insert_pg(df=df, tbl_name=tbl_name, cursor=cursor, conn=conn, batch_size=batch_size)
-        rptg_tend = datetime.now()
-        tdelta = rptg_tend - rptg_tstart
-        tdelta = tdelta.total_seconds() / 60
-        print(f"Runtime: {tdelta}")
+        rptg_tstart = time.monotonic()
+        n_rows = 0
+        for chunk, profile_chunk in stream():
+            if profile_chunk:
+                chunk = Generic.make_db_cols(chunk)
+                prof = _merge_profiles(prof, _profile_chunk(chunk, sample_size=sample_size))
+                for _, row in _profile_frame(prof).iterrows():
+                    pg_type = _pg_type_from_profile(row, varchar_max)
+                    if pg_type != col_types[row["column"]]:
+                        print(f"widening column {row['column']}: {col_types[row['column']]} -> {pg_type}")
+                        cursor.execute(f"ALTER TABLE {tbl_name} ALTER COLUMN {row['column']} TYPE {pg_type} USING {row['column']}::{pg_type}")
+                        col_types[row["column"]] = pg_type
+                        PgCatalog.invalidate_table(tbl_name)
+            if insert_type == "copy":
+                cls._copy_df(chunk, tbl_name, cursor, copy_format=copy_format)
+            else:
+                cls._batch_insert_df(chunk, tbl_name, cursor)
+            conn.commit()
+            n_rows += len(chunk)
+        timings["rows"] = n_rows
+        timings["load_seconds"] = time.monotonic() - rptg_tstart
+        print(f"Rows: {n_rows}")
+        print(f"Runtime: {timings['load_seconds'] / 60}")
+
+        if primary_key or indexes:
+            built = cls.build_indexes_pg(
+                tbl_name=tbl_name,
+                conn=conn,
+                primary_key=primary_key,
+                indexes=indexes,
+                parallel_workers=index_workers,
+                pool=pool,
+                maintenance_work_mem=maintenance_work_mem,
+            )
+            timings["index_seconds"] = built["build_seconds"]
+            timings["analyze_seconds"] = built["analyze_seconds"]
+        return timings
+
+    @classmethod
+    def _loop_windows(cls, dt_start: str, dt_end: str, freq: str, month_begin: bool = False) -> Any:
+        """Builds consecutive [start_date, end_date) windows up to today for the sequential loaders."""
+        import pandas as pd
+
+        rptg_dates = pd.date_range(dt_start, dt_end, freq=freq)
+        if month_begin:
+            rptg_dates = rptg_dates - pd.offsets.MonthBegin(1)
+        rptg_dates = [str(x)[:10] for x in rptg_dates.to_list()]
+        rptg_dates = pd.DataFrame({"start_date": rptg_dates, "end_date": rptg_dates})
+        rptg_dates["end_date"] = rptg_dates["end_date"].shift(-1)
+        return rptg_dates[pd.to_datetime(rptg_dates["start_date"]) <= datetime.now()].dropna()
+
+    @classmethod
+    def _resume_windows(cls, rptg_dates: Any, tgt_tbl: str, conn: Any) -> list[tuple[str, str]]:
+        """Drops windows already loaded into tgt_tbl (per its dt_range column) and bumps the first window's start."""
+        import pandas as pd
+
+        # getting max day id value
+        try:
+            sql = f"""select max(date(trim(substring(dt_range,regexp_instr(dt_range,'to ')+3,10)))) as day_idnt FROM {tgt_tbl}"""
+            saved_dates = pd.read_sql_query(sql=sql, con=conn)
+        except:
+            conn.commit()
+            saved_dates = pd.DataFrame({"day_idnt": ["1999-12-31"]})  # arbitrarily old date
+
+        saved_date_dt = (
+            datetime(
+                year=int(str(saved_dates["day_idnt"].astype(str).values[0]).split("-")[0]),
+                month=int(str(saved_dates["day_idnt"].astype(str).values[0]).split("-")[1]),
+                day=int(str(saved_dates["day_idnt"].astype(str).values[0]).split("-")[2]),
+            )
+            .replace(day=1)
+            .strftime("%Y-%m-%d")
+        )
+
+        rptg_dates = rptg_dates[pd.to_datetime(rptg_dates["start_date"]) >= pd.to_datetime(saved_date_dt)].reset_index(drop=True)
+
+        windows = []
+        for idx, row in rptg_dates.iterrows():
+            start = row["start_date"]
+            if idx == 0 and saved_dates["day_idnt"][0] != pd.to_datetime(row["start_date"]):
+                print(f"""latest saved data date in table is {str(saved_dates["day_idnt"][0])} ...""")
+                # bump up start range:
+                start = str(pd.to_datetime(str(saved_dates["day_idnt"][0])) + pd.DateOffset(1))[:10]
+                print(f"""revising start date to: {start} to {row["end_date"]}""")
+            windows.append((start, row["end_date"]))
+        return windows
+
+    @classmethod
+    def _loop_template(cls, sql_loop_fn: str, saved_day_id_range_placeholder: str, date_filters: list[tuple[Any, Any, Any]]) -> _LoopTemplate:
+        """Compiles a sequential_load_pg SQL template for [start, end) windows ($1 = start, $2 = end)."""
+        # date range column for logging
+        fragments = {saved_day_id_range_placeholder: (" '{start} to {end}' as dt_range,", " ($1::text || ' to ' || $2::text) as dt_range,")}
+
+        # date filters
+        for field, filter_type, placeholder in date_filters:
+            if not placeholder:
+                continue
+            if filter_type == "range":
+                fragments[placeholder] = (
+                    f" AND date({field}) >= '{{start}}' AND date({field}) < '{{end}}'",
+                    f" AND date({field}) >= $1::date AND date({field}) < $2::date",
+                )
+            elif filter_type == "<":
+                fragments[placeholder] = (f" AND date({field}) < '{{end}}'", f" AND date({field}) < $2::date")
+        return _LoopTemplate(sql_loop_fn, fragments, ["start", "end"])
+
+    @classmethod
+    def _run_loop_window(
+        cls,
+        conn: Any,
+        tgt_tbl: str,
+        start: str,
+        end: str,
+        sql: str,
+        create: bool,
+        log_dir: Any,
+        log_key: str,
+        manifest_tbl: Any = False,
+        raise_errors: bool = False,
+        template: Optional[_LoopTemplate] = None,
+        profiler: Optional[PlanProfiler] = None,
+    ) -> dict[str, Any]:
+        """Executes one sequential load window and returns its accounting record; INSERT windows run template when given."""
+        sql_prefix = f"CREATE TABLE {tgt_tbl} AS " if create else f"INSERT INTO {tgt_tbl} "
+        if log_dir:
+            _dump_sql(obj=sql_prefix + sql, filepath=log_dir + f"{tgt_tbl}_{log_key}.sql")
+
+        sql_hash = _sql_hash(sql)
+        tstart = time.monotonic()
+        status, error, row_count = "success", None, None
+        try:
+            if manifest_tbl or template is not None or profiler is not None:
+                cur = conn.cursor()
+
+                def execute(explain: str) -> None:
+                    if template is not None and not create:
+                        template.execute(cur, conn, sql_prefix, explain=explain, start=start, end=end)
+                    else:
+                        cur.execute(explain + sql_prefix + sql)
+
+                if profiler is not None:
+                    row_count = profiler.run(cur, sql_prefix + sql, execute, f"{tgt_tbl}_{log_key}", tgt_tbl, log_dir)
+                else:
+                    execute("")
+                    row_count = cur.rowcount
+                if manifest_tbl:
+                    # the window and its manifest row commit together, so a window is never half-recorded
+                    cls._record_manifest(cur, manifest_tbl, tgt_tbl, start, end, status, row_count, time.monotonic() - tstart, sql_hash)
+                conn.commit()
+            else:
+                cls.run_query_pg(conn=conn, sql=sql_prefix + sql)
+        except Exception as e:
+            conn.rollback()
+            if manifest_tbl:
+                try:
+                    cur = conn.cursor()
+                    cls._record_manifest(cur, manifest_tbl, tgt_tbl, start, end, "failed", None, time.monotonic() - tstart, sql_hash)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+            if raise_errors:
+                DbMetrics.emit("load_window", time.monotonic() - tstart, table=tgt_tbl, sql_hash=sql_hash, status="error", error=str(e))
+                raise
+            status, error = "failed", str(e)
+        seconds = time.monotonic() - tstart
+        DbMetrics.emit(
+            "load_window",
+            seconds,
+            table=tgt_tbl,
+            rows=row_count,
+            sql_hash=sql_hash,
+            status="ok" if status == "success" else "error",
+            error=error,
+        )
+        return {
+            "window_start": start,
+            "window_end": end,
+            "status": status,
+            "error": error,
+            "row_count": row_count,
+            "seconds": seconds,
+        }
+
+    @classmethod
+    def _run_loop_windows_parallel(
+        cls,
+        pool: PostgresPool,
+        windows: list[tuple[str, str, str]],
+        run_window: Callable[[Any, str, str, str], dict[str, Any]],
+        parallel_workers: int,
+    ) -> list[dict[str, Any]]:
+        """Runs (start, end, log_key) windows concurrently on pooled connections, reporting progress in window order."""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        def run(start: str, end: str, log_key: str) -> dict[str, Any]:
+            with pool.connection() as (_, wconn):
+                return run_window(wconn, start, end, log_key)
+
+        results: list[Any] = [None] * len(windows)
+        reported = 0
+        with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
+            futures = {executor.submit(run, *window): idx for idx, window in enumerate(windows)}
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    results[idx] = future.result()
+                except Exception as e:  # e.g. pool checkout timeout
+                    results[idx] = {
+                        "window_start": windows[idx][0],
+                        "window_end": windows[idx][1],
+                        "status": "failed",
+                        "error": str(e),
+                        "seconds": 0.0,
+                    }
+                while reported < len(results) and results[reported] is not None:
+                    res = results[reported]
+                    reported += 1
+                    print(f"[{reported}/{len(results)}] {res['window_start']} to {res['window_end']}: {res['status']} ({res['seconds']:.1f}s)")
+        return results
+
+    @classmethod
+    def _run_loop_adaptive(
+        cls,
+        conn: Any,
+        windows: list[tuple[str, str]],
+        run_window: Callable[..., dict[str, Any]],
+        create: bool,
+        min_window_days: int,
+        max_window_days: int,
+        target_seconds: float,
+    ) -> list[dict[str, Any]]:
+        """
+        Loads the pending spans in sub-windows whose size adapts to how the database copes.
+
+        Contiguous pending spans are merged first, so sub-windows can grow past one interval. The
+        first sub-window is as long as the first pending span; a failed sub-window is bisected and
+        retried until it is min_window_days long, a sub-window finishing in under half of
+        target_seconds doubles the size of the next one (up to max_window_days), and one taking
+        over twice target_seconds halves it.
+        """
+        from datetime import date, timedelta
+
+        spans: list[tuple[date, date]] = []
+        for span_start, span_end in windows:
+            start_dt, end_dt = date.fromisoformat(str(span_start)[:10]), date.fromisoformat(str(span_end)[:10])
+            if spans and spans[-1][1] == start_dt:
+                spans[-1] = (spans[-1][0], end_dt)
+            else:
+                spans.append((start_dt, end_dt))
+
+        results: list[dict[str, Any]] = []
+        size = None
+        attempt = 0
+        for cur_dt, span_end_dt in spans:
+            if size is None:
+                first_days = (date.fromisoformat(str(windows[0][1])[:10]) - cur_dt).days
+                size = min(max(first_days, min_window_days), max_window_days)
+            while cur_dt < span_end_dt:
+                end_dt = min(cur_dt + timedelta(days=size), span_end_dt)
+                days = (end_dt - cur_dt).days
+                print(f"""{cur_dt} to {end_dt} ({days} days)""")
+                res = run_window(conn, str(cur_dt), str(end_dt), str(attempt), create=create)
+                attempt += 1
+                if res["status"] == "failed" and days > min_window_days:
+                    print(f"window failed, splitting: {res['error']}")
+                    res["status"] = "split"
+                    results.append(res)
+                    size = max(min_window_days, days // 2)
+                    continue
+                results.append(res)
+                cur_dt = end_dt
+                if res["status"] == "failed":
+                    print(f"window failed at minimum size, skipping: {res['error']}")
+                    continue
+                create = False
+                if res["seconds"] < target_seconds / 2:
+                    size = min(size * 2, max_window_days)
+                elif res["seconds"] > target_seconds * 2:
+                    size = max(min_window_days, size // 2)
+        return results
+
+    # MARK: - Load Manifest
+
+    @classmethod
+    def _record_manifest(
+        cls,
+        cur: Any,
+        manifest_tbl: str,
+        tgt_tbl: str,
+        start: str,
+        end: str,
+        status: str,
+        row_count: Any,
+        duration_s: float,
+        sql_hash: str,
+    ) -> None:
+        """Upserts one window's manifest row on the caller's cursor; the caller commits."""
+        cur.execute(
+            f"""
+            INSERT INTO {manifest_tbl} (tgt_tbl, window_start, window_end, status, row_count, duration_s, sql_hash, updated_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, now())
+            ON CONFLICT (tgt_tbl, window_start, window_end) DO UPDATE SET
+            status = EXCLUDED.status, row_count = EXCLUDED.row_count, duration_s = EXCLUDED.duration_s,
+            sql_hash = EXCLUDED.sql_hash, updated_at = EXCLUDED.updated_at
+            """,
+            (tgt_tbl, start, end, status, row_count, duration_s, sql_hash),
+        )
+
+    @classmethod
+    @_pg_pooled
+    def create_load_manifest_pg(cls, manifest_tbl: str, conn: Any) -> None:
+        """
+        Creates the checkpoint manifest table used by sequential_load_pg if it does not exist.
+
+        :param manifest_tbl: Manifest table name.
+        :param conn: Postgres database connection object.
+        """
+        cls.run_query_pg(
+            conn=conn,
+            sql=f"""
+            CREATE TABLE IF NOT EXISTS {manifest_tbl} (
+                tgt_tbl TEXT NOT NULL,
+                window_start DATE NOT NULL,
+                window_end DATE NOT NULL,
+                status TEXT NOT NULL,
+                row_count BIGINT,
+                duration_s DOUBLE PRECISION,
+                sql_hash TEXT,
+                updated_at TIMESTAMP NOT NULL DEFAULT now(),
+                PRIMARY KEY (tgt_tbl, window_start, window_end)
+            )
+            """,
+        )
+
+    @classmethod
+    @_pg_pooled
+    def read_load_manifest_pg(cls, manifest_tbl: str, tgt_tbl: str, conn: Any) -> Any:
+        """
+        Reads the checkpoint manifest rows recorded for a target table.
+
+        :param manifest_tbl: Manifest table name.
+        :param tgt_tbl: Target table name.
+        :param conn: Postgres database connection object.
+        :return: Pandas DataFrame of windows (start, end, status, row count, duration, SQL hash).
+        """
+        import pandas as pd
+
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT window_start::text, window_end::text, status, row_count, duration_s, sql_hash, updated_at
+            FROM {manifest_tbl} WHERE tgt_tbl = %s ORDER BY window_start, window_end
+            """,
+            (tgt_tbl,),
+        )
+        rows = cur.fetchall()
+        conn.commit()
+        return pd.DataFrame(rows, columns=["window_start", "window_end", "status", "row_count", "duration_s", "sql_hash", "updated_at"])
+
+    @classmethod
+    def _manifest_windows(
+        cls,
+        windows: list[tuple[str, str]],
+        manifest: Any,
+        render: Callable[[str, str], str],
+    ) -> list[tuple[str, str]]:
+        """Returns the parts of windows not yet covered by successful manifest windows."""
+        done = manifest[manifest["status"] == "success"]
+        done_spans = sorted(zip(done["window_start"], done["window_end"]))
+        done_hash = dict(zip(zip(done["window_start"], done["window_end"]), done["sql_hash"]))
+
+        todo = []
+        for start, end in windows:
+            if (start, end) in done_hash and done_hash[(start, end)] != _sql_hash(render(start, end)):
+                print(f"warning: SQL for completed window {start} to {end} has changed since it was loaded; not reloading")
+            pieces = [(start, end)]
+            for d_start, d_end in done_spans:
+                if d_end <= start or d_start >= end:
+                    continue
+                pieces = [p for s, e in pieces for p in ((s, min(e, d_start)), (max(s, d_end), e)) if p[0] < p[1]]
+            todo += pieces
+        return todo
 
     @classmethod
+    @_pg_pooled
     def sequential_load_pg(
         cls,
         override: bool,
@@ -837,10 +4137,39 @@ class PostgresETL:
         loop_src2: Any = False,
         loop_src3: Any = False,
         log_dir: Any = False,
-    ) -> None:
+        parallel_workers: int = 1,
+        pool: Any = None,
+        manifest_tbl: Any = False,
+        adaptive: bool = False,
+        min_window_days: int = 1,
+        max_window_days: int = 92,
+        target_seconds: float = 300.0,
+        max_window_seconds: Any = False,
+        prepared: bool = True,
+        profiler: Optional[PlanProfiler] = None,
+    ) -> Any:
         """
         Sequentially loads data into a Postgres table using date-based SQL looping.
 
+        A string template is parsed once. With ``prepared`` its INSERT is prepared once per
+        connection with the window bounds as parameters and each window runs it with ``EXECUTE``,
+        so Postgres can reuse the plan; the SQL written to ``log_dir`` still has the dates inlined.
+
+        With ``parallel_workers`` > 1 the windows run concurrently on connections from ``pool``
+        (the first window still runs alone when it creates the table). A failed window does not
+        stop the others; it is retried once as ``dt2_interval`` sub-windows. When ``conn`` is that
+        pool, its own connection stays checked out, so ``max_size`` must exceed ``parallel_workers``.
+
+        With ``manifest_tbl`` each window's INSERT commits in the same transaction as its row in
+        the manifest (start, end, status, row count, duration, SQL hash). Resuming then skips exactly
+        the date ranges recorded as successful instead of scanning ``tgt_tbl``'s dt_range column,
+        and failed windows are simply run again.
+
+        With ``adaptive`` the fixed monthly/weekly fallback is replaced by a scheduler that bisects
+        failing windows down to ``min_window_days`` and grows or shrinks the window size toward
+        ``target_seconds`` per window. ``max_window_seconds`` sets a statement_timeout so a window
+        that runs too long is cancelled and split as well.
+
         :param override: Whether to drop and recreate the target table.
         :param tgt_tbl: Target table name.
         :param conn: Postgres database connection object.
@@ -863,22 +4192,47 @@ class PostgresETL:
         :param loop_src2: Second source parameter for callable sql_loop_fn.
         :param loop_src3: Third source parameter for callable sql_loop_fn.
         :param log_dir: Directory to log SQL statements.
+        :param parallel_workers: Number of windows to run concurrently.
+        :param pool: PostgresPool supplying connections for parallel windows (defaults to conn if conn is a pool).
+        :param manifest_tbl: Checkpoint manifest table name (created if missing).
+        :param adaptive: Use adaptive window sizing instead of dt1_interval/dt2_interval windows.
+        :param min_window_days: Smallest window the adaptive scheduler will split down to.
+        :param max_window_days: Largest window the adaptive scheduler will grow to.
+        :param target_seconds: Per-window duration the adaptive scheduler aims for.
+        :param max_window_seconds: statement_timeout for adaptive windows; timed-out windows are split.
+        :param prepared: Run string templates as a prepared statement (disable e.g. behind transaction-mode pgbouncer).
+        :param profiler: Optional PlanProfiler capturing EXPLAIN ANALYZE plans of sampled or slow windows (written next to the log_dir SQL).
+        :return: Pandas DataFrame with one row per executed window (start, end, status, error, row count, seconds).
         """
         import pandas as pd
 
+        if parallel_workers > 1 and pool is None:
+            raise ValueError("parallel_workers > 1 requires a PostgresPool (pass pool= or conn=<PostgresPool>)")
+        if parallel_workers > 1 and adaptive:
+            raise ValueError("adaptive window sizing runs windows one at a time; use parallel_workers=1")
+        if parallel_workers > 1:
+            pool._check_workers(parallel_workers)  # type: ignore[union-attr]
+
+        loop_srcs = (loop_src1, loop_src2, loop_src3)
+        date_filters = [
+            (filter_day_id_field1, "range", sql_loop_fn_dt_placeholder1),
+            (filter_day_id_field2, filter_id_type2, sql_loop_fn_dt_placeholder2),
+            (filter_day_id_field3, filter_id_type3, sql_loop_fn_dt_placeholder3),
+        ]
+
+        template = None if sql_loop_fn_type == "fn" else cls._loop_template(sql_loop_fn, saved_day_id_range_placeholder, date_filters)
+
+        def render(start: str, end: str) -> str:
+            # if its a function, pass in params
+            if template is None:
+                return sql_loop_fn(start=start, end=end, src=loop_srcs[0], src2=loop_srcs[1], src3=loop_srcs[2])
+            return template.render(start=start, end=end)
+
         # define the month start/end dates to loop through
-        rptg_dates = pd.date_range(dt_start, dt_end, freq=dt1_interval) - pd.offsets.MonthBegin(1)
-        rptg_dates = [str(x)[:10] for x in rptg_dates.to_list()]
-        rptg_dates = pd.DataFrame({"start_date": rptg_dates, "end_date": rptg_dates})
-        rptg_dates["end_date"] = rptg_dates["end_date"].shift(-1)
-        rptg_dates = rptg_dates[pd.to_datetime(rptg_dates["start_date"]) <= datetime.now()].dropna()
+        rptg_dates = cls._loop_windows(dt_start, dt_end, dt1_interval, month_begin=True)
 
         # define the weekly start/end dates to loop thru
-        rptg_dates_wk = pd.date_range(dt_start, dt_end, freq=dt2_interval)
-        rptg_dates_wk = [str(x)[:10] for x in rptg_dates_wk.to_list()]
-        rptg_dates_wk = pd.DataFrame({"start_date": rptg_dates_wk, "end_date": rptg_dates_wk})
-        rptg_dates_wk["end_date"] = rptg_dates_wk["end_date"].shift(-1)
-        rptg_dates_wk = rptg_dates_wk[pd.to_datetime(rptg_dates_wk["start_date"]) <= datetime.now()].dropna()
+        rptg_dates_wk = cls._loop_windows(dt_start, dt_end, dt2_interval)
 
         # dropping table if override = True
         if override:
@@ -889,267 +4243,108 @@ class PostgresETL:
                 conn.commit()
                 pass
 
-        # getting max day id value
-        try:
-            sql = f"""select max(date(trim(substring(dt_range,regexp_instr(dt_range,'to ')+3,10)))) as day_idnt FROM {tgt_tbl}"""
-            saved_dates = pd.read_sql_query(sql=sql, con=conn)
-        except:
-            conn.commit()
-            saved_dates = pd.DataFrame({"day_idnt": ["1999-12-31"]})  # arbitrarily old date
-
-        saved_date_dt = (
-            datetime(
-                year=int(str(saved_dates["day_idnt"].astype(str).values[0]).split("-")[0]),
-                month=int(str(saved_dates["day_idnt"].astype(str).values[0]).split("-")[1]),
-                day=int(str(saved_dates["day_idnt"].astype(str).values[0]).split("-")[2]),
+        def run_window(wconn: Any, start: str, end: str, log_key: str, create: bool = False, raise_errors: bool = False) -> dict[str, Any]:
+            return cls._run_loop_window(
+                wconn,
+                tgt_tbl,
+                start,
+                end,
+                render(start, end),
+                create,
+                log_dir,
+                log_key,
+                manifest_tbl,
+                raise_errors,
+                template if prepared else None,
+                profiler,
             )
-            .replace(day=1)
-            .strftime("%Y-%m-%d")
-        )
 
-        rptg_dates = rptg_dates[pd.to_datetime(rptg_dates["start_date"]) >= pd.to_datetime(saved_date_dt)].reset_index(drop=True)
+        def pending(rptg: Any) -> list[tuple[str, str]]:
+            if not manifest_tbl:
+                return cls._resume_windows(rptg, tgt_tbl, conn)
+            manifest = cls.read_load_manifest_pg(manifest_tbl=manifest_tbl, tgt_tbl=tgt_tbl, conn=conn)
+            return cls._manifest_windows(list(zip(rptg["start_date"], rptg["end_date"])), manifest, render)
+
+        if manifest_tbl:
+            cls.create_load_manifest_pg(manifest_tbl=manifest_tbl, conn=conn)
+            if override:
+                cur = conn.cursor()
+                cur.execute(f"DELETE FROM {manifest_tbl} WHERE tgt_tbl = %s", (tgt_tbl,))
+                conn.commit()
 
-        print("Starting load from:")
-        print(rptg_dates.head(1))
+        windows = pending(rptg_dates)
 
-        rptg_freq = "M"
+        print("Starting load from:")
+        print(windows[:1])
 
-        for idx, row in rptg_dates.iterrows():
-            print(f"""{row["start_date"]} to {row["end_date"]}""")
+        results: list[dict[str, Any]] = []
+        columns = ["window_start", "window_end", "status", "error", "row_count", "seconds"]
 
-            if idx == 0 and saved_dates["day_idnt"][0] != pd.to_datetime(row["start_date"]):
-                print(f"""latest saved data date in table is {str(saved_dates["day_idnt"][0])} ...""")
-                # bump up start range:
-                new_start = str(pd.to_datetime(str(saved_dates["day_idnt"][0])) + pd.DateOffset(1))[:10]
-                print(f"""revising start date to: {new_start} to {row["end_date"]}""")
-
-                # if its a function, pass in params
-                if sql_loop_fn_type == "fn":
-                    sql = sql_loop_fn(
-                        src=loop_src1,
-                        src2=loop_src2,
-                        src3=loop_src3,
-                        start=new_start,
-                        end=row["end_date"],
-                    )
-
-                # otherwise, we will just replace strings
-                else:
-                    # date range column for logging
-                    sql = sql_loop_fn.replace(
-                        saved_day_id_range_placeholder,
-                        f" '{new_start} to {row['end_date']}' as dt_range,",
-                    )
-
-                    # date filters
-                    sql = sql.replace(
-                        sql_loop_fn_dt_placeholder1,
-                        f" AND date({filter_day_id_field1}) >= '{new_start}' AND date({filter_day_id_field1}) < '{row['end_date']}'",
-                    )
-
-                    # check for other date fields
-                    if sql_loop_fn_dt_placeholder2:
-                        if filter_id_type2 == "range":
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder2,
-                                f" AND date({filter_day_id_field2}) >= '{new_start}' AND date({filter_day_id_field2}) < '{row['end_date']}'",
-                            )
-                        elif filter_id_type2 == "<":
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder2,
-                                f" AND date({filter_day_id_field2}) < '{row['end_date']}'",
-                            )
-
-                    if sql_loop_fn_dt_placeholder3:
-                        if filter_day_id_field3 == "range":
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder3,
-                                f" AND date({filter_day_id_field3}) >= '{new_start}' AND date({filter_day_id_field3}) < '{row['end_date']}'",
-                            )
-                        elif filter_id_type3 == "<":
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder3,
-                                f" AND date({filter_day_id_field3}) < '{row['end_date']}'",
-                            )
+        if adaptive:
+            if max_window_seconds:
+                cls.run_query_pg(conn=conn, sql=f"SET statement_timeout = {int(max_window_seconds * 1000)}")
+            try:
+                results = cls._run_loop_adaptive(conn, windows, run_window, override, min_window_days, max_window_days, target_seconds)
+            finally:
+                if max_window_seconds:
+                    conn.rollback()
+                    cls.run_query_pg(conn=conn, sql="RESET statement_timeout")
+            return pd.DataFrame(results, columns=columns)
+
+        if parallel_workers > 1:
+            first = 0
+            if override and windows:
+                print(f"""{windows[0][0]} to {windows[0][1]}""")
+                results.append(run_window(conn, *windows[0], "0", create=True))
+                if results[0]["status"] == "failed":
+                    print(results[0]["error"])
+                    return pd.DataFrame(results, columns=columns)
+                first = 1
+            results += cls._run_loop_windows_parallel(
+                pool, [(s, e, str(idx)) for idx, (s, e) in enumerate(windows) if idx >= first], run_window, parallel_workers
+            )
 
-            else:
-                if sql_loop_fn_type == "fn":
-                    sql = sql_loop_fn(
-                        start=row["start_date"],
-                        end=row["end_date"],
-                        src=loop_src1,
-                        src2=loop_src2,
-                        src3=loop_src3,
-                    )
-                else:
-                    # date range column for logging
-                    sql = sql_loop_fn.replace(
-                        saved_day_id_range_placeholder,
-                        f" '{row['start_date']} to {row['end_date']}' as dt_range,",
-                    )
-
-                    # date range column for logging
-                    sql = sql.replace(
-                        saved_day_id_range_placeholder,
-                        f" '{row['start_date']} to {row['end_date']}' as dt_range,",
-                    )
-
-                    sql = sql.replace(
-                        sql_loop_fn_dt_placeholder1,
-                        f" AND date({filter_day_id_field1}) >= '{row['start_date']}' AND date({filter_day_id_field1}) < '{row['end_date']}'",
-                    )
-
-                    # check for other date fields
-                    if sql_loop_fn_dt_placeholder2:
-                        if filter_id_type2 == "range":
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder2,
-                                f" AND date({filter_day_id_field2}) >= '{row['start_date']}' AND date({filter_day_id_field2}) < '{row['end_date']}'",
-                            )
-
-                        elif filter_id_type2 == "<":
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder2,
-                                f" AND date({filter_day_id_field2}) < '{row['end_date']}'",
-                            )
-
-                    if sql_loop_fn_dt_placeholder3:
-                        if filter_id_type2 == "range":
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder3,
-                                f" AND date({filter_day_id_field3}) >= '{row['start_date']}' AND date({filter_day_id_field3}) < '{row['end_date']}'",
-                            )
-
-                        elif filter_id_type3 == "<":
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder3,
-                                f" AND date({filter_day_id_field3}) < '{row['end_date']}'",
-                            )
-
-            if idx == 0 and override:
-                sql_prefix = f"CREATE TABLE {tgt_tbl} AS "
-            else:
-                sql_prefix = f"INSERT INTO {tgt_tbl} "
+            # retry failed windows once at the secondary interval
+            retry = []
+            for idx, res in enumerate(results):
+                if res["status"] != "failed":
+                    continue
+                bounds = [str(x)[:10] for x in pd.date_range(res["window_start"], res["window_end"], freq=dt2_interval)]
+                bounds = sorted({res["window_start"], res["window_end"], *bounds})
+                retry += [(s, e, f"{idx}_{j}") for j, (s, e) in enumerate(zip(bounds[:-1], bounds[1:]))]
+            if retry:
+                print(f"Retrying {len(retry)} sub-windows of failed windows at {dt2_interval} interval...")
+                results += cls._run_loop_windows_parallel(pool, retry, run_window, parallel_workers)
+            return pd.DataFrame(results, columns=columns)
 
-            _dump_sql(obj=sql_prefix + sql, filepath=log_dir + f"{tgt_tbl}_{idx}.sql")
+        rptg_freq = "M"
 
-            try:
-                cls.run_query_pg(conn=conn, sql=sql_prefix + sql)
-            except Exception as e:
-                print(str(e))
+        for idx, (start, end) in enumerate(windows):
+            print(f"""{start} to {end}""")
+            res = run_window(conn, start, end, str(idx), create=idx == 0 and override)
+            results.append(res)
+            if res["status"] == "failed":
+                print(res["error"])
                 rptg_freq = "W"
-                conn.commit()
                 break
 
         # if the insert failed on a monthly level, cycle down to weekly level
         if rptg_freq == "W":
             print("Insert failed on monthly level...cycling down to weekly")
-            # getting max day id value
-            try:
-                sql = f"""select max(date(trim(substring(dt_range,regexp_instr(dt_range,'to ')+3,10)))) as day_idnt FROM {tgt_tbl}"""
-                saved_dates = pd.read_sql_query(sql=sql, con=conn)
-            except:
-                conn.commit()
-                saved_dates = pd.DataFrame({"day_idnt": ["1999-12-31"]})  # arbitrarily old date
-
-            saved_date_dt = (
-                datetime(
-                    year=int(str(saved_dates["day_idnt"].astype(str).values[0]).split("-")[0]),
-                    month=int(str(saved_dates["day_idnt"].astype(str).values[0]).split("-")[1]),
-                    day=int(str(saved_dates["day_idnt"].astype(str).values[0]).split("-")[2]),
-                )
-                .replace(day=1)
-                .strftime("%Y-%m-%d")
-            )
-
-            rptg_dates_wk = rptg_dates_wk[pd.to_datetime(rptg_dates_wk["start_date"]) >= pd.to_datetime(saved_date_dt)].reset_index(drop=True)
-
-            for idx, row in rptg_dates_wk.iterrows():
-                print(f"""{row["start_date"]} to {row["end_date"]}""")
-
-                if idx == 0 and saved_dates["day_idnt"][0] != pd.to_datetime(row["start_date"]):
-                    print(f"""latest saved data date in table is {str(saved_dates["day_idnt"][0])} ...""")
-                    # bump up start range:
-                    new_start = str(pd.to_datetime(str(saved_dates["day_idnt"][0])) + pd.DateOffset(1))[:10]
-                    print(f"""revising start date to: {new_start} to {row["end_date"]}""")
-
-                    if sql_loop_fn_type == "fn":
-                        sql = sql_loop_fn(
-                            src=loop_src1,
-                            src2=loop_src2,
-                            src3=loop_src3,
-                            start=new_start,
-                            end=row["end_date"],
-                        )
-                    else:
-                        # date range column for logging
-                        sql = sql_loop_fn.replace(
-                            saved_day_id_range_placeholder,
-                            f" '{new_start} to {row['end_date']}' as dt_range,",
-                        )
-
-                        sql = sql.replace(
-                            sql_loop_fn_dt_placeholder1,
-                            f" AND date({filter_day_id_field1}) >= '{new_start}' AND date({filter_day_id_field1}) < '{row['end_date']}'",
-                        )
-
-                        # check for other date fields
-                        if sql_loop_fn_dt_placeholder2:
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder2,
-                                f" AND date({filter_day_id_field2}) >= '{new_start}' AND date({filter_day_id_field2}) < '{row['end_date']}'",
-                            )
-
-                        if sql_loop_fn_dt_placeholder3:
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder3,
-                                f" AND date({filter_day_id_field3}) >= '{new_start}' AND date({filter_day_id_field3}) < '{row['end_date']}'",
-                            )
-
-                else:
-                    if sql_loop_fn_type == "fn":
-                        sql = sql_loop_fn(
-                            start=row["start_date"],
-                            end=row["end_date"],
-                            src=loop_src1,
-                            src2=loop_src2,
-                            src3=loop_src3,
-                        )
-                    else:
-                        # date range column for logging
-                        sql = sql_loop_fn.replace(
-                            saved_day_id_range_placeholder,
-                            f" '{row['start_date']} to {row['end_date']}' as dt_range,",
-                        )
-
-                        sql = sql.replace(
-                            sql_loop_fn_dt_placeholder1,
-                            f" AND date({filter_day_id_field1}) >= '{row['start_date']}' AND date({filter_day_id_field1}) < '{row['end_date']}'",
-                        )
-
-                        # check for other date fields
-                        if sql_loop_fn_dt_placeholder2:
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder2,
-                                f" AND date({filter_day_id_field2}) >= '{row['start_date']}' AND date({filter_day_id_field2}) < '{row['end_date']}'",
-                            )
-
-                        if sql_loop_fn_dt_placeholder3:
-                            sql = sql.replace(
-                                sql_loop_fn_dt_placeholder3,
-                                f" AND date({filter_day_id_field3}) >= '{row['start_date']}' AND date({filter_day_id_field3}) < '{row['end_date']}'",
-                            )
-
-                if idx == 0 and override:
-                    sql_prefix = f"CREATE TABLE {tgt_tbl} AS "
-                else:
-                    sql_prefix = f"INSERT INTO {tgt_tbl} "
+            windows_wk = pending(rptg_dates_wk)
+            date_filters = [(field, "range", placeholder) for field, _, placeholder in date_filters]
+            if template is not None:
+                template = cls._loop_template(sql_loop_fn, saved_day_id_range_placeholder, date_filters)
+            created = any(res["status"] == "success" for res in results)
 
-                _dump_sql(obj=sql_prefix + sql, filepath=log_dir + f"{tgt_tbl}_{idx}.sql")
+            for idx, (start, end) in enumerate(windows_wk):
+                print(f"""{start} to {end}""")
+                results.append(run_window(conn, start, end, str(idx), create=idx == 0 and override and not created, raise_errors=True))
 
-                cls.run_query_pg(conn=conn, sql=sql_prefix + sql)
+        return pd.DataFrame(results, columns=columns)
 
     @classmethod
+    @_pg_pooled
     def sequential_load_pg_wk(
         cls,
         rptg_dates: Any,
@@ -1173,10 +4368,15 @@ class PostgresETL:
         filter_dt_type3: Any = False,
         filter_dt_placeholder3: Any = False,
         log_dir: Any = False,
+        prepared: bool = True,
+        profiler: Optional[PlanProfiler] = None,
     ) -> None:
         """
         Sequentially loads data into a Postgres table using weekly date-based SQL looping.
 
+        The template is parsed once; with ``prepared`` every INSERT week runs one prepared
+        statement with rptg_wk and the week bounds bound as parameters.
+
         :param rptg_dates: DataFrame with start_date, end_date, rptg_wk columns.
         :param override: Whether to drop and recreate the target table.
         :param tgt_tbl: Target table name.
@@ -1195,6 +4395,8 @@ class PostgresETL:
         :param filter_dt_type3: Type of third filter.
         :param filter_dt_placeholder3: Placeholder for third date filter.
         :param log_dir: Directory to log SQL statements.
+        :param prepared: Run the INSERT weeks as a prepared statement instead of inlining the dates.
+        :param profiler: Optional PlanProfiler capturing EXPLAIN ANALYZE plans of sampled or slow weeks (written next to the log_dir SQL).
         """
         # dropping table if override = True
         if override:
@@ -1205,48 +4407,33 @@ class PostgresETL:
                 conn.commit()
                 pass
 
+        # parse the template once: date range columns for logging, then the date filters
+        fragments = {
+            rptg_wk: (" '{rptg_wk}' as rptg_wk,", " $1 as rptg_wk,"),
+            rptg_wk_start: (" '{start}' as rptg_wk_start,", " $2 as rptg_wk_start,"),
+            rptg_wk_end: (" '{end}' as rptg_wk_end,", " $3 as rptg_wk_end,"),
+        }
+        filters = [(filter_dt_field1, "range", filter_dt_placeholder1)]
+        filters += [(filter_dt_field2, filter_dt_type2, filter_dt_placeholder2), (filter_dt_field3, filter_dt_type3, filter_dt_placeholder3)]
+        for field, filter_type, placeholder in filters:
+            if not placeholder:
+                continue
+            if filter_type == "range":
+                fragments[placeholder] = (
+                    f" AND date({field}) > '{{start}}'  AND date({field}) <= '{{end}}'",
+                    f" AND date({field}) > $2::date  AND date({field}) <= $3::date",
+                )
+            elif filter_type == "<=":
+                fragments[placeholder] = (f" AND date({field}) <= '{{end}}'", f" AND date({field}) <= $3::date")
+        template = _LoopTemplate(sql_loop_fn, fragments, ["rptg_wk", "start", "end"])
+
         for idx, row in rptg_dates.iterrows():
             print(f"""{row["start_date"]} to {row["end_date"]}""")
+            values = {"rptg_wk": row["rptg_wk"], "start": row["start_date"], "end": row["end_date"]}
+            sql = template.render(**values)
 
-            # date range column for logging
-            sql = sql_loop_fn.replace(rptg_wk, f" '{row['rptg_wk']}' as rptg_wk,")
-
-            sql = sql.replace(rptg_wk_start, f" '{row['start_date']}' as rptg_wk_start,")
-
-            sql = sql.replace(rptg_wk_end, f" '{row['end_date']}' as rptg_wk_end,")
-
-            # date filters
-            sql = sql.replace(
-                filter_dt_placeholder1,
-                f" AND date({filter_dt_field1}) > '{row['start_date']}'  AND date({filter_dt_field1}) <= '{row['end_date']}'",
-            )
-
-            # check for other date fields
-            if filter_dt_placeholder2:
-                if filter_dt_type2 == "range":
-                    sql = sql.replace(
-                        filter_dt_placeholder2,
-                        f" AND date({filter_dt_field2}) > '{row['start_date']}'  AND date({filter_dt_field2}) <= '{row['end_date']}'",
-                    )
-                elif filter_dt_type2 == "<=":
-                    sql = sql.replace(
-                        filter_dt_placeholder2,
-                        f" AND date({filter_dt_field2}) <= '{row['end_date']}'",
-                    )
-
-            if filter_dt_placeholder3:
-                if filter_dt_type3 == "range":
-                    sql = sql.replace(
-                        filter_dt_placeholder3,
-                        f" AND date({filter_dt_field3}) > '{row['start_date']}'  AND date({filter_dt_field3}) <= '{row['end_date']}'",
-                    )
-                elif filter_dt_type3 == "<=":
-                    sql = sql.replace(
-                        filter_dt_placeholder3,
-                        f" AND date({filter_dt_field3}) <= '{row['end_date']}'",
-                    )
-
-            if idx == 0 and override:
+            create = idx == 0 and override
+            if create:
                 sql_prefix = f"CREATE TABLE {tgt_tbl} AS "
             else:
                 sql_prefix = f"INSERT INTO {tgt_tbl} "
@@ -1254,24 +4441,44 @@ class PostgresETL:
             _dump_sql(obj=sql_prefix + sql, filepath=log_dir + f"{tgt_tbl}_{idx}.sql")
 
             try:
-                cls.run_query_pg(conn=conn, sql=sql_prefix + sql)
+                if profiler is None and (create or not prepared):
+                    cls.run_query_pg(conn=conn, sql=sql_prefix + sql)
+                else:
+                    cur = conn.cursor()
+
+                    def execute(explain: str) -> None:
+                        if prepared and not create:
+                            template.execute(cur, conn, sql_prefix, explain=explain, **values)
+                        else:
+                            cur.execute(explain + sql_prefix + sql)
+
+                    if profiler is not None:
+                        profiler.run(cur, sql_prefix + sql, execute, f"{tgt_tbl}_{idx}", tgt_tbl, log_dir)
+                    else:
+                        execute("")
+                    conn.commit()
             except Exception as e:
                 print(str(e))
                 conn.commit()
                 break
 
     @classmethod
-    def get_pg_columns(cls, tbl_name: str, conn: Any, schema_name: str = "public") -> Any:
+    def get_pg_columns(cls, tbl_name: str, conn: Any, schema_name: str = "public", catalog: Optional[PgCatalog] = None) -> Any:
         """
         Gets the column names and types for a Postgres table.
 
         :param tbl_name: Postgres table name.
         :param conn: Postgres database connection object.
         :param schema_name: Schema name.
+        :param catalog: Optional PgCatalog to answer from its cached snapshot instead of information_schema.
         :return: Pandas DataFrame with column information.
         """
         import pandas as pd
 
+        if catalog is not None:
+            cols = catalog.columns(tbl_name, conn, schema_name)
+            return pd.DataFrame(list(cols.items()), columns=["column_name", "data_type"])
+
         sql = f"""
         SELECT column_name, data_type
         FROM information_schema.columns
@@ -1279,28 +4486,33 @@ class PostgresETL:
         AND table_name = '{tbl_name}'
         ORDER BY ordinal_position
         """
-        return pd.read_sql_query(sql=sql, con=conn)
+        return cls.read_pg(sql=sql, conn=conn)
 
     @classmethod
-    def get_pg_tbls(cls, conn: Any, schema_name: str = "public") -> Any:
+    def get_pg_tbls(cls, conn: Any, schema_name: str = "public", catalog: Optional[PgCatalog] = None) -> Any:
         """
         Gets all table names in a Postgres schema.
 
         :param conn: Postgres database connection object.
         :param schema_name: Schema name.
+        :param catalog: Optional PgCatalog to answer from its cached snapshot instead of information_schema.
         :return: Pandas DataFrame with table names.
         """
         import pandas as pd
 
+        if catalog is not None:
+            return pd.DataFrame({"table_name": catalog.tables(conn, schema_name)})
+
         sql = f"""
         SELECT table_name
         FROM information_schema.tables
         WHERE table_schema = '{schema_name}'
         ORDER BY table_name
         """
-        return pd.read_sql_query(sql=sql, con=conn)
+        return cls.read_pg(sql=sql, conn=conn)
 
     @classmethod
+    @_pg_pooled
     def alter_column_pg(cls, tbl_name: str, col_name: str, col_type: str, conn: Any, cursor: Any) -> None:
         """
         Alters a column type in a Postgres table.
@@ -1313,3 +4525,158 @@ class PostgresETL:
         """
         sql = f"ALTER TABLE {tbl_name} ALTER COLUMN {col_name} TYPE {col_type}"
         cls.run_query_pg(conn=conn, sql=sql)
+        PgCatalog.invalidate_table(tbl_name)
+
+
+# MARK: - MySQL ETL
+class MySQLETL:
+    """
+    MySQL ETL operations: bulk loads and streaming reads.
+
+    Methods take either a SQLAlchemy engine from MySQL.eng_mysql (a connection is borrowed from
+    its pool for the call) or a PyMySQL connection.
+    """
+
+    @classmethod
+    @contextlib.contextmanager
+    def _connection(cls, conn: Any) -> Iterator[Any]:
+        """Yields the PyMySQL connection behind conn, borrowing one from the engine's pool if conn is an engine."""
+        if not hasattr(conn, "raw_connection"):
+            yield conn
+            return
+        raw = conn.raw_connection()
+        try:
+            yield getattr(raw, "driver_connection", raw)
+        finally:
+            raw.close()
+
+    @classmethod
+    def insert_df_mysql(
+        cls,
+        df: Any,
+        tbl_name: str,
+        conn: Any,
+        insert_type: str = "values",
+        chunk_size: int = 100000,
+        max_packet_bytes: Optional[int] = None,
+    ) -> int:
+        """
+        Bulk loads a DataFrame into an existing MySQL table.
+
+        ``values`` packs rows into multi-row ``INSERT ... VALUES`` statements, each as large as
+        ``max_allowed_packet`` allows (the smaller of the server's and the client's limit, less a
+        margin). ``infile`` streams ``chunk_size``-row tab-separated chunks through
+        ``LOAD DATA LOCAL INFILE``, which needs local_infile enabled on both the client
+        (``MySQL.eng_mysql(local_infile=True)``) and the server. NaN/None/NaT become NULL.
+
+        :param df: Pandas DataFrame.
+        :param tbl_name: MySQL table name.
+        :param conn: SQLAlchemy engine or PyMySQL connection.
+        :param insert_type: 'values' (multi-row INSERT) or 'infile' (LOAD DATA LOCAL INFILE).
+        :param chunk_size: Rows encoded at a time.
+        :param max_packet_bytes: Largest statement to send (defaults to max_allowed_packet).
+        :return: Number of rows the server reports as loaded.
+        """
+        if insert_type not in ("values", "infile"):
+            raise ValueError(f"insert_type must be 'values' or 'infile', got '{insert_type}'")
+
+        columns = ", ".join(f"`{col}`" for col in df.columns)
+        n_rows = len(df)
+        rptg_tstart = time.monotonic()
+        with cls._connection(conn) as mconn:
+            cur = mconn.cursor()
+            try:
+                if insert_type == "infile":
+                    with _timed("load_data", table=tbl_name, rows=n_rows, bytes=0) as event:
+
+                        def encoded() -> Iterator[bytes]:
+                            for i in range(0, n_rows, chunk_size):
+                                chunk = _mysql_infile_chunk(df.iloc[i : i + chunk_size])
+                                event["bytes"] += len(chunk)
+                                yield chunk
+
+                        with _local_infile(encoded()) as path:
+                            cur.execute(f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {tbl_name} CHARACTER SET utf8mb4 ({columns})")
+                        loaded = cur.rowcount
+                        event["rows"] = loaded
+                else:
+                    loaded = cls._insert_values(df, tbl_name, columns, mconn, cur, chunk_size, max_packet_bytes)
+                mconn.commit()
+            except Exception:
+                mconn.rollback()
+                raise
+            finally:
+                cur.close()
+        elapsed = time.monotonic() - rptg_tstart
+        print(f"Runtime: {elapsed / 60}")
+        print(f"Rows/sec: {loaded / elapsed if elapsed > 0 else float(loaded)}")
+        return loaded
+
+    @classmethod
+    def _insert_values(cls, df: Any, tbl_name: str, columns: str, mconn: Any, cur: Any, chunk_size: int, max_packet_bytes: Optional[int]) -> int:
+        """Sends df as multi-row INSERT statements no larger than the packet limit, without committing; returns the affected rows."""
+        if max_packet_bytes is None:
+            cur.execute("SELECT @@max_allowed_packet")
+            max_packet_bytes = min(int(cur.fetchone()[0]), getattr(mconn, "max_allowed_packet", 1 << 62))
+        # leave room for the packet header and the server's own bookkeeping
+        budget = int(max_packet_bytes * 0.9)
+        head = f"INSERT INTO {tbl_name} ({columns}) VALUES ".encode()
+        loaded = 0
+
+        def send(parts: list[bytes]) -> None:
+            nonlocal loaded
+            with _timed("insert_values", table=tbl_name, rows=len(parts)) as event:
+                sql = head + b",".join(parts)
+                cur.execute(sql.decode("utf-8"))
+                event["bytes"] = len(sql)
+            loaded += cur.rowcount
+
+        parts: list[bytes] = []
+        size = len(head)
+        for i in range(0, len(df), chunk_size):
+            chunk = df.iloc[i : i + chunk_size]
+            # object dtype hands the driver plain Python values; nulls of every kind become None
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            for row in chunk.itertuples(index=False, name=None):
+                literal = mconn.literal(row).encode("utf-8")
+                if size + len(literal) + 1 > budget and parts:
+                    send(parts)
+                    parts, size = [], len(head)
+                if size + len(literal) > budget:
+                    raise ValueError(f"a single row of {len(literal)} bytes exceeds the {max_packet_bytes} byte packet limit")
+                parts.append(literal)
+                size += len(literal) + 1
+        if parts:
+            send(parts)
+        return loaded
+
+    @classmethod
+    def iter_mysql_batches(cls, sql: str, conn: Any, batch_size: int = 10000) -> Iterator[Any]:
+        """
+        Streams a SQL query result as Pandas DataFrames using an unbuffered (server-side) cursor.
+
+        Rows are read off the socket as batches are requested, so one batch is held in memory at a
+        time. Column dtypes come from the result's MySQL types and are identical across batches
+        (integers are nullable Int64). The connection cannot run other statements until the
+        generator is exhausted or closed; closing early still reads the remaining rows off the wire.
+
+        :param sql: SQL query string.
+        :param conn: SQLAlchemy engine or PyMySQL connection.
+        :param batch_size: Number of rows per yielded DataFrame.
+        :return: Generator of Pandas DataFrames.
+        """
+        import pymysql.cursors
+
+        with cls._connection(conn) as mconn:
+            cur = mconn.cursor(pymysql.cursors.SSCursor)
+            try:
+                cur.execute(sql)
+                while True:
+                    with _timed("fetch_batch") as event:
+                        rows = cur.fetchmany(batch_size)
+                        event["rows"] = len(rows)
+                    if not rows:
+                        break
+                    yield _records_to_df(list(rows), cur.description, _MYSQL_TYPE_DTYPES)
+            finally:
+                cur.close()
@@ -34,3 +34,60 @@ def test_postgres_connection(pg_credentials: dict[str, str]) -> None:
     result = cursor.fetchone()
     assert result == (1,)
     conn.close()
+
+
+def test_sequential_load_pg_wk_prepared_matches_literal_types(pg_credentials: dict[str, str], tmp_path: object) -> None:
+    """Prepared weeks should coerce rptg_wk* like the inlined literals: into typed columns and into CREATE TABLE AS tables."""
+    import pandas as pd
+
+    from fusetools.db_tools import Postgres, PostgresETL
+
+    cursor, conn = Postgres.con_postgres(**pg_credentials)
+    rptg_dates = pd.DataFrame(
+        {"start_date": ["2024-01-01", "2024-01-08", "2024-01-15"], "end_date": ["2024-01-08", "2024-01-15", "2024-01-22"], "rptg_wk": ["1", "2", "3"]}
+    )
+    tables = {prepared: f"fusetools_it_wk_{'prepared' if prepared else 'literal'}" for prepared in (False, True)}
+
+    def load(tgt_tbl: str, override: bool, prepared: bool) -> None:
+        PostgresETL.sequential_load_pg_wk(
+            rptg_dates=rptg_dates,
+            override=override,
+            tgt_tbl=tgt_tbl,
+            conn=conn,
+            rptg_wk="/*wk*/",
+            rptg_wk_start="/*wk_start*/",
+            rptg_wk_end="/*wk_end*/",
+            sql_loop_fn="SELECT /*wk*/ /*wk_start*/ /*wk_end*/ 1 AS n",
+            log_dir=f"{tmp_path}/",
+            prepared=prepared,
+        )
+
+    def column_types(tgt_tbl: str) -> list[tuple]:
+        cursor.execute("SELECT column_name, data_type FROM information_schema.columns WHERE table_name = %s ORDER BY ordinal_position", (tgt_tbl,))
+        return cursor.fetchall()
+
+    def row_count(tgt_tbl: str) -> int:
+        cursor.execute(f"SELECT count(*) FROM {tgt_tbl}")
+        return cursor.fetchone()[0]
+
+    try:
+        # existing tables with typed columns take every week on both paths
+        for prepared, tgt_tbl in tables.items():
+            cursor.execute(f"DROP TABLE IF EXISTS {tgt_tbl}")
+            cursor.execute(f"CREATE TABLE {tgt_tbl} (rptg_wk INT, rptg_wk_start DATE, rptg_wk_end DATE, n INT)")
+            conn.commit()
+            load(tgt_tbl, override=False, prepared=prepared)
+            assert row_count(tgt_tbl) == 3
+        assert column_types(tables[True]) == column_types(tables[False])
+
+        # tables created by the first week end up with the same column types either way
+        for prepared, tgt_tbl in tables.items():
+            load(tgt_tbl, override=True, prepared=prepared)
+            assert row_count(tgt_tbl) == 3
+        assert column_types(tables[True]) == column_types(tables[False])
+    finally:
+        conn.rollback()
+        for tgt_tbl in tables.values():
+            cursor.execute(f"DROP TABLE IF EXISTS {tgt_tbl}")
+        conn.commit()
+        conn.close()
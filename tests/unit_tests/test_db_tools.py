@@ -1,6 +1,9 @@
 """Tests for db_tools module."""
 
+import os
+
 import pandas as pd
+import pytest
 
 
 def test_import_db_tools() -> None:
@@ -62,3 +65,1468 @@ def test_make_db_schema() -> None:
     assert "col" in schema.columns
     assert "dtype_final" in schema.columns
     assert len(schema) == 3
+
+
+def test_copy_text_chunk_nulls_and_escaping() -> None:
+    """_copy_text_chunk should emit \\N for NaN/None/NaT and escape tabs/backslashes."""
+    import numpy as np
+
+    from fusetools.db_tools import _copy_text_chunk
+
+    df = pd.DataFrame(
+        {
+            "id": [1.0, np.nan],
+            "txt": ["a\tb", None],
+            "ts": pd.to_datetime(["2024-01-02 03:04:05", None]),
+        }
+    )
+    out = _copy_text_chunk(df)
+    assert out == "1\ta\\tb\t2024-01-02 03:04:05.000000\n\\N\t\\N\t\\N\n"
+
+
+def test_copy_df_pg_streams_chunks() -> None:
+    """copy_df_pg should stream every chunk through copy_expert and return the row count."""
+    from fusetools.db_tools import PostgresETL
+
+    class FakeCursor:
+        def copy_expert(self, sql: str, file: object, size: int = 8192) -> None:
+            self.sql = sql
+            self.data = ""
+            while True:
+                piece = file.read(3)  # type: ignore[attr-defined]
+                if not piece:
+                    break
+                self.data += piece
+
+    class FakeConn:
+        def commit(self) -> None:
+            pass
+
+    cursor = FakeCursor()
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    n = PostgresETL.copy_df_pg(df, "tbl", FakeConn(), cursor, chunk_size=2)
+    assert n == 3
+    assert cursor.sql == "COPY tbl (a,b) FROM STDIN WITH (FORMAT text)"
+    assert cursor.data == "1\tx\n2\ty\n3\tz\n"
+
+
+def test_iter_pg_batches_stable_dtypes_and_close() -> None:
+    """iter_pg_batches should type batches from the cursor description, close the cursor early and end its transaction."""
+    from fusetools.db_tools import PostgresETL
+
+    class FakeCursor:
+        description = [("id", 23), ("name", 25)]
+        closed = False
+
+        def __init__(self) -> None:
+            self.rows = iter([(1, "a"), (None, "b"), (3, None), (4, "d")])
+
+        def execute(self, sql: str) -> None:
+            pass
+
+        def __iter__(self) -> "FakeCursor":
+            return self
+
+        def __next__(self) -> tuple:
+            return next(self.rows)
+
+        def close(self) -> None:
+            self.closed = True
+
+    class FakeConn:
+        def __init__(self, status: int = 0) -> None:
+            self.status = status
+            self.ended: list[str] = []
+
+        def get_transaction_status(self) -> int:
+            return self.status
+
+        def cursor(self, name: str) -> FakeCursor:
+            assert name
+            self.cur = FakeCursor()
+            return self.cur
+
+        def commit(self) -> None:
+            self.ended.append("commit")
+
+        def rollback(self) -> None:
+            self.ended.append("rollback")
+
+    conn = FakeConn()
+    batches = PostgresETL.read_pg_batches("SELECT 1", conn, batch_size=1, stream=True)
+    first = next(batches)
+    second = next(batches)
+    assert str(first["id"].dtype) == "Int64"
+    assert str(second["id"].dtype) == "Int64"
+    assert conn.ended == []
+    batches.close()
+    assert conn.cur.closed and conn.ended == ["commit"]
+
+    # a failed fetch rolls back the transaction the cursor opened; the caller's own is left alone
+    conn = FakeConn()
+    batches = PostgresETL.read_pg_batches("SELECT 1", conn, batch_size=1, stream=True)
+    next(batches)
+    conn.cur.rows = None
+    with pytest.raises(TypeError):
+        list(batches)
+    assert conn.ended == ["rollback"]
+
+    in_txn = FakeConn(status=2)
+    assert len(list(PostgresETL.read_pg_batches("SELECT 1", in_txn, batch_size=2, stream=True))) == 2
+    assert in_txn.cur.closed and in_txn.ended == []
+
+
+def test_iter_pg_batches_null_timestamp_batch_keeps_unit() -> None:
+    """An all-NULL timestamp batch should get the same datetime64[ns] dtypes as batches with values."""
+    import datetime as dt
+
+    from fusetools.db_tools import PostgresETL
+
+    ts = dt.datetime(2024, 1, 2, 3, 4, 5, 123456)
+
+    class FakeCursor:
+        description = [("ts", 1114), ("tstz", 1184)]
+
+        def __init__(self) -> None:
+            self.rows = iter([(None, None), (ts, ts.replace(tzinfo=dt.timezone.utc))])
+
+        def execute(self, sql: str) -> None:
+            pass
+
+        def __iter__(self) -> "FakeCursor":
+            return self
+
+        def __next__(self) -> tuple:
+            return next(self.rows)
+
+        def close(self) -> None:
+            pass
+
+    class FakeConn:
+        def cursor(self, name: str) -> FakeCursor:
+            return FakeCursor()
+
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            pass
+
+    first, second = PostgresETL.read_pg_batches("SELECT 1", FakeConn(), batch_size=1, stream=True)
+    for batch in (first, second):
+        assert str(batch["ts"].dtype) == "datetime64[ns]"
+        assert str(batch["tstz"].dtype) == "datetime64[ns, UTC]"
+    assert second.loc[0, "ts"] == pd.Timestamp(ts)
+
+
+def test_postgres_pool_checkout_and_pooled_methods(monkeypatch: object) -> None:
+    """PostgresPool should reuse connections, replace failed pings and work as conn for PostgresETL methods."""
+    from fusetools.db_tools import Postgres, PostgresETL, PostgresPool
+
+    class FakeCursor:
+        def __init__(self, conn: "FakeConn") -> None:
+            self.conn = conn
+
+        def execute(self, sql: str) -> None:
+            if self.conn.broken:
+                raise RuntimeError("server closed the connection")
+            self.conn.executed.append(sql)
+
+        def fetchone(self) -> tuple:
+            return (1,)
+
+        def close(self) -> None:
+            pass
+
+    class FakeConn:
+        closed = 0
+
+        def __init__(self) -> None:
+            self.broken = False
+            self.executed: list[str] = []
+
+        def cursor(self) -> FakeCursor:
+            return FakeCursor(self)
+
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            pass
+
+        def close(self) -> None:
+            self.closed = 1
+
+    created: list[FakeConn] = []
+
+    def fake_connect(**kwargs: object) -> tuple:
+        conn = FakeConn()
+        created.append(conn)
+        return conn.cursor(), conn
+
+    monkeypatch.setattr(Postgres, "con_postgres", fake_connect)  # type: ignore[attr-defined]
+
+    with PostgresPool(host="h", db="d", usr="u", pwd="p", min_size=1, max_size=2) as pool:
+        PostgresETL.run_query_pg(conn=pool, sql="SELECT 42")
+        assert "SELECT 42" in created[0].executed
+
+        created[0].broken = True
+        PostgresETL.truncate_tbl_pg("tbl", conn=pool, cursor=None)
+        assert len(created) == 2
+        assert "TRUNCATE TABLE tbl" in created[1].executed
+
+        stats = pool.stats()
+        assert stats["checkouts"] == 2
+        assert stats["ping_failures"] == 1
+        assert stats["in_use"] == 0
+
+
+def test_sequential_load_pg_parallel_accounts_failed_windows(monkeypatch: object) -> None:
+    """Parallel sequential_load_pg should keep going past a failed window and retry it as sub-windows."""
+    import threading
+
+    from fusetools.db_tools import Postgres, PostgresETL, PostgresPool
+
+    executed: list[str] = []
+    lock = threading.Lock()
+
+    class FakeCursor:
+        def execute(self, sql: str) -> None:
+            if "2024-02-01 to 2024-03-01" in sql:
+                raise RuntimeError("statement timeout")
+            with lock:
+                executed.append(sql)
+
+        def fetchone(self) -> tuple:
+            return (1,)
+
+        def close(self) -> None:
+            pass
+
+    class FakeConn:
+        closed = 0
+
+        def cursor(self) -> FakeCursor:
+            return FakeCursor()
+
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            pass
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr(Postgres, "con_postgres", lambda **kwargs: (FakeCursor(), FakeConn()))  # type: ignore[attr-defined]
+
+    kwargs = dict(
+        override=False,
+        tgt_tbl="tgt",
+        dt_start="2024-01-01",
+        dt_end="2024-05-01",
+        saved_day_id_range_placeholder="--RANGE",
+        dt1_interval="MS",
+        dt2_interval="W-MON",
+        sql_loop_fn=lambda start, end, src, src2, src3: f"SELECT '{start} to {end}'",
+        sql_loop_fn_type="fn",
+        parallel_workers=3,
+    )
+    # conn=<pool> keeps one connection checked out, so three workers need a pool of four
+    with PostgresPool(host="h", db="d", usr="u", pwd="p", min_size=0, max_size=3) as pool:
+        with pytest.raises(ValueError, match="max_size >= 4"):
+            PostgresETL.sequential_load_pg(conn=pool, **kwargs)
+        assert pool.stats()["in_use"] == 0
+    with PostgresPool(host="h", db="d", usr="u", pwd="p", min_size=0, max_size=4) as pool:
+        results = PostgresETL.sequential_load_pg(conn=pool, **kwargs)
+
+    assert list(results["status"]).count("failed") == 1
+    assert (results["status"] == "success").sum() == len(results) - 1
+    assert any("2024-02-05" in sql for sql in executed)
+
+
+def test_manifest_windows_skips_completed_ranges() -> None:
+    """_manifest_windows should skip exactly the date ranges recorded as successful."""
+    from fusetools.db_tools import PostgresETL
+
+    manifest = pd.DataFrame(
+        {
+            "window_start": ["2024-01-01", "2024-02-01", "2024-03-01"],
+            "window_end": ["2024-02-01", "2024-02-08", "2024-04-01"],
+            "status": ["success", "success", "failed"],
+            "sql_hash": [None, None, None],
+        }
+    )
+    windows = [("2024-01-01", "2024-02-01"), ("2024-02-01", "2024-03-01"), ("2024-03-01", "2024-04-01")]
+    todo = PostgresETL._manifest_windows(windows, manifest, lambda start, end: f"{start}{end}")
+    assert todo == [("2024-02-08", "2024-03-01"), ("2024-03-01", "2024-04-01")]
+
+
+def test_run_loop_adaptive_bisects_and_grows() -> None:
+    """_run_loop_adaptive should split failing windows and cover the span exactly once."""
+    from datetime import date
+
+    from fusetools.db_tools import PostgresETL
+
+    def run_window(conn: object, start: str, end: str, log_key: str, create: bool = False) -> dict:
+        days = (date.fromisoformat(end) - date.fromisoformat(start)).days
+        status = "failed" if days > 8 else "success"
+        return {"window_start": start, "window_end": end, "status": status, "error": "too big", "seconds": 1.0}
+
+    results = PostgresETL._run_loop_adaptive(None, [("2024-01-01", "2024-03-01")], run_window, False, 1, 92, 300.0)
+    done = [(r["window_start"], r["window_end"]) for r in results if r["status"] == "success"]
+    assert done[0][0] == "2024-01-01"
+    assert done[-1][1] == "2024-03-01"
+    assert all(a[1] == b[0] for a, b in zip(done, done[1:]))
+    assert any(r["status"] == "split" for r in results)
+
+
+def test_run_loop_adaptive_merges_contiguous_spans() -> None:
+    """_run_loop_adaptive should grow windows across contiguous pending spans but not bridge gaps between them."""
+    from fusetools.db_tools import PostgresETL
+
+    def run_window(conn: object, start: str, end: str, log_key: str, create: bool = False) -> dict:
+        return {"window_start": start, "window_end": end, "status": "success", "error": None, "seconds": 1.0}
+
+    spans = [("2024-01-01", "2024-02-01"), ("2024-02-01", "2024-03-01"), ("2024-03-01", "2024-04-01"), ("2024-05-01", "2024-06-01")]
+    results = PostgresETL._run_loop_adaptive(None, spans, run_window, False, 1, 92, 300.0)
+    done = [(r["window_start"], r["window_end"]) for r in results]
+    assert done == [("2024-01-01", "2024-02-01"), ("2024-02-01", "2024-04-01"), ("2024-05-01", "2024-06-01")]
+
+
+def test_make_db_schema_inference_and_confidence() -> None:
+    """make_db_schema should type blanks/dates/booleans and honour the confidence fallback."""
+    from fusetools.db_tools import Generic
+
+    df = pd.DataFrame(
+        {
+            "int_str": ["1", "2", " "],
+            "date_str": ["2024-01-01", "2024-02-01", ""],
+            "flag": [True, False, True],
+            "mostly_num": ["1.5", "2", "n/a"],
+        }
+    )
+    schema = Generic.make_db_schema(df).set_index("col")["dtype_new"]
+    assert schema["int_str"] == "Int64"
+    assert schema["date_str"] == "datetime64[ns]"
+    assert schema["flag"] == "boolean"
+    assert schema["mostly_num"] == "object"
+
+    relaxed = Generic.make_db_schema(df, sample_size=3, confidence=0.6).set_index("col")["dtype_new"]
+    assert relaxed["mostly_num"] == "float"
+
+
+def test_make_df_tbl_pg_profiled_types() -> None:
+    """make_df_tbl_pg should emit the narrowest types from the column profile."""
+    from fusetools.db_tools import PostgresETL
+
+    df = pd.DataFrame(
+        {
+            "Small Int": [1, 2, 3],
+            "big": [1, 2, 2**40],
+            "txt": ["a", "bbb", None],
+            "flag": [True, False, True],
+            "empty": [None, None, None],
+        }
+    )
+    sql = PostgresETL.make_df_tbl_pg("tbl", df)
+    assert sql == "CREATE TABLE tbl ( small_int SMALLINT, big BIGINT, txt VARCHAR(3), flag BOOLEAN, empty TEXT )"
+
+
+def test_profile_df_merges_chunks() -> None:
+    """profile_df over chunks should sum counts and widen kinds."""
+    from fusetools.db_tools import Generic
+
+    chunks = [pd.DataFrame({"a": [1, 2], "b": [1, None]}), pd.DataFrame({"a": [3.5, None], "b": ["x", "yy"]})]
+    prof = Generic.profile_df(chunks).set_index("column")
+    assert prof.loc["a", "kind"] == "floating"
+    assert prof.loc["a", "null_count"] == 1
+    assert prof.loc["a", "max"] == 3.5
+    assert prof.loc["b", "kind"] == "string"
+    assert prof.loc["b", "row_count"] == 4
+
+
+def test_upsert_df_pg_staging_merges_per_chunk() -> None:
+    """upsert_df_pg(upsert_type='staging') should COPY into a temp table and merge once per chunk."""
+    from fusetools.db_tools import PostgresETL
+
+    class FakeCursor:
+        rowcount = 2
+
+        def __init__(self) -> None:
+            self.statements: list[str] = []
+
+        def execute(self, sql: str) -> None:
+            self.statements.append(" ".join(sql.split()))
+
+        def copy_expert(self, sql: str, file: object, size: int = 8192) -> None:
+            self.statements.append(sql)
+            file.read()  # type: ignore[attr-defined]
+
+    class FakeConn:
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            pass
+
+    cursor = FakeCursor()
+    df = pd.DataFrame({"id": [1, 2, 3, 4], "val": ["a", "b", "c", "d"]})
+    timings = PostgresETL.upsert_df_pg(df, "tgt", FakeConn(), cursor, "id", upsert_type="staging", chunk_size=2)
+
+    merges = [s for s in cursor.statements if s.startswith("INSERT INTO tgt")]
+    assert len(merges) == 2
+    assert "ON CONFLICT (id) DO UPDATE SET val=EXCLUDED.val" in merges[0]
+    assert cursor.statements[0].startswith("CREATE TEMP TABLE fusetools_stage_")
+    assert cursor.statements[-1].startswith("DROP TABLE IF EXISTS fusetools_stage_")
+    assert timings["rows_merged"] == 4
+
+
+def test_upsert_df_pg_hash_col_skips_unchanged_rows(monkeypatch: object) -> None:
+    """upsert_df_pg(hash_col=...) should only send rows whose stored hash differs."""
+    from fusetools.db_tools import Generic, PostgresETL
+
+    psycopg2_extras = pytest.importorskip("psycopg2.extras")
+
+    df = pd.DataFrame({"id": [1, 2, 3], "val": ["a", "b", "c"]})
+    hashes = Generic.row_hash(df)
+    assert hashes.equals(Generic.row_hash(df.copy()))
+
+    class FakeCursor:
+        def execute(self, sql: str, params: tuple) -> None:
+            assert list(params[0]) == [1, 2, 3]
+
+        def fetchall(self) -> list[tuple]:
+            # id 1 unchanged, id 2 changed, id 3 has no stored hash yet
+            return [(1, int(hashes[0])), (2, 0), (3, None)]
+
+    class FakeConn:
+        def commit(self) -> None:
+            pass
+
+    sent: list[tuple[str, list]] = []
+    monkeypatch.setattr(psycopg2_extras, "execute_batch", lambda cur, sql, rows: sent.append((sql, list(rows))))  # type: ignore[attr-defined]
+    PostgresETL.upsert_df_pg(df, "tgt", FakeConn(), FakeCursor(), "id", hash_col="row_hash")
+
+    sql, rows = sent[0]
+    assert [r[0] for r in rows] == [2, 3]
+    assert sql.endswith("WHERE tgt.row_hash IS DISTINCT FROM EXCLUDED.row_hash")
+
+
+def test_upsert_df_staged_pg_failed_merge_keeps_original_error() -> None:
+    """upsert_df_staged_pg should roll back before dropping its stage and re-raise the merge error even if cleanup fails."""
+    from fusetools.db_tools import PostgresETL
+
+    class FakeConn:
+        def __init__(self, dead: bool = False) -> None:
+            self.dead = dead
+            self.aborted = False
+            self.executed: list[str] = []
+
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            if self.dead:
+                raise RuntimeError("connection already closed")
+            self.aborted = False
+
+    class FakeCursor:
+        rowcount = 1
+
+        def __init__(self, conn: FakeConn) -> None:
+            self.conn = conn
+
+        def execute(self, sql: str) -> None:
+            if self.conn.aborted:
+                raise RuntimeError("current transaction is aborted, commands ignored until end of transaction block")
+            if "ON CONFLICT" in sql:
+                self.conn.aborted = True
+                raise ValueError("duplicate key value violates unique constraint")
+            self.conn.executed.append(" ".join(sql.split()))
+
+        def copy_expert(self, sql: str, file: object, size: int = 8192) -> None:
+            file.read()  # type: ignore[attr-defined]
+
+    df = pd.DataFrame({"id": [1, 2], "val": ["a", "b"]})
+    for dead in (False, True):
+        conn = FakeConn(dead=dead)
+        with pytest.raises(ValueError, match="duplicate key"):
+            PostgresETL.upsert_df_staged_pg(df, "tgt", conn, FakeCursor(conn), "id")
+        assert conn.executed[-1].startswith("DROP TABLE IF EXISTS fusetools_stage_") != dead
+
+
+def test_upsert_tbl_pg_compare_cols_are_null_safe() -> None:
+    """upsert_tbl_pg should compare update columns with IS DISTINCT FROM, or through a stored md5 hash."""
+    from fusetools.db_tools import PostgresETL
+
+    sql_update, _ = PostgresETL.upsert_tbl_pg("src", "tgt", ["id"], ["id", "a", "b"], ["a", "b"], ["a", "b"])
+    assert "AND (s.a, s.b) IS DISTINCT FROM (tgt.a, tgt.b)" in sql_update
+
+    sql_update, sql_insert = PostgresETL.upsert_tbl_pg("src", "tgt", ["id"], ["id", "a", "b"], ["a", "b"], md5_col="row_md5")
+    assert "row_md5 = md5(ROW(s.a, s.b)::text)" in sql_update
+    assert "tgt.row_md5 IS DISTINCT FROM md5(ROW(s.a, s.b)::text)" in sql_update
+    assert "INSERT INTO tgt (id, a, b, row_md5) SELECT s.id, s.a, s.b, md5(ROW(s.a, s.b)::text)" in " ".join(sql_insert.split())
+
+
+def test_parallel_insert_df_pg_atomic_shards(monkeypatch: object) -> None:
+    """parallel_insert_df_pg(atomic=True) should stage shards, publish them together, drop stages on failure and check worker counts."""
+    from fusetools.db_tools import Postgres, PostgresETL, PostgresPool
+
+    statements: list[str] = []
+    copied: list[str] = []
+
+    class FakeCursor:
+        def execute(self, sql: str) -> None:
+            statements.append(sql)
+
+        def fetchone(self) -> tuple:
+            return (1,)
+
+        def copy_expert(self, sql: str, file: object, size: int = 8192) -> None:
+            payload = file.read()  # type: ignore[attr-defined]
+            if "boom" in payload:
+                raise RuntimeError("bad row")
+            copied.append(payload)
+
+        def close(self) -> None:
+            pass
+
+    class FakeConn:
+        closed = 0
+
+        def cursor(self) -> FakeCursor:
+            return FakeCursor()
+
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            pass
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr(Postgres, "con_postgres", lambda **kwargs: (FakeCursor(), FakeConn()))  # type: ignore[attr-defined]
+
+    df = pd.DataFrame({"id": range(10), "val": list("abcdefghij")})
+    with PostgresPool(host="h", db="d", usr="u", pwd="p", max_size=3) as pool:
+        summary = PostgresETL.parallel_insert_df_pg(df, "tgt", pool, parallel_workers=3, atomic=True)
+        assert summary["rows"] == 10 and summary["shards"] == 3
+        assert sum(len(p.splitlines()) for p in copied) == 10
+        assert len([s for s in statements if s.startswith("CREATE UNLOGGED TABLE fusetools_shard_")]) == 3
+        assert len([s for s in statements if s.startswith("INSERT INTO tgt SELECT * FROM fusetools_shard_")]) == 3
+        assert len([s for s in statements if s.startswith("DROP TABLE IF EXISTS fusetools_shard_")]) == 3
+
+        statements.clear()
+        frames = [df.iloc[:5], df.iloc[5:].assign(val="boom")]
+        with pytest.raises(RuntimeError, match="1 shard"):
+            PostgresETL.parallel_insert_df_pg(frames, "tgt", pool, parallel_workers=2, atomic=True)
+        assert not [s for s in statements if s.startswith("INSERT INTO tgt")]
+        assert len([s for s in statements if s.startswith("DROP TABLE IF EXISTS fusetools_shard_")]) == 2
+
+        # bad worker counts fail before any shard is staged
+        statements.clear()
+        with pytest.raises(ValueError, match="parallel_workers must be >= 1"):
+            PostgresETL.parallel_insert_df_pg(df, "tgt", pool, parallel_workers=0)
+        with pytest.raises(ValueError, match="max_size >= 4"):
+            PostgresETL.parallel_insert_df_pg(df, "tgt", pool, parallel_workers=4, atomic=True)
+        assert statements == []
+
+
+def test_make_tbl_complete_pg_streams_and_widens(monkeypatch: object) -> None:
+    """make_tbl_complete_pg should create DDL from the first chunk, widen columns for later chunks and insert each chunk."""
+    from fusetools.db_tools import PostgresETL
+
+    psycopg2_extras = pytest.importorskip("psycopg2.extras")
+
+    statements: list[str] = []
+
+    class FakeCursor:
+        def execute(self, sql: str) -> None:
+            statements.append(sql)
+
+    class FakeConn:
+        def __init__(self) -> None:
+            self.commits = 0
+
+        def cursor(self) -> FakeCursor:
+            return FakeCursor()
+
+        def commit(self) -> None:
+            self.commits += 1
+
+    inserted: list[int] = []
+    monkeypatch.setattr(psycopg2_extras, "execute_batch", lambda cur, sql, rows: inserted.append(len(rows)))  # type: ignore[attr-defined]
+
+    chunks = iter(
+        [
+            pd.DataFrame({"Id": [1, 2], "Name": ["ab", "cd"]}),
+            pd.DataFrame({"Id": [3, 100000], "Name": ["ef", "gh"]}),
+            pd.DataFrame({"Id": [5], "Name": ["abcdef"]}),
+        ]
+    )
+    conn = FakeConn()
+    PostgresETL.make_tbl_complete_pg(chunks, "tbl", conn, FakeCursor())
+
+    assert "CREATE TABLE tbl ( id SMALLINT, name VARCHAR(2) )" in statements
+    assert "ALTER TABLE tbl ALTER COLUMN id TYPE INTEGER USING id::INTEGER" in statements
+    assert "ALTER TABLE tbl ALTER COLUMN name TYPE VARCHAR(6) USING name::VARCHAR(6)" in statements
+    assert inserted == [2, 2, 1]
+
+
+def test_build_indexes_pg_parallel_after_load(monkeypatch: object) -> None:
+    """build_indexes_pg should build the PK as a unique index alongside other indexes, attach it, then ANALYZE."""
+    from fusetools.db_tools import Postgres, PostgresETL, PostgresPool
+
+    statements: list[str] = []
+
+    class FakeCursor:
+        def execute(self, sql: str) -> None:
+            statements.append(sql)
+
+        def fetchone(self) -> tuple:
+            return (1,)
+
+        def close(self) -> None:
+            pass
+
+    class FakeConn:
+        closed = 0
+
+        def cursor(self) -> FakeCursor:
+            return FakeCursor()
+
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            pass
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr(Postgres, "con_postgres", lambda **kwargs: (FakeCursor(), FakeConn()))  # type: ignore[attr-defined]
+
+    with PostgresPool(host="h", db="d", usr="u", pwd="p", max_size=3) as pool:
+        timings = PostgresETL.build_indexes_pg(
+            "tbl", conn=pool, primary_key=["id"], indexes=[["dt"], ["a", "b"]], parallel_workers=2, maintenance_work_mem="1GB"
+        )
+
+    assert set(timings["index_seconds"]) == {"tbl_pkey", "idx_tbl_dt", "idx_tbl_a_b"}
+    assert "CREATE UNIQUE INDEX tbl_pkey ON tbl (id)" in statements
+    assert "CREATE INDEX IF NOT EXISTS idx_tbl_a_b ON tbl (a, b)" in statements
+    assert statements.count("SET LOCAL maintenance_work_mem = '1GB'") == 3
+    assert statements[-2:] == ["ALTER TABLE tbl ADD CONSTRAINT tbl_pkey PRIMARY KEY USING INDEX tbl_pkey", "ANALYZE tbl"]
+
+    # conn=<pool> keeps one connection checked out, so a pool with room for only the builds is refused before any load
+    with PostgresPool(host="h", db="d", usr="u", pwd="p", max_size=2) as pool:
+        with pytest.raises(ValueError, match="max_size >= 3"):
+            PostgresETL.build_indexes_pg("tbl", conn=pool, indexes=[["dt"], ["a", "b"]], parallel_workers=2)
+        with pytest.raises(ValueError, match="max_size >= 3"):
+            PostgresETL.insert_df_pg(pd.DataFrame({"dt": [1]}), "tbl", pool, None, insert_type="copy", indexes=[["dt"], ["a"]], index_workers=2)
+        assert pool.stats()["in_use"] == 0
+
+
+def test_db_apply_schema_keeps_nulls_and_copies() -> None:
+    """db_apply_schema should cast grouped columns, keep nulls as nulls and leave the input untouched unless inplace."""
+    import numpy as np
+
+    from fusetools.db_tools import Generic
+
+    df = pd.DataFrame({"a": ["1", "2", None], "b": [1.5, np.nan, 3.0], "c": ["2020-01-01", "bad", None], "d": ["1.5", "x", "3"]})
+    schema = pd.DataFrame({"column": ["a", "b", "c", "d"], "type": ["INTEGER", "VARCHAR", "TIMESTAMP", "FLOAT"]})
+
+    out = Generic.db_apply_schema(df, schema)
+    assert str(out["a"].dtype) == "Int64" and out["a"].isna().tolist() == [False, False, True]
+    assert out["b"].isna().tolist() == [False, True, False] and out.loc[0, "b"] == "1.5"
+    assert out["c"].isna().tolist() == [False, True, True]
+    assert out["d"].isna().tolist() == [False, True, False]
+    assert str(df["a"].dtype) != "Int64" and df["a"].tolist()[:2] == ["1", "2"]
+
+    Generic.db_apply_schema(df, schema, inplace=True)
+    assert str(df["a"].dtype) == "Int64"
+
+
+def test_db_apply_schema_keeps_large_integers_exact() -> None:
+    """INTEGER columns should not round trip through float64, so ids above 2**53 survive unchanged."""
+    from fusetools.db_tools import Generic
+
+    big = 2**53 + 1
+    df = pd.DataFrame({"id": [str(big), None, "oops"], "n": [big, 1, 2]})
+    schema = pd.DataFrame({"column": ["id", "n"], "type": ["INTEGER", "INTEGER"]})
+
+    out = Generic.db_apply_schema(df, schema)
+    assert str(out["id"].dtype) == "Int64" and out.loc[0, "id"] == big
+    assert out["id"].isna().tolist() == [False, True, True]
+    assert out["n"].tolist() == [big, 1, 2]
+
+
+def test_read_pg_result_cache(tmp_path: object, monkeypatch: object) -> None:
+    """read_pg(cache=...) should serve repeat queries from disk, honour invalidation and evict beyond max_bytes."""
+    pytest.importorskip("pyarrow")
+    from fusetools.db_tools import PostgresETL, ResultCache
+
+    class FakeConn:
+        def get_dsn_parameters(self) -> dict:
+            return {"user": "u", "host": "h", "port": "5432", "dbname": "d"}
+
+    calls: list[str] = []
+
+    def fake_read_sql_query(sql: str, con: object) -> pd.DataFrame:
+        calls.append(sql)
+        return pd.DataFrame({"id": [1, 2], "name": ["a", None]})
+
+    monkeypatch.setattr(pd, "read_sql_query", fake_read_sql_query)  # type: ignore[attr-defined]
+    cache = ResultCache(str(tmp_path))
+    sql = "SELECT * FROM ref.codes c JOIN ref.labels l ON c.id = l.id"
+
+    first = PostgresETL.read_pg(sql, FakeConn(), cache=cache)
+    second = PostgresETL.read_pg("  SELECT *  FROM ref.codes c\n JOIN ref.labels l ON c.id = l.id;", FakeConn(), cache=cache)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert cache.stats()["hits"] == 1
+
+    assert cache.invalidate("other_tbl") == 0
+    assert cache.invalidate("public.labels") == 1
+    PostgresETL.read_pg(sql, FakeConn(), cache=cache)
+    assert len(calls) == 2
+
+    # the columnar reader returns other dtypes, so it never shares entries with the default one
+    monkeypatch.setattr(PostgresETL, "_read_pg_columnar", classmethod(lambda cls, sql, conn: calls.append("columnar") or pd.DataFrame({"id": [1]})))  # type: ignore[attr-defined]
+    assert len(PostgresETL.read_pg(sql, FakeConn(), cache=cache, columnar=True)) == 1
+    assert len(PostgresETL.read_pg(sql, FakeConn(), cache=cache, columnar=True)) == 1
+    assert len(PostgresETL.read_pg(sql, FakeConn(), cache=cache)) == 2
+    assert calls[2:] == ["columnar"]
+
+    expired = ResultCache(str(tmp_path), ttl=-1)
+    assert expired.get(sql, FakeConn()) is None
+
+    small = ResultCache(str(tmp_path / "small"), max_bytes=1)
+    PostgresETL.read_pg("SELECT 1", FakeConn(), cache=small)
+    assert small.stats()["entries"] == 0 and small.stats()["evictions"] == 1
+
+
+def test_read_pg_result_cache_without_pyarrow(tmp_path: object, monkeypatch: object) -> None:
+    """read_pg(cache=...) should still return results, uncached, when the Parquet engine is missing."""
+    from fusetools.db_tools import PostgresETL, ResultCache
+
+    class FakeConn:
+        def get_dsn_parameters(self) -> dict:
+            return {"user": "u", "host": "h", "port": "5432", "dbname": "d"}
+
+    def no_engine(self: pd.DataFrame, path: str) -> None:
+        raise ImportError("Unable to find a usable engine; tried using: 'pyarrow', 'fastparquet'.")
+
+    monkeypatch.setattr(pd, "read_sql_query", lambda sql, con: pd.DataFrame({"id": [1, 2]}))  # type: ignore[attr-defined]
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", no_engine)  # type: ignore[attr-defined]
+    cache = ResultCache(str(tmp_path))
+
+    assert PostgresETL.read_pg("SELECT 1", FakeConn(), cache=cache)["id"].tolist() == [1, 2]
+    assert cache.stats()["entries"] == 0 and not os.listdir(str(tmp_path))
+
+
+def test_pg_catalog_snapshot_and_ddl_invalidation(monkeypatch: object) -> None:
+    """get_pg_columns/get_pg_tbls(catalog=...) should load a schema once and reload after fusetools DDL."""
+    from fusetools.db_tools import PgCatalog, PostgresETL
+
+    class FakeCursor:
+        def execute(self, sql: str) -> None:
+            pass
+
+    class FakeConn:
+        def get_dsn_parameters(self) -> dict:
+            return {"user": "u", "host": "h", "port": "5432", "dbname": "d"}
+
+        def cursor(self) -> FakeCursor:
+            return FakeCursor()
+
+        def commit(self) -> None:
+            pass
+
+    loads: list[str] = []
+
+    def fake_read_sql_query(sql: str, con: object) -> pd.DataFrame:
+        loads.append(sql)
+        return pd.DataFrame(
+            {
+                "table_name": ["orders", "orders", "empty_view"],
+                "column_name": ["id", "amount", None],
+                "data_type": ["integer", "numeric", None],
+            }
+        )
+
+    monkeypatch.setattr(pd, "read_sql_query", fake_read_sql_query)  # type: ignore[attr-defined]
+    catalog = PgCatalog()
+    conn = FakeConn()
+
+    cols = PostgresETL.get_pg_columns("orders", conn, catalog=catalog)
+    assert cols.values.tolist() == [["id", "integer"], ["amount", "numeric"]]
+    assert PostgresETL.get_pg_tbls(conn, catalog=catalog)["table_name"].tolist() == ["empty_view", "orders"]
+    assert catalog.column_type("orders", "amount", conn) == "numeric"
+    assert PostgresETL.get_pg_columns("missing", conn, catalog=catalog).empty
+    assert len(loads) == 1 and "pg_catalog.pg_attribute" in loads[0]
+
+    PostgresETL.alter_column_pg("public.orders", "amount", "float", conn, FakeCursor())
+    PostgresETL.get_pg_columns("orders", conn, catalog=catalog)
+    assert len(loads) == 2
+    assert catalog.stats()["loads"] == 2
+
+
+def test_db_metrics_sinks_and_percentiles(tmp_path: object) -> None:
+    """Registered sinks should receive per-statement events and MetricsHistogram should summarize percentiles."""
+    import json
+
+    from fusetools.db_tools import DbMetrics, JsonLinesSink, MetricsHistogram, PostgresETL
+
+    class FakeCursor:
+        rowcount = 3
+
+        def execute(self, sql: str) -> None:
+            if "boom" in sql:
+                raise RuntimeError("syntax error")
+
+        def copy_expert(self, sql: str, file: object, size: int = 8192) -> None:
+            file.read()  # type: ignore[attr-defined]
+
+    class FakeConn:
+        def cursor(self) -> FakeCursor:
+            return FakeCursor()
+
+        def commit(self) -> None:
+            pass
+
+    hist = MetricsHistogram()
+    jsonl = JsonLinesSink(str(tmp_path / "metrics.jsonl"))  # type: ignore[operator]
+    seen: list[dict] = []
+
+    def broken_sink(event: dict) -> None:
+        raise ValueError("sink down")
+
+    for sink in (hist, jsonl, seen.append, broken_sink):
+        DbMetrics.add_sink(sink)
+    try:
+        for _ in range(5):
+            PostgresETL.run_query_pg(FakeConn(), "UPDATE t SET a = 1")
+        with pytest.raises(RuntimeError):
+            PostgresETL.run_query_pg(FakeConn(), "boom")
+        PostgresETL.copy_df_pg(pd.DataFrame({"a": [1, 2]}), "t", FakeConn(), FakeCursor())
+    finally:
+        for sink in (hist, jsonl, seen.append, broken_sink):
+            DbMetrics.remove_sink(sink)
+        jsonl.close()
+
+    summary = hist.summary().set_index("op")
+    assert summary.loc["run_query_pg", "count"] == 6
+    assert summary.loc["run_query_pg", "errors"] == 1
+    assert summary.loc["run_query_pg", "rows"] == 15
+    assert summary.loc["copy", "rows"] == 2 and summary.loc["copy", "bytes"] == len("1\n2\n")
+    assert set(hist.percentiles("run_query_pg")) == {"p50", "p95", "p99"}
+    assert len(seen) == 7 and seen[5]["status"] == "error"
+
+    lines = [json.loads(line) for line in open(str(tmp_path / "metrics.jsonl"))]  # type: ignore[operator]
+    assert [e["op"] for e in lines] == [e["op"] for e in seen]
+
+
+def test_run_queries_pg_transaction_and_savepoints() -> None:
+    """run_queries_pg should roll back the whole batch on failure, or only the failing statement with savepoints."""
+    from fusetools.db_tools import PostgresETL
+
+    class FakeCursor:
+        rowcount = 1
+
+        def __init__(self, conn: "FakeConn") -> None:
+            self.conn = conn
+
+        def execute(self, sql: str) -> None:
+            self.conn.executed.append(sql)
+            if "bad" in sql:
+                raise RuntimeError("relation does not exist")
+
+    class FakeConn:
+        def __init__(self) -> None:
+            self.executed: list[str] = []
+            self.commits = 0
+            self.rollbacks = 0
+
+        def cursor(self) -> FakeCursor:
+            return FakeCursor(self)
+
+        def commit(self) -> None:
+            self.commits += 1
+
+        def rollback(self) -> None:
+            self.rollbacks += 1
+
+    statements = ["TRUNCATE TABLE a", "DROP TABLE bad", "ANALYZE a"]
+
+    conn = FakeConn()
+    res = PostgresETL.run_queries_pg(conn, statements)
+    assert res["status"].tolist() == ["rolled_back", "failed", "skipped"]
+    assert (conn.commits, conn.rollbacks) == (0, 1)
+
+    conn = FakeConn()
+    res = PostgresETL.run_queries_pg(conn, statements, savepoints=True)
+    assert res["status"].tolist() == ["success", "failed", "success"]
+    assert conn.executed == [
+        "SAVEPOINT fusetools_sp; TRUNCATE TABLE a",
+        "RELEASE SAVEPOINT fusetools_sp; SAVEPOINT fusetools_sp; DROP TABLE bad",
+        "ROLLBACK TO SAVEPOINT fusetools_sp",
+        "RELEASE SAVEPOINT fusetools_sp; SAVEPOINT fusetools_sp; ANALYZE a",
+    ]
+    assert conn.commits == 1
+
+    with pytest.raises(RuntimeError, match="relation does not exist"):
+        PostgresETL.run_queries_pg(FakeConn(), statements, raise_errors=True)
+
+
+def test_copy_table_pg_pipes_copy_out_into_copy_in() -> None:
+    """copy_table_pg should stream COPY TO output into COPY FROM, threaded or spooled, and roll back on failure."""
+    from fusetools.db_tools import PostgresETL
+
+    payload = b"".join(b"%d\tname %d\n" % (i, i) for i in range(50000))
+
+    class FakeCursor:
+        def __init__(self, conn: "FakeConn") -> None:
+            self.conn = conn
+            self.rowcount = -1
+
+        def copy_expert(self, sql: str, file: object, size: int = 8192) -> None:
+            self.conn.sql.append(sql)
+            if "TO STDOUT" in sql:
+                for i in range(0, len(payload), 4096):
+                    file.write(payload[i : i + 4096])  # type: ignore[attr-defined]
+                return
+            data = b""
+            while chunk := file.read(size):  # type: ignore[attr-defined]
+                data += chunk
+                if self.conn.fail:
+                    raise RuntimeError("invalid input syntax")
+            self.conn.loaded = data
+            self.rowcount = data.count(b"\n")
+
+    class FakeConn:
+        def __init__(self, fail: bool = False) -> None:
+            self.fail = fail
+            self.sql: list[str] = []
+            self.loaded = b""
+            self.commits = 0
+            self.rollbacks = 0
+
+        def cursor(self) -> FakeCursor:
+            return FakeCursor(self)
+
+        def commit(self) -> None:
+            self.commits += 1
+
+        def rollback(self) -> None:
+            self.rollbacks += 1
+
+    for threaded in (True, False):
+        src, tgt = FakeConn(), FakeConn()
+        res = PostgresETL.copy_table_pg(src, tgt, "public.src", "public.tgt", columns=["id", "name"], buffer_bytes=1 << 20, threaded=threaded)
+        assert tgt.loaded == payload and tgt.commits == 1
+        assert res["rows"] == 50000 and res["bytes"] == len(payload)
+        assert src.sql == ["COPY public.src (id, name) TO STDOUT WITH (FORMAT text)"]
+        assert tgt.sql == ["COPY public.tgt (id, name) FROM STDIN WITH (FORMAT text)"]
+
+    src = FakeConn()
+    PostgresETL.copy_table_pg(src, FakeConn(), "SELECT * FROM a WHERE id > 5", "b")
+    assert src.sql == ["COPY (SELECT * FROM a WHERE id > 5) TO STDOUT WITH (FORMAT text)"]
+
+    tgt = FakeConn(fail=True)
+    with pytest.raises(RuntimeError, match="invalid input syntax"):
+        PostgresETL.copy_table_pg(FakeConn(), tgt, "a", "b", buffer_bytes=1 << 20)
+    assert (tgt.commits, tgt.rollbacks) == (0, 1)
+
+
+def test_sequential_load_pg_prepares_template_once() -> None:
+    """String templates should be parsed once and every INSERT window should EXECUTE one prepared statement."""
+    from fusetools.db_tools import PostgresETL
+
+    class FakeCursor:
+        rowcount = 10
+
+        def __init__(self, conn: "FakeConn") -> None:
+            self.conn = conn
+            self.rows: list[tuple] = []
+
+        def execute(self, sql: str, params: object = None) -> None:
+            if "max(" in sql:
+                raise RuntimeError('relation "tgt" does not exist')
+            self.conn.executed.append((sql, params))
+            self.rows = [(1,)] if "pg_prepared_statements" in sql and self.conn.prepared else []
+            if sql.startswith("PREPARE"):
+                self.conn.prepared = True
+
+        def fetchall(self) -> list[tuple]:
+            return self.rows
+
+    class FakeConn:
+        def __init__(self) -> None:
+            self.executed: list[tuple[str, object]] = []
+            self.prepared = False
+
+        def cursor(self) -> FakeCursor:
+            return FakeCursor(self)
+
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            pass
+
+    conn = FakeConn()
+    results = PostgresETL.sequential_load_pg(
+        override=True,
+        tgt_tbl="tgt",
+        conn=conn,
+        dt_start="2024-01-01",
+        dt_end="2024-04-01",
+        saved_day_id_range_placeholder="--RANGE",
+        dt1_interval="MS",
+        dt2_interval="W-MON",
+        sql_loop_fn="SELECT --RANGE a FROM src WHERE 1=1 --F1 --F2",
+        sql_loop_fn_type="str",
+        filter_day_id_field1="d1",
+        sql_loop_fn_dt_placeholder1="--F1",
+        filter_day_id_field2="d2",
+        filter_id_type2="<",
+        sql_loop_fn_dt_placeholder2="--F2",
+    )
+    assert results["status"].tolist() == ["success"] * 3
+    assert results["row_count"].tolist() == [10, 10, 10]
+
+    statements = [sql for sql, _ in conn.executed if sql.startswith(("CREATE", "PREPARE", "EXECUTE", "SELECT 1"))]
+    assert statements[0] == (
+        "CREATE TABLE tgt AS SELECT  '2000-01-01 to 2024-01-01' as dt_range, a FROM src WHERE 1=1 "
+        " AND date(d1) >= '2000-01-01' AND date(d1) < '2024-01-01'  AND date(d2) < '2024-01-01'"
+    )
+    name = statements[2].split()[1]
+    assert statements[2] == (
+        f"PREPARE {name} (unknown, unknown) AS INSERT INTO tgt SELECT  ($1::text || ' to ' || $2::text) as dt_range, a FROM src WHERE 1=1 "
+        " AND date(d1) >= $1::date AND date(d1) < $2::date  AND date(d2) < $2::date"
+    )
+    executes = [(sql, params) for sql, params in conn.executed if sql.startswith("EXECUTE")]
+    assert executes == [(f"EXECUTE {name} (%s, %s)", ("2024-01-01", "2024-02-01")), (f"EXECUTE {name} (%s, %s)", ("2024-02-01", "2024-03-01"))]
+    assert sum(sql.startswith("PREPARE") for sql in statements) == 1
+
+
+def test_insert_df_mysql_packs_values_and_streams_infile(monkeypatch: object) -> None:
+    """insert_df_mysql should split multi-row INSERTs at the packet limit, feed LOAD DATA through a readable path and roll back cut-short loads."""
+    from fusetools import db_tools
+    from fusetools.db_tools import MySQLETL
+
+    class FakeCursor:
+        rowcount = 0
+
+        def __init__(self, conn: "FakeConn") -> None:
+            self.conn = conn
+
+        def execute(self, sql: str) -> None:
+            self.conn.executed.append(sql)
+            if sql.startswith("LOAD DATA"):
+                with open(sql.split("'")[1], "rb") as f:
+                    self.conn.loaded = f.read()
+                self.rowcount = self.conn.loaded.count(b"\n")
+            elif sql.startswith("INSERT"):
+                self.rowcount = sql.count("),(") + 1
+
+        def fetchone(self) -> tuple:
+            return (1 << 30,)
+
+        def close(self) -> None:
+            pass
+
+    class FakeConn:
+        max_allowed_packet = 16 << 20
+
+        def __init__(self) -> None:
+            self.executed: list[str] = []
+            self.loaded = b""
+            self.commits = 0
+            self.rollbacks = 0
+
+        def cursor(self) -> FakeCursor:
+            return FakeCursor(self)
+
+        def literal(self, row: tuple) -> str:
+            return "(" + ",".join("NULL" if v is None else repr(v) for v in row) + ")"
+
+        def commit(self) -> None:
+            self.commits += 1
+
+        def rollback(self) -> None:
+            self.rollbacks += 1
+
+    df = pd.DataFrame({"id": range(1000), "name": ["a\tb" if i % 2 else None for i in range(1000)], "flag": [True, False] * 500})
+
+    conn = FakeConn()
+    assert MySQLETL.insert_df_mysql(df, "tgt", conn, chunk_size=300, max_packet_bytes=4096) == 1000
+    inserts = [sql for sql in conn.executed if sql.startswith("INSERT")]
+    assert len(inserts) > 1 and all(len(sql.encode()) <= 4096 for sql in inserts)
+    assert inserts[0].startswith("INSERT INTO tgt (`id`, `name`, `flag`) VALUES (0,NULL,True),(1,'a\\tb',False)")
+    assert sum(sql.count("),(") + 1 for sql in inserts) == 1000 and conn.commits == 1
+
+    conn = FakeConn()
+    assert MySQLETL.insert_df_mysql(df, "tgt", conn, insert_type="infile", chunk_size=300) == 1000
+    lines = conn.loaded.decode().splitlines()
+    assert len(lines) == 1000 and lines[:2] == ["0\t\\N\t1", "1\ta\\tb\t0"]
+    assert conn.executed[0].endswith("INTO TABLE tgt CHARACTER SET utf8mb4 (`id`, `name`, `flag`)")
+
+    # an encoder failure mid-stream ends the pipe early; the truncated load must be rolled back, not committed
+    encode = db_tools._mysql_infile_chunk
+
+    def failing_chunk(chunk: pd.DataFrame) -> bytes:
+        if chunk.index[0] >= 600:
+            raise RuntimeError("bad value")
+        return encode(chunk)
+
+    monkeypatch.setattr(db_tools, "_mysql_infile_chunk", failing_chunk)  # type: ignore[attr-defined]
+    conn = FakeConn()
+    with pytest.raises(RuntimeError, match="bad value"):
+        MySQLETL.insert_df_mysql(df, "tgt", conn, insert_type="infile", chunk_size=300)
+    assert conn.loaded.count(b"\n") == 600 and (conn.commits, conn.rollbacks) == (0, 1)
+
+    with pytest.raises(ValueError, match="exceeds"):
+        MySQLETL.insert_df_mysql(df, "tgt", FakeConn(), max_packet_bytes=64)
+
+
+def test_read_pg_columnar_decodes_binary_copy() -> None:
+    """read_pg(columnar=True) should decode binary COPY output into nullable columns without per-row tuples."""
+    import io
+    from decimal import Decimal
+
+    from fusetools.db_tools import _PG_COPY_BINARY_HEADER, _PG_COPY_BINARY_TRAILER, PostgresETL, _copy_binary_chunk
+
+    # what the server sends for the rewritten query: an IS NULL flag and a coalesced value per fixed column, then text
+    ts = pd.Series(pd.to_datetime(["2024-01-02 03:04:05.123456", "2000-01-01 00:00:00.000000"]))
+    wire = pd.DataFrame(
+        {
+            "n0": [False, True],
+            "v0": [7, 0],
+            "n2": [True, False],
+            "v2": [False, True],
+            "n3": [False, True],
+            "v3": ts,
+            "n4": [False, False],
+            "v4": pd.to_datetime(["1999-12-31", "2024-02-29"]),
+            "t0": ["a\tb", None],
+            "t1": ["12345678901234567890.0000000001", None],
+        }
+    )
+    payload = _PG_COPY_BINARY_HEADER + _copy_binary_chunk(wire, [16, 20, 16, 16, 16, 1114, 16, 1082, 25, 25]) + _PG_COPY_BINARY_TRAILER
+
+    class FakeCursor:
+        description = None
+
+        def __init__(self) -> None:
+            self.sql: list[str] = []
+
+        def execute(self, sql: str) -> None:
+            self.sql.append(sql)
+            self.description = [("id", 20), ("name", 25), ("amt", 1700), ("ok", 16), ("ts", 1114), ("d", 1082)]
+
+        def copy_expert(self, sql: str, file: io.BytesIO) -> None:
+            self.sql.append(sql)
+            file.write(payload)
+
+    class FakeConn:
+        def __init__(self, status: int = 0) -> None:
+            self.cur = FakeCursor()
+            self.status = status
+            self.commits = 0
+
+        def cursor(self) -> FakeCursor:
+            return self.cur
+
+        def get_transaction_status(self) -> int:
+            return self.status
+
+        def commit(self) -> None:
+            self.commits += 1
+
+    conn = FakeConn()
+    df = PostgresETL.read_pg("SELECT * FROM t;", conn, columnar=True)
+    assert conn.commits == 1
+    assert conn.cur.sql == [
+        "SELECT * FROM (SELECT * FROM t) AS q LIMIT 0",
+        "COPY (SELECT c0 IS NULL, coalesce(c0, '0'), c3 IS NULL, coalesce(c3, 'f'), "
+        "c4 IS NULL, coalesce(c4, '2000-01-01'), c5 IS NULL, coalesce(c5, '2000-01-01'), c1::text, c2::text "
+        "FROM (SELECT * FROM t) AS q(c0, c1, c2, c3, c4, c5)) TO STDOUT WITH (FORMAT binary)",
+    ]
+    assert list(df.columns) == ["id", "name", "amt", "ok", "ts", "d"]
+    assert [str(t) for t in df.dtypes.drop("name")] == ["Int64", "object", "boolean", "datetime64[ns]", "datetime64[ns]"]
+    assert df["id"].tolist() == [7, pd.NA] and df["ok"].tolist() == [pd.NA, True]
+    assert df["amt"].tolist() == [Decimal("12345678901234567890.0000000001"), None] and df["name"].iloc[0] == "a\tb" and pd.isna(df["name"].iloc[1])
+    assert df["ts"].iloc[0] == ts.iloc[0] and pd.isna(df["ts"].iloc[1])
+    assert df["d"].tolist() == list(pd.to_datetime(["1999-12-31", "2024-02-29"]))
+
+    # a transaction the caller already has open is not committed behind its back
+    in_txn = FakeConn(status=2)
+    PostgresETL.read_pg("SELECT * FROM t", in_txn, columnar=True)
+    assert in_txn.commits == 0
+
+
+def test_columnar_frame_out_of_range_timestamps_are_nat() -> None:
+    """Postgres infinity and dates beyond datetime64[ns] should decode to NaT rather than wrap around."""
+    import struct
+
+    from fusetools.db_tools import _PG_COPY_BINARY_HEADER, _PG_COPY_BINARY_TRAILER, _columnar_frame
+
+    def row(ts_us: int, days: int) -> bytes:
+        return struct.pack(">hi?iqi?ii", 4, 1, False, 8, ts_us, 1, False, 4, days)
+
+    year_3000 = 365_243  # days from 2000-01-01, past 2262
+    body = row(2**63 - 1, 2**31 - 1) + row(-(2**63), -(2**31)) + row(86_400_000_000, year_3000) + row(-1, -1)
+    df = _columnar_frame(_PG_COPY_BINARY_HEADER + body + _PG_COPY_BINARY_TRAILER, [("ts", 1114), ("d", 1082)], [(0, 1114), (1, 1082)], [])
+    assert df["ts"].isna().tolist() == [True, True, False, False]
+    assert df["d"].isna().tolist() == [True, True, True, False]
+    assert df.loc[2, "ts"] == pd.Timestamp("2000-01-02") and df.loc[3, "ts"] == pd.Timestamp("1999-12-31 23:59:59.999999")
+    assert df.loc[3, "d"] == pd.Timestamp("1999-12-31")
+
+
+def test_compact_df_downcasts_and_categorizes() -> None:
+    """compact_df should shrink dtypes without changing values and report the bytes saved."""
+    import numpy as np
+
+    from fusetools.db_tools import Generic
+
+    n = 10000
+    df = pd.DataFrame(
+        {
+            "small": np.arange(n) % 100,
+            "big": np.arange(n) * 100000,
+            "nullable": pd.array([1, None] * (n // 2), dtype="Int64"),
+            "exact": np.arange(n) / 4,
+            "inexact": np.arange(n) / 3,
+            "state": pd.Series(["NY", "CA", None, "TX"] * (n // 4), dtype=object),
+            "uid": [f"id-{i}" for i in range(n)],
+        }
+    )
+    out, report = Generic.compact_df(df, return_report=True)
+    assert dict(out.dtypes.astype(str)) == {
+        "small": "int8",
+        "big": "int32",
+        "nullable": "Int8",
+        "exact": "float32",
+        "inexact": "float64",
+        "state": "category",
+        "uid": str(df["uid"].dtype),
+    }
+    assert str(df["small"].dtype) == "int64"  # the input frame is left alone
+    pd.testing.assert_frame_equal(out.drop(columns="state").astype(df.dtypes.drop("state").to_dict()), df.drop(columns="state"))
+    assert out["state"].isna().equals(df["state"].isna()) and out["state"].dropna().tolist() == df["state"].dropna().tolist()
+    assert (report["bytes_after"] <= report["bytes_before"]).all()
+    # the uid column's size depends on the string backend, so only the compacted columns are sized
+    report = report.set_index("column")
+    compacted = ["small", "big", "nullable", "exact", "state"]
+    assert report.loc[compacted, "bytes_before"].tolist() == df[compacted].memory_usage(index=False, deep=True).tolist()
+    assert report.loc[compacted, "bytes_after"].tolist() == out[compacted].memory_usage(index=False, deep=True).tolist()
+    assert report.loc[["small", "big", "exact"], "bytes_after"].tolist() == [n, 4 * n, 4 * n]
+    assert report.loc["state", "bytes_after"] < report.loc["state", "bytes_before"] / 4
+
+
+def test_read_pg_batches_spills_to_parquet(tmp_path: object) -> None:
+    """read_pg_batches(spill_dir=...) should write one row group per batch and return a lazy, reusable handle."""
+    pytest.importorskip("pyarrow")
+    from fusetools.db_tools import PostgresETL, SpilledResult
+
+    rows = [(i, None if i < 3 else f"name {i}", i * 0.5) for i in range(10)]
+
+    class FakeCursor:
+        description = [("id", 23), ("name", 25), ("amt", 701)]
+
+        def __init__(self) -> None:
+            self.rows = iter(rows)
+
+        def execute(self, sql: str) -> None:
+            pass
+
+        def __iter__(self) -> "FakeCursor":
+            return self
+
+        def __next__(self) -> tuple:
+            return next(self.rows)
+
+        def close(self) -> None:
+            pass
+
+    class FakeConn:
+        queries = 0
+
+        def cursor(self, name: str) -> FakeCursor:
+            self.queries += 1
+            return FakeCursor()
+
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            pass
+
+    conn = FakeConn()
+    spill_dir = str(tmp_path)
+    res = PostgresETL.read_pg_batches("SELECT * FROM big", conn, batch_size=3, spill_dir=spill_dir, memory_limit=1 << 20)
+    assert isinstance(res, SpilledResult)
+    assert (len(res), res.num_row_groups, res.columns) == (10, 4, ["id", "name", "amt"])
+    assert [len(b) for b in res.iter_batches(start=2)] == [3, 1]
+    assert list(next(res.iter_batches(columns=["amt"])).columns) == ["amt"]
+
+    df = res.to_pandas()
+    assert str(df["id"].dtype) == "Int64" and df["name"].isna().sum() == 3 and df["amt"].sum() == 22.5
+    assert res.to_pandas(filters=[("id", ">=", 8)])["id"].tolist() == [8, 9]
+    with pytest.raises(MemoryError):
+        res.to_pandas(memory_limit=10)
+
+    again = PostgresETL.read_pg_batches("SELECT * FROM big", conn, batch_size=3, spill_dir=spill_dir, reuse_spill=True)
+    assert again.path == res.path and conn.queries == 1
+    res.delete()
+    assert not [f for f in os.listdir(spill_dir) if f.endswith((".parquet", ".tmp"))]
+
+
+def test_read_pg_batches_spill_schema_from_column_types(tmp_path: object) -> None:
+    """The spill schema should come from the column types, so an all-NULL first batch still takes later values."""
+    pytest.importorskip("pyarrow")
+    import datetime as dt
+    from decimal import Decimal
+
+    from fusetools.db_tools import PostgresETL
+
+    ts = dt.datetime(2024, 1, 2, 3, 4, 5, 123456)
+    rows = [
+        (None, None, None, None),
+        (ts, Decimal("1.5"), Decimal("2.125"), dt.date(2024, 1, 2)),
+        (ts, Decimal("12.25"), Decimal("0.0000001"), None),
+    ]
+
+    class FakeCursor:
+        # psycopg2-style 7-tuples: precision and scale are only set for constrained NUMERIC
+        description = [
+            ("ts", 1114, None, 8, None, None, None),
+            ("amt", 1700, None, 65535, 12, 2, None),
+            ("ratio", 1700, None, 65535, None, None, None),
+            ("d", 1082, None, 4, None, None, None),
+        ]
+
+        def __init__(self) -> None:
+            self.rows = iter(rows)
+
+        def execute(self, sql: str) -> None:
+            pass
+
+        def __iter__(self) -> "FakeCursor":
+            return self
+
+        def __next__(self) -> tuple:
+            return next(self.rows)
+
+        def close(self) -> None:
+            pass
+
+    class FakeConn:
+        def __init__(self, db: str) -> None:
+            self.db = db
+
+        def cursor(self, name: str) -> FakeCursor:
+            return FakeCursor()
+
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            pass
+
+        def get_dsn_parameters(self) -> dict:
+            return {"user": "u", "host": "h", "port": "5432", "dbname": self.db}
+
+    res = PostgresETL.read_pg_batches("SELECT * FROM t", FakeConn("a"), batch_size=1, spill_dir=str(tmp_path))
+    df = res.to_pandas()
+    assert df.loc[1, "ts"] == pd.Timestamp(ts)
+    assert df["amt"].tolist()[1:] == [Decimal("1.50"), Decimal("12.25")]
+    assert df["ratio"].tolist()[1:] == [2.125, 1e-07]
+    assert df.loc[1, "d"] == dt.date(2024, 1, 2)
+
+    other = PostgresETL.read_pg_batches("SELECT * FROM t", FakeConn("b"), batch_size=1, spill_dir=str(tmp_path), reuse_spill=True)
+    assert other.path != res.path
+
+
+def test_plan_profiler_sampled_and_slow_statements(tmp_path: object) -> None:
+    """PlanProfiler should EXPLAIN sampled statements in place, capture slow ones through auto_explain, and summarize plans."""
+    import json
+
+    from fusetools.db_tools import PlanProfiler, PostgresETL
+
+    def plan(rows: int, ms: float, scan: str) -> list:
+        scan_node = {"Node Type": scan, "Relation Name": "src", "Actual Total Time": ms * 0.9, "Actual Rows": rows, "Actual Loops": 1}
+        insert = {"Node Type": "ModifyTable", "Actual Total Time": ms, "Actual Rows": 0, "Actual Loops": 1, "Plans": [scan_node]}
+        return [{"Plan": insert, "Execution Time": ms}]
+
+    class FakeCursor:
+        rowcount = 5
+
+        def __init__(self, conn: "FakeConn") -> None:
+            self.conn = self.connection = conn
+
+        def execute(self, sql: str) -> None:
+            if "LOAD 'auto_explain'" in sql and self.conn.no_auto_explain:
+                raise RuntimeError("access to library denied")
+            self.conn.executed.append(sql)
+
+        def fetchone(self) -> tuple:
+            week = int(self.conn.executed[-1].split("week = ")[1])
+            # week 3 switches to an index scan and gets much slower per row
+            return (json.dumps(plan(100, 500.0 if week == 3 else 10.0, "Index Scan" if week == 3 else "Seq Scan")),)
+
+    class FakeConn:
+        def __init__(self, no_auto_explain: bool = False) -> None:
+            self.executed: list[str] = []
+            self.notices: list[str] = []
+            self.no_auto_explain = no_auto_explain
+
+        def cursor(self) -> FakeCursor:
+            return FakeCursor(self)
+
+        def commit(self) -> None:
+            pass
+
+    conn = FakeConn()
+    profiler = PlanProfiler(plan_dir=str(tmp_path), sample_rate=1.0)
+    for week in range(5):
+        PostgresETL.run_query_pg(conn, f"INSERT INTO tgt SELECT * FROM src WHERE week = {week}", profiler=profiler)
+    PostgresETL.run_query_pg(conn, "VACUUM tgt", profiler=profiler)
+    assert conn.executed[0] == "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) INSERT INTO tgt SELECT * FROM src WHERE week = 0"
+    assert conn.executed[-1] == "VACUUM tgt" and len(profiler.records) == 5
+    assert len(os.listdir(str(tmp_path))) == 5
+
+    top = profiler.top_nodes(n=1)
+    assert top[["node_type", "relation", "exclusive_ms"]].iloc[0].tolist() == ["Index Scan", "src", 450.0]
+
+    # every run of the same statement is a group; give them one so the odd week stands out
+    for rec in profiler.records:
+        rec["group"] = "tgt"
+    reg = profiler.regressions()
+    assert reg["key"].tolist() == [profiler.records[3]["key"]]
+    assert reg[["plan_changed", "slower"]].iloc[0].tolist() == [True, True]
+
+    # slow statements run once, with auto_explain handing their plan back as a notice
+    conn = FakeConn()
+    slow = PlanProfiler(slow_seconds=0.0)
+    cur = conn.cursor()
+    sql = "CREATE TABLE tgt AS SELECT * FROM src WHERE week = 1"
+
+    def execute(prefix: str) -> None:
+        cur.execute(prefix + sql)
+        conn.notices.append("NOTICE:  duration: 12.5 ms  plan:\n" + json.dumps({"Query Text": sql, "Plan": plan(100, 12.5, "Seq Scan")[0]["Plan"]}))
+
+    assert slow.run(cur, sql, execute, "tgt_0", "tgt", log_dir=str(tmp_path)) == 5
+    assert len(conn.executed) == 2 and conn.executed[1] == sql
+    assert conn.executed[0].startswith("SAVEPOINT fusetools_explain; LOAD 'auto_explain'; SET LOCAL auto_explain.log_min_duration = '0'")
+    assert slow.records[0]["plan"]["Execution Time"] == 12.5 and conn.notices == []
+    assert slow.records[0]["reason"] == "slow" and os.path.exists(os.path.join(str(tmp_path), "tgt_0.plan.json"))
+
+    # without auto_explain the statement still runs once, unprofiled
+    conn = FakeConn(no_auto_explain=True)
+    cur = conn.cursor()
+    assert slow.run(cur, sql, lambda prefix: cur.execute(prefix + sql), "tgt_1", "tgt") == 5
+    assert conn.executed == ["ROLLBACK TO SAVEPOINT fusetools_explain", sql] and len(slow.records) == 1